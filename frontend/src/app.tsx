@@ -5,13 +5,26 @@ import NotificationManager from './components/NotificationManager/NotificationMa
 import AlgorytmsSection from './components/AlogrytmsSection/AlogrytmsSection.tsx';
 import CustomFnSection from './components/CustomFnSection/FnSection.tsx';
 import ControlPanel from './components/ControlPanel/ControlPanel.tsx';
+import StatsPanel from './components/StatsPanel/StatsPanel.tsx';
 import './app.css';
 
 import useWebSocket from './hooks/useWebSocket.tsx';
 import { SharedParamsSection } from './components/SharedParamsSection/SharedParamsSection.tsx';
-import type { AlgorithmData, FnData, ParamTypes } from './interfaces.ts';
+import type { AlgorithmData, FnData, GenerationTelemetry, JobSummary, ParamTypes, ProfileReport, StatsReport } from './interfaces.ts';
 import Raport from './components/Raport/Raport.tsx';
 
+// Plik profilu (base64) z wiadomości "profile" - pobieranie w przeglądarce
+const downloadProfile = (profile: ProfileReport) => {
+    const bytes = Uint8Array.from(atob(profile.data), (c) => c.charCodeAt(0));
+    const type = profile.format === 'html' ? 'text/html' : 'application/octet-stream';
+    const url = URL.createObjectURL(new Blob([bytes], { type }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = profile.filename;
+    link.click();
+    URL.revokeObjectURL(url);
+};
+
 export function App() {
     const [selectedFnData, setSelectedFnData] = useState<FnData>({ name: '', code: '', isCustom: false, bounds: [0, 0] });
     const [functionsData, setFunctionsData] = useState<FnData[]>([]);
@@ -24,6 +37,11 @@ export function App() {
     const [isStarted, setIsStarted] = useState<boolean>(false);
     const [algProgress, setAlgProgress] = useState<number>(0);
     const [progress, setProgress] = useState<number>(0);
+    const [telemetry, setTelemetry] = useState<GenerationTelemetry | null>(null);
+    const [stats, setStats] = useState<StatsReport | null>(null);
+    const [profileSummary, setProfileSummary] = useState<string>('');
+    // zlecenie na serwerze, którego wiadomości dostajemy (przeżywa odświeżenie strony)
+    const [jobId, setJobId] = useState<string | null>(localStorage.getItem('jobId'));
 
     const { lastMessage, sendMessage, readyState, retryCount } = useWebSocket('ws://localhost:8000/ws');
 
@@ -44,7 +62,17 @@ export function App() {
                 setAlgProgress(0);
                 setProgress(0);
                 setResults({ result: {}, figures: {} });
+                setTelemetry(null);
                 break;
+            case 'job':
+                const job = lastMessage.message as JobSummary;
+                setJobId(job.job_id);
+                setIsStarted(true);
+                if (job.status === 'queued' && job.queue_position !== null) {
+                    addNewNotification(`Zlecenie w kolejce (pozycja ${job.queue_position + 1})`, 'orange');
+                }
+                break;
+
             case 'pause':
                 console.log('pause');
                 setIsPaused(true);
@@ -67,6 +95,14 @@ export function App() {
                 }
                 break;
 
+            case 'telemetry':
+                // paczka zdarzeń - interesuje nas ostatnie podsumowanie generacji CMA
+                const generations = lastMessage.message.events.filter((e: any) => e.kind === 'generation');
+                if (generations.length > 0) {
+                    setTelemetry(generations[generations.length - 1] as GenerationTelemetry);
+                }
+                break;
+
             case 'finished':
                 setIsPaused(false);
                 setIsStarted(false);
@@ -78,6 +114,11 @@ export function App() {
                 break;
 
             case 'error':
+                // błąd komendy klienta (np. stats bez zlecenia) nie kończy zlecenia
+                if (lastMessage.job_id === undefined) {
+                    addNewNotification(lastMessage.message, 'red');
+                    break;
+                }
                 setIsPaused(false);
                 setIsStarted(false);
 
@@ -85,6 +126,17 @@ export function App() {
                 // setResults(lastMessage.message);
                 break;
 
+            case 'stats':
+                setStats(lastMessage.message as StatsReport);
+                break;
+
+            case 'profile':
+                const profile = lastMessage.message as ProfileReport;
+                setProfileSummary(profile.summary);
+                downloadProfile(profile);
+                addNewNotification(`Profil ${profile.algorithm} zapisany jako ${profile.filename}`, 'green');
+                break;
+
             case 'get_params':
                 if (localStorage.getItem('algorithmsData') == null) {
                     setAlgorithmsData(lastMessage.message.algorithms as AlgorithmData[]);
@@ -109,6 +161,7 @@ export function App() {
 
                 setIsPaused(lastMessage.message.isPaused);
                 setIsStarted(lastMessage.message.isStarted);
+                setJobId(lastMessage.message.job_id);
                 // setFunctionsData(lastMessage.message.functions_data as FnData[]);
                 // setSelectedFnData(lastMessage.message.function_data[0] as FnData);
 
@@ -131,18 +184,29 @@ export function App() {
         if (functionsData.length != 0) localStorage.setItem('functionsData', JSON.stringify(functionsData));
     }, [functionsData]);
 
+    useEffect(() => {
+        if (jobId) localStorage.setItem('jobId', jobId);
+        else localStorage.removeItem('jobId');
+    }, [jobId]);
+
     useEffect(() => {
         if (readyState === 'OPEN') {
-            sendMessage({ type: 'get_params' });
+            sendMessage({ type: 'get_params', job_id: jobId });
         }
     }, [readyState]);
 
+    const sendStats = (options: Record<string, any>, infoForUser: string) => {
+        addNewNotification(infoForUser, 'orange');
+        sendMessage({ type: 'stats', job_id: jobId, ...options });
+    };
+
     const sendAndShowNotification = (type: string, infoForUser: string) => {
         const data = {
             type: type,
             algorithmsData: algorithmsData,
             shared_params: sharedAlgsParams,
             selected_function: selectedFnData,
+            job_id: jobId,
         };
 
         addNewNotification(infoForUser, 'orange');
@@ -162,8 +226,15 @@ export function App() {
                 <div id="progress-container" className="progress-container hidden">
                     <ProgressBar label="Algorytmy" progress={algProgress} />
                     <ProgressBar label="Strojenie" progress={progress} />
+                    {telemetry && (
+                        <div class="telemetry">
+                            {telemetry.algorithm}: generacja {telemetry.iteration}/{telemetry.iterations}, najlepsza sigma{' '}
+                            {telemetry.best_sigma.toPrecision(4)} (w generacji {telemetry.generation_best.toPrecision(4)})
+                        </div>
+                    )}
                 </div>
             )}
+            {jobId && <StatsPanel stats={stats} profileSummary={profileSummary} sendStats={sendStats} />}
             {Object.keys(results.figures).length > 0 && <Raport results={results} />}
         </div>
     );
@@ -0,0 +1,90 @@
+import { useEffect, useMemo, useRef } from 'preact/hooks';
+import { decodeFloat32, type AnimationData } from './figureData';
+
+interface Props {
+    animation: AnimationData;
+    interval?: number;
+}
+
+const SIZE = 400;
+
+// Kolor tła wg wartości funkcji (od granatowego do żółtego, podobnie do viridis)
+const colorFor = (t: number): [number, number, number] => [
+    Math.round(68 + t * 185),
+    Math.round(1 + t * 230),
+    Math.round(84 + t * (37 - 84)),
+];
+
+const AgentsAnimation = ({ animation, interval = 300 }: Props) => {
+    const canvasRef = useRef<HTMLCanvasElement>(null);
+
+    const background = useMemo(() => {
+        const [rows, cols] = animation.contour.shape;
+        const values = decodeFloat32(animation.contour);
+        let min = Infinity;
+        let max = -Infinity;
+        values.forEach((v) => {
+            if (Number.isFinite(v)) {
+                min = Math.min(min, v);
+                max = Math.max(max, v);
+            }
+        });
+        const span = max - min || 1;
+
+        const image = new ImageData(cols, rows);
+        for (let r = 0; r < rows; r++) {
+            for (let c = 0; c < cols; c++) {
+                // wiersz 0 siatki to dolna krawędź obszaru
+                const [red, green, blue] = colorFor((values[r * cols + c] - min) / span);
+                const offset = ((rows - 1 - r) * cols + c) * 4;
+                image.data[offset] = red;
+                image.data[offset + 1] = green;
+                image.data[offset + 2] = blue;
+                image.data[offset + 3] = 255;
+            }
+        }
+        return image;
+    }, [animation]);
+
+    useEffect(() => {
+        const canvas = canvasRef.current;
+        const ctx = canvas?.getContext('2d');
+        if (!canvas || !ctx) return;
+
+        const [frames, agents] = animation.positions.shape;
+        const positions = decodeFloat32(animation.positions);
+        const [[xMin, xMax], [yMin, yMax]] = animation.bounds;
+
+        const backgroundCanvas = document.createElement('canvas');
+        backgroundCanvas.width = background.width;
+        backgroundCanvas.height = background.height;
+        backgroundCanvas.getContext('2d')?.putImageData(background, 0, 0);
+
+        let frame = 0;
+        const draw = () => {
+            ctx.imageSmoothingEnabled = true;
+            ctx.drawImage(backgroundCanvas, 0, 0, SIZE, SIZE);
+            ctx.fillStyle = 'red';
+            for (let a = 0; a < agents; a++) {
+                const offset = (frame * agents + a) * 2;
+                const x = ((positions[offset] - xMin) / (xMax - xMin)) * SIZE;
+                const y = SIZE - ((positions[offset + 1] - yMin) / (yMax - yMin)) * SIZE;
+                ctx.beginPath();
+                ctx.arc(x, y, 4, 0, 2 * Math.PI);
+                ctx.fill();
+            }
+            ctx.fillStyle = 'white';
+            const iteration = animation.iterations?.[frame] ?? frame;
+            ctx.fillText(`Iteracja ${iteration} (klatka ${frame + 1}/${frames})`, 8, 16);
+            frame = (frame + 1) % frames;
+        };
+
+        draw();
+        const timer = setInterval(draw, interval);
+        return () => clearInterval(timer);
+    }, [animation, background, interval]);
+
+    return <canvas ref={canvasRef} width={SIZE} height={SIZE} />;
+};
+
+export default AgentsAnimation;
@@ -0,0 +1,45 @@
+import { useMemo } from 'preact/hooks';
+import { decodeFloat32, type Float32Payload } from './figureData';
+
+interface Props {
+    curve: Float32Payload;
+    label: string;
+}
+
+const WIDTH = 600;
+const HEIGHT = 360;
+const PADDING = 40;
+
+// Krzywa zbieżności w skali logarytmicznej (jak dawny wykres z matplotlib)
+const ConvergenceChart = ({ curve, label }: Props) => {
+    const path = useMemo(() => {
+        const values = Array.from(decodeFloat32(curve)).map((v) => Math.log10(Math.max(v, 1e-12)));
+        const min = Math.min(...values);
+        const max = Math.max(...values);
+        const span = max - min || 1;
+        const last = Math.max(values.length - 1, 1);
+
+        return values
+            .map((v, i) => {
+                const x = PADDING + (i / last) * (WIDTH - 2 * PADDING);
+                const y = HEIGHT - PADDING - ((v - min) / span) * (HEIGHT - 2 * PADDING);
+                return `${i === 0 ? 'M' : 'L'}${x.toFixed(1)},${y.toFixed(1)}`;
+            })
+            .join(' ');
+    }, [curve]);
+
+    return (
+        <svg viewBox={`0 0 ${WIDTH} ${HEIGHT}`} role="img" aria-label={label}>
+            <rect x={PADDING} y={PADDING} width={WIDTH - 2 * PADDING} height={HEIGHT - 2 * PADDING} fill="none" stroke="#e5e7eb" />
+            <path d={path} fill="none" stroke="#2563eb" stroke-width={2} />
+            <text x={WIDTH / 2} y={HEIGHT - 8} text-anchor="middle" font-size={12}>
+                Iteracja
+            </text>
+            <text x={12} y={HEIGHT / 2} text-anchor="middle" font-size={12} transform={`rotate(-90 12 ${HEIGHT / 2})`}>
+                log10(najlepsza wartość)
+            </text>
+        </svg>
+    );
+};
+
+export default ConvergenceChart;
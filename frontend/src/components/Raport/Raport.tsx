@@ -1,4 +1,6 @@
 import './Raport.scss';
+import ConvergenceChart from './ConvergenceChart';
+import AgentsAnimation from './AgentsAnimation';
 
 interface Props {
     results: any;
@@ -39,6 +41,21 @@ const Raport = ({ results }: Props) => {
                                         </div>
                                     )}
 
+                                    {/* Dane surowe (tryb "data") - rysowane w przeglądarce */}
+                                    {results.figures[algoName].convergence && (
+                                        <div className="figure-card">
+                                            <h4>Convergence Plot:</h4>
+                                            <ConvergenceChart curve={results.figures[algoName].convergence} label={`${algoName} Convergence Plot`} />
+                                        </div>
+                                    )}
+
+                                    {results.figures[algoName].animation_data && (
+                                        <div className="figure-card">
+                                            <h4>Animation:</h4>
+                                            <AgentsAnimation animation={results.figures[algoName].animation_data} />
+                                        </div>
+                                    )}
+
                                     {/* Animation */}
                                     {results.figures[algoName].animation && (
                                         <div className="figure-card">
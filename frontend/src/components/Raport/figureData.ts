@@ -0,0 +1,23 @@
+export interface Float32Payload {
+    dtype: 'float32';
+    shape: number[];
+    data: string;
+}
+
+export interface AnimationData {
+    bounds: [[number, number], [number, number]];
+    positions: Float32Payload;
+    /** Numer iteracji każdej klatki (0 - populacja początkowa). */
+    iterations?: number[];
+    contour: Float32Payload;
+}
+
+/** Zamienia base64 bajtów float32 (little-endian) z serwera na Float32Array. */
+export const decodeFloat32 = (payload: Float32Payload): Float32Array => {
+    const binary = atob(payload.data);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new Float32Array(bytes.buffer);
+};
@@ -0,0 +1,79 @@
+import type { StatsReport } from '../../interfaces';
+import './StatsPanel.scss';
+
+interface Props {
+    stats: StatsReport | null;
+    profileSummary: string;
+    sendStats: (options: Record<string, any>, infoForUser: string) => void;
+}
+
+const StatsPanel = ({ stats, profileSummary, sendStats }: Props) => {
+    const enabled = stats?.stats.enabled ?? false;
+
+    return (
+        <div className="StatsPanel">
+            <h2>Statystyki zlecenia</h2>
+            <div className="StatsPanel__btns">
+                <button onClick={() => sendStats({ enable: !enabled }, enabled ? 'Wyłączanie pomiaru' : 'Włączanie pomiaru')} className="StatsPanel__btn">
+                    {enabled ? 'Wyłącz pomiar' : 'Włącz pomiar'}
+                </button>
+                <button onClick={() => sendStats({}, 'Pobieranie statystyk')} className="StatsPanel__btn">
+                    Odśwież
+                </button>
+                <button onClick={() => sendStats({ reset: true }, 'Zerowanie statystyk')} className="StatsPanel__btn">
+                    Wyzeruj
+                </button>
+                <button onClick={() => sendStats({ profile: 'cprofile' }, 'Trwa profilowanie')} className="StatsPanel__btn">
+                    Profil (cProfile)
+                </button>
+            </div>
+
+            {stats && (
+                <div className="StatsPanel__tables">
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Stoper</th>
+                                <th>Liczba</th>
+                                <th>Suma [s]</th>
+                                <th>Średnio [s]</th>
+                                <th>Max [s]</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            {Object.entries(stats.stats.timers).map(([name, t]) => (
+                                <tr key={name}>
+                                    <td>{name}</td>
+                                    <td>{t.count}</td>
+                                    <td>{t.total_s.toFixed(3)}</td>
+                                    <td>{t.mean_s.toFixed(4)}</td>
+                                    <td>{t.max_s.toFixed(4)}</td>
+                                </tr>
+                            ))}
+                        </tbody>
+                    </table>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Licznik</th>
+                                <th>Wartość</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            {Object.entries(stats.stats.counters).map(([name, value]) => (
+                                <tr key={name}>
+                                    <td>{name}</td>
+                                    <td>{value}</td>
+                                </tr>
+                            ))}
+                        </tbody>
+                    </table>
+                </div>
+            )}
+
+            {profileSummary && <pre className="StatsPanel__profile">{profileSummary}</pre>}
+        </div>
+    );
+};
+
+export default StatsPanel;
@@ -11,6 +11,8 @@ interface WebSocketOptions {
 interface Message {
     type: string;
     message: any;
+    // tylko wiadomości zlecenia (send_job po stronie serwera)
+    job_id?: string;
 }
 
 /**
@@ -37,4 +37,54 @@ export interface AlgorithmSchema {
   name: string,
   params: AlhoritmParamSchema[] 
   isUsed?: boolean
-}
\ No newline at end of file
+}
+
+export interface GenerationTelemetry {
+  kind: "generation",
+  algorithm: string,
+  iteration: number,
+  iterations: number,
+  generation_best: number,
+  best_sigma: number,
+  best_params: Record<string, number | string>
+}
+
+export interface JobSummary {
+  job_id: string,
+  priority: number,
+  status: "queued" | "running" | "paused" | "stopped" | "finished" | "error",
+  created: number,
+  function: string,
+  progressInfo: Record<string, number>,
+  queue_position: number | null
+}
+
+export interface TimerStats {
+  count: number,
+  total_s: number,
+  mean_s: number,
+  max_s: number
+}
+
+export interface StatsReport {
+  job_id: string,
+  status: JobSummary["status"],
+  stats: {
+    enabled: boolean,
+    timers: Record<string, TimerStats>,
+    counters: Record<string, number>
+  },
+  memoization: Record<string, Record<string, number>>,
+  executor?: Record<string, any>
+}
+
+export interface ProfileReport {
+  job_id: string,
+  format: "pstats" | "html",
+  filename: string,
+  data: string,
+  summary: string,
+  algorithm: string,
+  params: Record<string, number | string>,
+  fitness: number
+}
@@ -1,12 +1,20 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Callable, Tuple, List
+from typing import Callable, Tuple, List, Optional
 
+from algorithms.vectorized import evaluate_population, per_replica
+from algorithms.stepping import run_steps
+from algorithms.positionLog import PositionLog
+from algorithms.evaluationBudget import EvaluationBudget, finish_early
+from algorithms.jitKernels import abc_candidates, abc_greedy_replace
 
-def initialize_population(n_bees: int, dim: int, bounds: Tuple[float, float], objective_func: Callable):
 
-    food_sources = np.random.uniform(bounds[0], bounds[1], (n_bees, dim))
-    fitness = np.array([objective_func(source) for source in food_sources])
+def initialize_population(n_bees: int, dim: int, bounds: Tuple[float, float], objective_func: Callable,
+                          rng: Optional[np.random.Generator] = None):
+    rng = np.random.default_rng() if rng is None else rng
+
+    food_sources = rng.uniform(bounds[0], bounds[1], (n_bees, dim))
+    fitness = evaluate_population(objective_func, food_sources)
     trial_counter = np.zeros(n_bees)
 
     best_idx = np.argmin(fitness)
@@ -17,17 +25,18 @@ def initialize_population(n_bees: int, dim: int, bounds: Tuple[float, float], ob
 
 
 
-def produce_new_solution(food_sources: np.ndarray, bee_idx: int, bounds: Tuple[float, float]) -> np.ndarray:
-    
+def produce_new_solution(food_sources: np.ndarray, bee_idx: int, bounds: Tuple[float, float],
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng() if rng is None else rng
     dim = food_sources.shape[1]
     new_solution = food_sources[bee_idx].copy()
 
-    j = np.random.randint(0, dim)
-    k = np.random.randint(0, food_sources.shape[0])
+    j = rng.integers(0, dim)
+    k = rng.integers(0, food_sources.shape[0])
     while k == bee_idx:
-        k = np.random.randint(0, food_sources.shape[0])
+        k = rng.integers(0, food_sources.shape[0])
 
-    phi = np.random.uniform(-1, 1)
+    phi = rng.uniform(-1, 1)
     new_solution[j] = food_sources[bee_idx, j] + phi * (food_sources[bee_idx, j] - food_sources[k, j])
     new_solution[j] = np.clip(new_solution[j], bounds[0], bounds[1])
 
@@ -35,10 +44,11 @@ def produce_new_solution(food_sources: np.ndarray, bee_idx: int, bounds: Tuple[f
 
 
 
-def employed_bees_phase(food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func):
+def employed_bees_phase(food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
 
     for i in range(food_sources.shape[0]):
-        new_solution = produce_new_solution(food_sources, i, bounds)
+        new_solution = produce_new_solution(food_sources, i, bounds, rng)
         new_fitness = objective_func(new_solution)
 
         if new_fitness < fitness[i]:
@@ -56,23 +66,25 @@ def employed_bees_phase(food_sources, fitness, trial_counter, best_solution, bes
 
 
 
-def roulette_wheel_selection(probabilities: np.ndarray) -> int:
+def roulette_wheel_selection(probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> int:
+    rng = np.random.default_rng() if rng is None else rng
 
-    r = np.random.random()
+    r = rng.random()
     cumsum = np.cumsum(probabilities)
     return np.searchsorted(cumsum, r)
 
 
 
 
-def onlooker_bees_phase(food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func):
+def onlooker_bees_phase(food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func, rng=None):
     """Pszczoły obserwatorki wybierają źródła probabilistycznie i próbują je ulepszyć."""
+    rng = np.random.default_rng() if rng is None else rng
     fitness_sum = np.sum(1.0 / (1.0 + fitness))
     probabilities = (1.0 / (1.0 + fitness)) / fitness_sum
 
     for i in range(food_sources.shape[0]):
-        selected_idx = roulette_wheel_selection(probabilities)
-        new_solution = produce_new_solution(food_sources, selected_idx, bounds)
+        selected_idx = roulette_wheel_selection(probabilities, rng)
+        new_solution = produce_new_solution(food_sources, selected_idx, bounds, rng)
         new_fitness = objective_func(new_solution)
 
         if new_fitness < fitness[selected_idx]:
@@ -90,11 +102,12 @@ def onlooker_bees_phase(food_sources, fitness, trial_counter, best_solution, bes
 
 
 
-def scout_bees_phase(food_sources, fitness, trial_counter, bounds, objective_func, limit):
+def scout_bees_phase(food_sources, fitness, trial_counter, bounds, objective_func, limit, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
 
     max_trial_idx = np.argmax(trial_counter)
     if trial_counter[max_trial_idx] >= limit:
-        food_sources[max_trial_idx] = np.random.uniform(bounds[0], bounds[1], food_sources.shape[1])
+        food_sources[max_trial_idx] = rng.uniform(bounds[0], bounds[1], food_sources.shape[1])
         fitness[max_trial_idx] = objective_func(food_sources[max_trial_idx])
         trial_counter[max_trial_idx] = 0
     return food_sources, fitness, trial_counter
@@ -103,12 +116,15 @@ def scout_bees_phase(food_sources, fitness, trial_counter, bounds, objective_fun
 
 
 
-def artificial_bee_colony(n_bees, dim, bounds, max_iter, objective_func, limit=None, save_every=1):
+def artificial_bee_colony(n_bees, dim, bounds, max_iter, objective_func, limit=None, save_every=1, rng=None):
     """Główna funkcja optymalizacji ABC."""
+    # Własny generator na uruchomienie (powtarzalność bez globalnego np.random.seed)
+    rng = np.random.default_rng() if rng is None else rng
+
     if limit is None:
         limit = n_bees * dim
 
-    food_sources, fitness, trial_counter, best_solution, best_fitness = initialize_population(n_bees, dim, bounds, objective_func)
+    food_sources, fitness, trial_counter, best_solution, best_fitness = initialize_population(n_bees, dim, bounds, objective_func, rng)
     convergence_curve = [best_fitness]
 
     # Log pozycji agentów (tylko dla dim = 2)
@@ -122,13 +138,13 @@ def artificial_bee_colony(n_bees, dim, bounds, max_iter, objective_func, limit=N
 
     for iteration in range(max_iter):
         food_sources, fitness, trial_counter, best_solution, best_fitness = employed_bees_phase(
-            food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func
+            food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func, rng
         )
         food_sources, fitness, trial_counter, best_solution, best_fitness = onlooker_bees_phase(
-            food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func
+            food_sources, fitness, trial_counter, best_solution, best_fitness, bounds, objective_func, rng
         )
         food_sources, fitness, trial_counter = scout_bees_phase(
-            food_sources, fitness, trial_counter, bounds, objective_func, limit
+            food_sources, fitness, trial_counter, bounds, objective_func, limit, rng
         )
 
         convergence_curve.append(best_fitness)
@@ -137,4 +153,201 @@ def artificial_bee_colony(n_bees, dim, bounds, max_iter, objective_func, limit=N
         if dim == 2 and (iteration + 1) % save_every == 0:
             positions_log.append(food_sources.copy())
 
-    return best_solution, best_fitness, convergence_curve, positions_log
\ No newline at end of file
+    return best_solution, best_fitness, convergence_curve, positions_log
+
+
+# ============================================================
+# WERSJA POPULACYJNA
+# Kandydaci wszystkich pszczół robotnic budowani naraz i oceniani jednym
+# wywołaniem, obserwatorki losowane jednym searchsorted, zachłanna
+# wymiana i trial_counter na tablicach. Wersja multi-run prowadzi R
+# niezależnych kolonii jako tablicę (R, n_bees, dim), każda z własnym
+# generatorem. Wyniki są równoważne artificial_bee_colony statystycznie,
+# nie co do losowania - patrz tests/test_artificial_bee_colony.py.
+# ============================================================
+
+def _neighbour_draws(rngs, bee_idx, n_sources, dim):
+    """Losowania produce_new_solution dla macierzy pszczół (R, m): (j, k, phi), partner k != bee_idx."""
+    m = bee_idx.shape[1]
+    j = per_replica(rngs, lambda g: g.integers(0, dim, m))
+    # Partner bez pętli odrzucania: losujemy z n-1 źródeł i przesuwamy
+    if n_sources > 1:
+        k = per_replica(rngs, lambda g: g.integers(0, n_sources - 1, m))
+        k += k >= bee_idx
+    else:
+        k = bee_idx.copy()
+    phi = per_replica(rngs, lambda g: g.uniform(-1, 1, m))
+    return j, k, phi
+
+
+def produce_new_solutions(food_sources: np.ndarray, bee_idx: np.ndarray, j: np.ndarray, k: np.ndarray,
+                          phi: np.ndarray, bounds: Tuple[float, float], backend: str = "numpy") -> np.ndarray:
+    """Wersja produce_new_solution dla macierzy indeksów pszczół (R, m) -> kandydaci (R, m, dim)."""
+    if backend == "numba":
+        return abc_candidates(food_sources, bee_idx, j, k, phi, float(bounds[0]), float(bounds[1]))
+
+    replicas = np.arange(food_sources.shape[0])[:, None]
+    rows = np.arange(bee_idx.shape[1])
+    new_solutions = food_sources[replicas, bee_idx]
+    new_solutions[replicas, rows, j] = np.clip(
+        food_sources[replicas, bee_idx, j] + phi * (food_sources[replicas, bee_idx, j] - food_sources[replicas, k, j]),
+        bounds[0], bounds[1]
+    )
+    return new_solutions
+
+
+def _greedy_replace(food_sources, fitness, trial_counter, best_solution, best_fitness, bee_idx, new_solutions,
+                    new_fitness, active):
+    """
+    Zachłanna wymiana (w miejscu) dla prób active (R, m); źródła aktywnych
+    prób jednej kolonii są różne. Lepszy kandydat zastępuje źródło i zeruje
+    trial_counter, gorszy zwiększa go o 1; najlepsze rozwiązanie kolonii
+    zmienia tylko przyjęty kandydat.
+    """
+    rows, tries = np.nonzero(active)
+    sources = bee_idx[rows, tries]
+    accepted = new_fitness[rows, tries] < fitness[rows, sources]
+    won_rows, won_sources, won_tries = rows[accepted], sources[accepted], tries[accepted]
+    food_sources[won_rows, won_sources] = new_solutions[won_rows, won_tries]
+    fitness[won_rows, won_sources] = new_fitness[won_rows, won_tries]
+    trial_counter[won_rows, won_sources] = 0
+    trial_counter[rows[~accepted], sources[~accepted]] += 1
+
+    won_fitness = np.full(new_fitness.shape, np.inf)
+    won_fitness[won_rows, won_tries] = new_fitness[won_rows, won_tries]
+    replicas = np.arange(len(best_fitness))
+    best_try = np.argmin(won_fitness, axis=1)
+    better = won_fitness[replicas, best_try] < best_fitness
+    best_solution[better] = new_solutions[replicas[better], best_try[better]]
+    best_fitness[better] = won_fitness[replicas[better], best_try[better]]
+
+
+def _roulette(cumsum, draws):
+    """
+    Koło ruletki dla wszystkich kolonii jednym searchsorted: wiersz r
+    dystrybuanty (R, n) i losowań (R, m) przesunięty o r, więc wiersze
+    tworzą jedną rosnącą tablicę. Zwraca indeksy źródeł (R, m).
+    """
+    R, n = cumsum.shape
+    offsets = np.arange(R)[:, None]
+    idx = np.searchsorted((cumsum + offsets).ravel(), (draws + offsets).ravel()).reshape(draws.shape)
+    return np.clip(idx - offsets * n, 0, n - 1)
+
+
+def _visit_rounds(selected):
+    """Która to wizyta przy tym samym źródle kolonii (0 - pierwsza) dla każdej obserwatorki (R, m)."""
+    R, m = selected.shape
+    order = np.argsort(selected, axis=1, kind="stable")
+    sorted_sources = np.take_along_axis(selected, order, axis=1)
+    positions = np.broadcast_to(np.arange(m), (R, m))
+    first = np.ones((R, m), dtype=bool)
+    first[:, 1:] = sorted_sources[:, 1:] != sorted_sources[:, :-1]
+    group_start = np.maximum.accumulate(np.where(first, positions, 0), axis=1)
+    rounds = np.empty((R, m), dtype=np.int64)
+    np.put_along_axis(rounds, order, positions - group_start, axis=1)
+    return rounds
+
+
+def artificial_bee_colony_steps(n_bees, dim, bounds, max_iter, objective_func, rngs, limit=None, save_every=1,
+                                max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """
+    Silnik krokowy (generator): yield po każdej iteracji, na końcu zwraca
+    (best (R, dim), best_fitness (R,), convergence (R, max_iter + 1), positions_log,
+    position_steps), gdzie positions_log to tablica float32 (klatki, R, n_bees, dim) - patrz
+    PositionLog (save_every = krok zapisu; log_positions=None - tylko dla dim == 2).
+    position_steps - numer iteracji każdej klatki (0 - populacja początkowa).
+    budget - licznik ewaluacji z limitem (patrz BatAlgorithm.bat_algorithm_steps);
+    zwiadowcy zużywają budżet różnie w replikach, więc repliki z wyczerpanym
+    budżetem stoją w miejscu, dopóki nie skończą wszystkie.
+    backend="numba" - kandydaci i zachłanna wymiana w kernelach z jitKernels.
+    """
+    if limit is None:
+        limit = n_bees * dim
+    R = len(rngs)
+    replicas = np.arange(R)
+    budget = EvaluationBudget(R) if budget is None else budget
+
+    food_sources = per_replica(rngs, lambda g: g.uniform(bounds[0], bounds[1], (n_bees, dim)))
+    fitness = budget.evaluate(objective_func, food_sources)
+    trial_counter = np.zeros((R, n_bees))
+
+    best_idx = np.argmin(fitness, axis=1)
+    best_solution = food_sources[replicas, best_idx].copy()
+    best_fitness = fitness[replicas, best_idx]
+
+    convergence_curve = np.empty((R, max_iter + 1))
+    convergence_curve[:, 0] = best_fitness
+
+    positions_log = PositionLog((R, n_bees, dim), max_iter + 1, max_frames, save_every,
+                                enabled=dim == 2 if log_positions is None else log_positions)
+    positions_log.record(0, food_sources)
+
+    all_bees = np.broadcast_to(np.arange(n_bees), (R, n_bees))
+    everyone = np.ones((R, n_bees), dtype=bool)
+    replace = abc_greedy_replace if backend == "numba" else _greedy_replace
+
+    for iteration in range(max_iter):
+        if budget.exhausted:
+            finish_early(convergence_curve, positions_log, iteration, best_fitness, food_sources)
+            break
+        # Pszczoły robotnice - kandydaci wszystkich pszczół i jedna ocena
+        j, k, phi = _neighbour_draws(rngs, all_bees, n_bees, dim)
+        new_solutions = produce_new_solutions(food_sources, all_bees, j, k, phi, bounds, backend)
+        new_fitness = budget.evaluate(objective_func, new_solutions)
+        replace(food_sources, fitness, trial_counter, best_solution, best_fitness, all_bees, new_solutions,
+                new_fitness, everyone)
+
+        # Pszczoły obserwatorki - jedna dystrybuanta i jedno searchsorted dla wszystkich kolonii
+        weights = 1.0 / (1.0 + fitness)
+        cumsum = np.cumsum(weights / np.sum(weights, axis=1, keepdims=True), axis=1)
+        selected = _roulette(cumsum, per_replica(rngs, lambda g: g.random(n_bees)))
+        j, k, phi = _neighbour_draws(rngs, selected, n_bees, dim)
+        # Obserwatorki przy tym samym źródle idą kolejnymi rundami - każda
+        # zaczyna od źródła poprawionego przez poprzednią, jak w
+        # artificial_bee_colony. W rundzie źródła kolonii są różne, więc
+        # runda to jedna ocena; rund jest tyle, ile wizyt przy najczęściej
+        # wybranym źródle.
+        rounds = _visit_rounds(selected)
+        for visit in range(rounds.max() + 1):
+            active = rounds == visit
+            new_solutions = produce_new_solutions(food_sources, selected, j, k, phi, bounds, backend)
+            new_fitness = budget.evaluate(objective_func, new_solutions, mask=active)
+            replace(food_sources, fitness, trial_counter, best_solution, best_fitness, selected, new_solutions,
+                    new_fitness, active)
+
+        # Zwiadowcy - nowe źródło tylko w koloniach, w których któreś się wyczerpało
+        # (bez budżetu na zwiadowcę źródło zostaje - nie da się go ocenić)
+        max_trial_idx = np.argmax(trial_counter, axis=1)
+        exhausted = (trial_counter[replicas, max_trial_idx] >= limit) & budget.available()
+        if np.any(exhausted):
+            rows, cols = replicas[exhausted], max_trial_idx[exhausted]
+            scouts = np.stack([rngs[r].uniform(bounds[0], bounds[1], dim) for r in rows])
+            food_sources[rows, cols] = scouts
+            fitness[rows, cols] = budget.evaluate(objective_func, scouts[:, None], rows)[:, 0]
+            trial_counter[rows, cols] = 0
+
+        convergence_curve[:, iteration + 1] = best_fitness
+
+        positions_log.record(iteration + 1, food_sources)
+
+        yield
+
+    return best_solution, best_fitness, convergence_curve, positions_log.frames(), positions_log.steps()
+
+
+def artificial_bee_colony_multi_run(n_bees, dim, bounds, max_iter, objective_func, rngs, limit=None, save_every=1,
+                                    max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """R replik do końca (bez przerw) - patrz artificial_bee_colony_steps."""
+    return run_steps(artificial_bee_colony_steps(n_bees, dim, bounds, max_iter, objective_func, rngs, limit,
+                                                 save_every, max_frames, log_positions, budget, backend))
+
+
+def artificial_bee_colony_vectorized(n_bees, dim, bounds, max_iter, objective_func, limit=None, save_every=1, rng=None,
+                                     max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """Pojedyncze uruchomienie wersji populacyjnej (multi-run z R = 1)."""
+    rng = np.random.default_rng() if rng is None else rng
+    best_solution, best_fitness, convergence_curve, positions_log, position_steps = artificial_bee_colony_multi_run(
+        n_bees, dim, bounds, max_iter, objective_func, [rng], limit, save_every, max_frames, log_positions, budget,
+        backend
+    )
+    return best_solution[0], best_fitness[0], list(convergence_curve[0]), [p[0] for p in positions_log], list(position_steps)
@@ -2,25 +2,30 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Callable, Tuple, List
 
+from algorithms.vectorized import evaluate_population, per_replica
+from algorithms.stepping import run_steps
+from algorithms.positionLog import PositionLog
+from algorithms.evaluationBudget import EvaluationBudget, finish_early
+from algorithms.jitKernels import bat_accept, bat_move
 
-def initialization_bats(bounds, n_bats, dims):
-    x = np.zeros((n_bats, dims))
-    for i in range(n_bats):
-        for j in range(dims):
-            x[i, j] = bounds[0] + np.random.rand() * (bounds[1] - bounds[0])
-    return x
 
-def update_position_frequency_velocity(xi, vi, best, f_bounds, A_avg, ri):
+def initialization_bats(bounds, n_bats, dims, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    # Jedno losowanie całej macierzy (te same liczby co pętla wiersz po wierszu)
+    return bounds[0] + rng.random((n_bats, dims)) * (bounds[1] - bounds[0])
+
+def update_position_frequency_velocity(xi, vi, best, f_bounds, A_avg, ri, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
     f_min, f_max = f_bounds
 
-    beta = np.random.rand()                 # Losowa liczba z zakresu (0,1)
+    beta = rng.random()                     # Losowa liczba z zakresu (0,1)
     f = f_min + (f_max - f_min) * beta      # Przypisywanie nowej częstotliwości
 
     vi = vi + (best - xi) * f                  # Aktualizacja prędkości
     xi += vi                                # Aktualizacja pozycji bata
 
-    if np.random.rand() < ri:
-        epsilon = np.random.rand()
+    if rng.random() < ri:
+        epsilon = rng.random()
         xi = best + epsilon * A_avg         # Lokalna eksploracja
 
     return xi, vi, f
@@ -31,14 +36,17 @@ def adjust_loudness(A, alpha):
 def adjust_pulse_rate(r0, gamma, t):
     return  r0 * (1 - np.exp(-gamma * t))
 
-def bat_algorithm(fn,n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, save_every=1):
+def bat_algorithm(fn,n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, save_every=1, rng=None):
+    # Własny generator na uruchomienie (powtarzalność bez globalnego np.random.seed)
+    rng = np.random.default_rng() if rng is None else rng
+
     v = np.zeros((n_bats, dims))
-    x = initialization_bats(bounds, n_bats, dims)
+    x = initialization_bats(bounds, n_bats, dims, rng)
     f = np.zeros(n_bats)
     A = np.full(n_bats, 1.5)
     r0 = np.full(n_bats, 0.5)
 
-    fitness = np.array([fn(xi) for xi in x])
+    fitness = evaluate_population(fn, x)
     best_idx = np.argmin(fitness)
     best = x[best_idx].copy()
     best_f = fitness[best_idx]
@@ -58,13 +66,13 @@ def bat_algorithm(fn,n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, sav
             r_new[i] = adjust_pulse_rate(r0[i], gamma, t)
             A[i] = adjust_loudness(A[i], alpha)
 
-            x[i], v[i], f[i] = update_position_frequency_velocity(x[i], v[i], best, f_bounds, a_avg, r_new[i])
+            x[i], v[i], f[i] = update_position_frequency_velocity(x[i], v[i], best, f_bounds, a_avg, r_new[i], rng)
 
             x[i] = np.clip(x[i], bounds[0], bounds[1])
 
             f_new = fn(x[i])
 
-            if np.random.rand() < A[i] and f_new < fitness[i]:
+            if rng.random() < A[i] and f_new < fitness[i]:
                 fitness[i] = f_new
                 A[i] = adjust_loudness(A[i], alpha)
                 r_new[i] = adjust_pulse_rate(r0[i], gamma, t)
@@ -82,4 +90,117 @@ def bat_algorithm(fn,n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, sav
         if dims == 2 and (t + 1) % save_every == 0:
             positions_log.append(x.copy())
 
-    return best, best_f, convergence_curve, positions_log
\ No newline at end of file
+    return best, best_f, convergence_curve, positions_log
+
+
+# ============================================================
+# WERSJA POPULACYJNA
+# Wszystkie nietoperze aktualizowane naraz operacjami na tablicach,
+# populacja oceniana jednym wywołaniem na iterację. Wersja multi-run
+# prowadzi R niezależnych replik jako tablicę (R, n_bats, dims), każda
+# z własnym generatorem. Nietoperze iteracji lecą do najlepszego
+# rozwiązania z jej początku (w bat_algorithm - poprawianego po każdym
+# nietoperzu), więc wyniki są równoważne statystycznie, nie co do
+# losowania - patrz tests/test_bat_algorithm.py.
+# ============================================================
+
+def bat_algorithm_steps(fn, n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, rngs, save_every=1,
+                        max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """
+    Silnik krokowy (generator): yield po każdej iteracji, na końcu zwraca
+    (best (R, dims), best_f (R,), convergence (R, max_iter + 1), positions_log,
+    position_steps), gdzie positions_log to tablica float32 (klatki, R, n_bats, dims) - patrz
+    PositionLog (save_every = krok zapisu; log_positions=None - tylko dla dims == 2).
+    position_steps - numer iteracji każdej klatki (0 - populacja początkowa).
+    budget (EvaluationBudget) liczy ewaluacje; po wyczerpaniu limitu silnik
+    kończy wcześniej, a krzywa i klatki do max_iter zostają na ostatnim stanie.
+    backend="numba" - ruch i akceptacja nietoperzy w kernelach z jitKernels.
+    """
+    R = len(rngs)
+    replicas = np.arange(R)
+    f_min, f_max = f_bounds
+    budget = EvaluationBudget(R) if budget is None else budget
+
+    v = np.zeros((R, n_bats, dims))
+    x = per_replica(rngs, lambda g: initialization_bats(bounds, n_bats, dims, g))
+    A = np.full((R, n_bats), 1.5)
+    r0 = 0.5
+
+    fitness = budget.evaluate(fn, x)
+    best_idx = np.argmin(fitness, axis=1)
+    best = x[replicas, best_idx].copy()
+    best_f = fitness[replicas, best_idx]
+
+    convergence_curve = np.empty((R, max_iter + 1))
+    convergence_curve[:, 0] = best_f
+
+    # Log pozycji
+    positions_log = PositionLog((R, n_bats, dims), max_iter + 1, max_frames, save_every,
+                                enabled=dims == 2 if log_positions is None else log_positions)
+    positions_log.record(0, x)
+
+    for t in range(max_iter):
+        if budget.exhausted:
+            finish_early(convergence_curve, positions_log, t, best_f, x)
+            break
+        a_avg = np.mean(A, axis=1)
+        r_new = adjust_pulse_rate(r0, gamma, t)
+        A *= alpha
+
+        # Częstotliwości, prędkości i pozycje wszystkich nietoperzy
+        f = f_min + (f_max - f_min) * per_replica(rngs, lambda g: g.random(n_bats))
+        local = per_replica(rngs, lambda g: g.random(n_bats)) < r_new
+        epsilon = per_replica(rngs, lambda g: g.random(n_bats))
+        if backend == "numba":
+            bat_move(x, v, best, f, local, epsilon, a_avg, float(bounds[0]), float(bounds[1]))
+        else:
+            v += (best[:, None, :] - x) * f[:, :, None]
+            x += v
+
+            # Lokalna eksploracja wokół najlepszego rozwiązania repliki
+            walk = best[:, None, :] + epsilon[:, :, None] * a_avg[:, None, None]
+            x = np.where(local[:, :, None], walk, x)
+
+            np.clip(x, bounds[0], bounds[1], out=x)
+
+        f_new = budget.evaluate(fn, x)
+
+        draws = per_replica(rngs, lambda g: g.random(n_bats))
+        if backend == "numba":
+            bat_accept(x, fitness, f_new, A, draws, alpha, best, best_f)
+        else:
+            accepted = (draws < A) & (f_new < fitness)
+            fitness[accepted] = f_new[accepted]
+            A[accepted] *= alpha
+
+            new_best_idx = np.argmin(f_new, axis=1)
+            new_best_f = f_new[replicas, new_best_idx]
+            improved = new_best_f < best_f
+            best_f = np.where(improved, new_best_f, best_f)
+            best[improved] = x[replicas[improved], new_best_idx[improved]]
+
+        convergence_curve[:, t + 1] = best_f
+
+        positions_log.record(t + 1, x)
+
+        yield
+
+    return best, best_f, convergence_curve, positions_log.frames(), positions_log.steps()
+
+
+def bat_algorithm_multi_run(fn, n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, rngs, save_every=1,
+                            max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """R replik do końca (bez przerw) - patrz bat_algorithm_steps."""
+    return run_steps(bat_algorithm_steps(fn, n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, rngs,
+                                         save_every, max_frames, log_positions, budget, backend))
+
+
+def bat_algorithm_vectorized(fn, n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, save_every=1, rng=None,
+                             max_frames=None, log_positions=None, budget=None, backend="numpy"):
+    """Pojedyncze uruchomienie wersji populacyjnej (multi-run z R = 1)."""
+    rng = np.random.default_rng() if rng is None else rng
+    best, best_f, convergence_curve, positions_log, position_steps = bat_algorithm_multi_run(
+        fn, n_bats, bounds, alpha, gamma, f_bounds, max_iter, dims, [rng], save_every, max_frames, log_positions,
+        budget, backend
+    )
+    return best[0], best_f[0], list(convergence_curve[0]), [p[0] for p in positions_log], list(position_steps)
@@ -1,12 +1,20 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Callable, Tuple, List
+from typing import Callable, Tuple, List, Optional
 
+from algorithms.vectorized import evaluate_population, per_replica
+from algorithms.stepping import run_steps
+from algorithms.positionLog import PositionLog
+from algorithms.evaluationBudget import EvaluationBudget, finish_early
+from algorithms.jitKernels import ga_tournament
 
 
-def initialize_population(pop_size: int, dim: int, bounds: Tuple[float, float], objective_func: Callable):
-    population = np.random.uniform(bounds[0], bounds[1], (pop_size, dim))
-    fitness = np.array([objective_func(individual) for individual in population])
+
+def initialize_population(pop_size: int, dim: int, bounds: Tuple[float, float], objective_func: Callable,
+                          rng: Optional[np.random.Generator] = None):
+    rng = np.random.default_rng() if rng is None else rng
+    population = rng.uniform(bounds[0], bounds[1], (pop_size, dim))
+    fitness = evaluate_population(objective_func, population)
 
     best_idx = np.argmin(fitness)
     best_solution = population[best_idx].copy()
@@ -16,9 +24,11 @@ def initialize_population(pop_size: int, dim: int, bounds: Tuple[float, float],
 
 
 
-def tournament_selection(population: np.ndarray, fitness: np.ndarray, tournament_size: int = 3) -> np.ndarray:
+def tournament_selection(population: np.ndarray, fitness: np.ndarray, tournament_size: int = 3,
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng() if rng is None else rng
     pop_size = population.shape[0]
-    tournament_indices = np.random.choice(pop_size, tournament_size, replace=False)
+    tournament_indices = rng.choice(pop_size, tournament_size, replace=False)
     tournament_fitness = fitness[tournament_indices]
     winner_idx = tournament_indices[np.argmin(tournament_fitness)]
     return population[winner_idx].copy()
@@ -32,9 +42,11 @@ def arithmetic_crossover(parent1: np.ndarray, parent2: np.ndarray, alpha: float
 
 
 
-def single_point_crossover(parent1: np.ndarray, parent2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+def single_point_crossover(parent1: np.ndarray, parent2: np.ndarray,
+                           rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng() if rng is None else rng
     dim = len(parent1)
-    point = np.random.randint(1, dim)
+    point = rng.integers(1, dim)
 
     offspring1 = np.concatenate([parent1[:point], parent2[point:]])
     offspring2 = np.concatenate([parent2[:point], parent1[point:]])
@@ -44,13 +56,15 @@ def single_point_crossover(parent1: np.ndarray, parent2: np.ndarray) -> Tuple[np
 
 
 def gaussian_mutation(individual: np.ndarray, bounds: Tuple[float, float],
-                      mutation_rate: float = 0.1, mutation_scale: float = 0.1) -> np.ndarray:
+                      mutation_rate: float = 0.1, mutation_scale: float = 0.1,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng() if rng is None else rng
     mutated = individual.copy()
     dim = len(individual)
 
     for i in range(dim):
-        if np.random.random() < mutation_rate:
-            noise = np.random.normal(0, mutation_scale * (bounds[1] - bounds[0]))
+        if rng.random() < mutation_rate:
+            noise = rng.normal(0, mutation_scale * (bounds[1] - bounds[0]))
             mutated[i] = mutated[i] + noise
             mutated[i] = np.clip(mutated[i], bounds[0], bounds[1])
 
@@ -59,20 +73,23 @@ def gaussian_mutation(individual: np.ndarray, bounds: Tuple[float, float],
 
 
 def uniform_mutation(individual: np.ndarray, bounds: Tuple[float, float],
-                     mutation_rate: float = 0.1) -> np.ndarray:
+                     mutation_rate: float = 0.1,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng() if rng is None else rng
     mutated = individual.copy()
     dim = len(individual)
 
     for i in range(dim):
-        if np.random.random() < mutation_rate:
-            mutated[i] = np.random.uniform(bounds[0], bounds[1])
+        if rng.random() < mutation_rate:
+            mutated[i] = rng.uniform(bounds[0], bounds[1])
 
     return mutated
 
 
 
 def elitism(population: np.ndarray, fitness: np.ndarray, n_elite: int) -> Tuple[np.ndarray, np.ndarray]:
-    elite_indices = np.argsort(fitness)[:n_elite]
+    # argpartition wystarczy - kolejność wewnątrz elity nie ma znaczenia
+    elite_indices = np.argpartition(fitness, n_elite - 1)[:n_elite]
     elite_population = population[elite_indices].copy()
     elite_fitness = fitness[elite_indices].copy()
     return elite_population, elite_fitness
@@ -88,10 +105,14 @@ def genetic_algorithm(pop_size: int, dim: int, bounds: Tuple[float, float],
                       tournament_size: int = 3,
                       crossover_type: str = 'arithmetic',
                       mutation_type: str = 'gaussian',
-                      save_every: int = 1):
+                      save_every: int = 1,
+                      rng: Optional[np.random.Generator] = None):
+    # Własny generator na uruchomienie (powtarzalność bez globalnego np.random.seed)
+    rng = np.random.default_rng() if rng is None else rng
+
     # Inicjalizacja
     population, fitness, best_solution, best_fitness = initialize_population(
-        pop_size, dim, bounds, objective_func
+        pop_size, dim, bounds, objective_func, rng
     )
     convergence_curve = [best_fitness]
 
@@ -106,13 +127,13 @@ def genetic_algorithm(pop_size: int, dim: int, bounds: Tuple[float, float],
     if crossover_type == 'arithmetic':
         crossover_func = arithmetic_crossover
     else:
-        crossover_func = single_point_crossover
+        crossover_func = lambda p1, p2: single_point_crossover(p1, p2, rng)
 
     # Wybór typu mutacji
     if mutation_type == 'gaussian':
-        mutation_func = lambda ind: gaussian_mutation(ind, bounds, mutation_rate, mutation_scale)
+        mutation_func = lambda ind: gaussian_mutation(ind, bounds, mutation_rate, mutation_scale, rng)
     else:
-        mutation_func = lambda ind: uniform_mutation(ind, bounds, mutation_rate)
+        mutation_func = lambda ind: uniform_mutation(ind, bounds, mutation_rate, rng)
 
     # Główna pętla
     for generation in range(max_generations):
@@ -124,11 +145,11 @@ def genetic_algorithm(pop_size: int, dim: int, bounds: Tuple[float, float],
 
         while len(new_population) < pop_size - n_elite:
             # Selekcja rodziców
-            parent1 = tournament_selection(population, fitness, tournament_size)
-            parent2 = tournament_selection(population, fitness, tournament_size)
+            parent1 = tournament_selection(population, fitness, tournament_size, rng)
+            parent2 = tournament_selection(population, fitness, tournament_size, rng)
 
             # Krzyżowanie
-            if np.random.random() < crossover_rate:
+            if rng.random() < crossover_rate:
                 offspring1, offspring2 = crossover_func(parent1, parent2)
             else:
                 offspring1, offspring2 = parent1.copy(), parent2.copy()
@@ -146,7 +167,7 @@ def genetic_algorithm(pop_size: int, dim: int, bounds: Tuple[float, float],
         population = np.vstack([elite_population, new_population])
 
         # Obliczenie fitness
-        fitness = np.array([objective_func(individual) for individual in population])
+        fitness = evaluate_population(objective_func, population)
 
         # Aktualizacja najlepszego rozwiązania
         current_best_idx = np.argmin(fitness)
@@ -159,4 +180,200 @@ def genetic_algorithm(pop_size: int, dim: int, bounds: Tuple[float, float],
         if dim == 2 and (generation + 1) % save_every == 0:
             positions_log.append(population.copy())
 
-    return best_solution, best_fitness, convergence_curve, positions_log
\ No newline at end of file
+    return best_solution, best_fitness, convergence_curve, positions_log
+
+
+# ============================================================
+# WERSJA POPULACYJNA
+# Całe pokolenie budowane naraz: turnieje jedną macierzą indeksów,
+# krzyżowanie maskami, mutacja jedną maską Bernoulliego.
+# Wersja multi-run prowadzi R niezależnych replik jako tablicę
+# (R, pop_size, dim), każda z własnym generatorem.
+# ============================================================
+
+def generation_step_multi(population: np.ndarray, fitness: np.ndarray, n_elite: int,
+                          bounds: Tuple[float, float],
+                          crossover_rate: float, mutation_rate: float, mutation_scale: float,
+                          tournament_size: int, crossover_type: str, mutation_type: str,
+                          rngs: List[np.random.Generator], backend: str = "numpy") -> np.ndarray:
+    R, pop_size, dim = population.shape
+    replicas = np.arange(R)[:, None]
+    n_offspring = pop_size - n_elite
+    n_pairs = (n_offspring + 1) // 2
+
+    # Elityzm - argpartition wystarczy, kolejność wewnątrz elity nie ma znaczenia
+    elite_indices = np.argpartition(fitness, n_elite - 1, axis=1)[:, :n_elite]
+    elite_population = population[replicas, elite_indices]
+
+    # Turnieje bez powtórzeń: k najmniejszych losowych kluczy w każdym wierszu
+    k = min(tournament_size, pop_size)
+    keys = per_replica(rngs, lambda g: g.random((2 * n_pairs, pop_size)))
+    if backend == "numba":
+        winners = ga_tournament(keys, fitness, k)
+    else:
+        contestants = np.argpartition(keys, k - 1, axis=2)[:, :, :k]
+        contestants_fitness = fitness[replicas[:, :, None], contestants]
+        winners = np.take_along_axis(contestants, np.argmin(contestants_fitness, axis=2)[:, :, None], axis=2)[:, :, 0]
+    parents = population[replicas, winners]
+    parent1 = parents[:, :n_pairs]
+    parent2 = parents[:, n_pairs:]
+
+    # Krzyżowanie
+    do_crossover = (per_replica(rngs, lambda g: g.random(n_pairs)) < crossover_rate)[:, :, None]
+    if crossover_type == 'arithmetic':
+        child = 0.5 * parent1 + 0.5 * parent2
+        offspring1 = np.where(do_crossover, child, parent1)
+        offspring2 = np.where(do_crossover, child, parent2)
+    elif dim > 1:
+        points = per_replica(rngs, lambda g: g.integers(1, dim, n_pairs))
+        head = (np.arange(dim) < points[:, :, None]) | ~do_crossover
+        offspring1 = np.where(head, parent1, parent2)
+        offspring2 = np.where(head, parent2, parent1)
+    else:
+        offspring1, offspring2 = parent1, parent2
+
+    # Potomkowie w kolejności o1, o2, o1, o2, ... (jak w pętli)
+    offspring = np.stack([offspring1, offspring2], axis=2).reshape(R, -1, dim)[:, :n_offspring]
+
+    # Mutacja - szum losowany tylko dla zmutowanych genów, replika po replice
+    mutate = per_replica(rngs, lambda g: g.random((n_offspring, dim))) < mutation_rate
+    n_mutated = np.count_nonzero(mutate.reshape(R, -1), axis=1)
+    if mutation_type == 'gaussian':
+        sigma = mutation_scale * (bounds[1] - bounds[0])
+        noise = np.concatenate([g.normal(0, sigma, n) for g, n in zip(rngs, n_mutated)])
+        offspring[mutate] = np.clip(offspring[mutate] + noise, bounds[0], bounds[1])
+    else:
+        offspring[mutate] = np.concatenate([g.uniform(bounds[0], bounds[1], n) for g, n in zip(rngs, n_mutated)])
+
+    return np.concatenate([elite_population, offspring], axis=1)
+
+
+def generation_step(population: np.ndarray, fitness: np.ndarray, n_elite: int,
+                    bounds: Tuple[float, float],
+                    crossover_rate: float, mutation_rate: float, mutation_scale: float,
+                    tournament_size: int, crossover_type: str, mutation_type: str,
+                    rng: np.random.Generator) -> np.ndarray:
+    return generation_step_multi(
+        population[None], fitness[None], n_elite, bounds,
+        crossover_rate, mutation_rate, mutation_scale,
+        tournament_size, crossover_type, mutation_type, [rng]
+    )[0]
+
+
+def genetic_algorithm_steps(pop_size: int, dim: int, bounds: Tuple[float, float],
+                                max_generations: int, objective_func: Callable,
+                                crossover_rate: float = 0.8,
+                                mutation_rate: float = 0.1,
+                                mutation_scale: float = 0.1,
+                                elitism_rate: float = 0.1,
+                                tournament_size: int = 3,
+                                crossover_type: str = 'arithmetic',
+                                mutation_type: str = 'gaussian',
+                                save_every: int = 1,
+                                rngs: Optional[List[np.random.Generator]] = None,
+                                max_frames: Optional[int] = None,
+                                log_positions: Optional[bool] = None,
+                                budget: Optional[EvaluationBudget] = None,
+                                backend: str = "numpy"):
+    """
+    Silnik krokowy (generator): yield po każdej iteracji, na końcu zwraca
+    (best (R, dim), best_fitness (R,), convergence (R, max_generations + 1), positions_log,
+    position_steps), gdzie positions_log to tablica float32 (klatki, R, pop_size, dim) - patrz
+    PositionLog (save_every = krok zapisu; log_positions=None - tylko dla dim == 2).
+    position_steps - numer iteracji każdej klatki (0 - populacja początkowa).
+    budget - licznik ewaluacji z limitem (patrz BatAlgorithm.bat_algorithm_steps).
+    backend="numba" - turnieje w kernelu z jitKernels (remis - mniejszy klucz losowy).
+    """
+    rngs = [np.random.default_rng()] if rngs is None else rngs
+    R = len(rngs)
+    replicas = np.arange(R)
+    budget = EvaluationBudget(R) if budget is None else budget
+
+    population = per_replica(rngs, lambda g: g.uniform(bounds[0], bounds[1], (pop_size, dim)))
+    fitness = budget.evaluate(objective_func, population)
+    best_idx = np.argmin(fitness, axis=1)
+    best_solution = population[replicas, best_idx].copy()
+    best_fitness = fitness[replicas, best_idx]
+
+    convergence_curve = np.empty((R, max_generations + 1))
+    convergence_curve[:, 0] = best_fitness
+
+    # Log pozycji agentów
+    positions_log = PositionLog((R, pop_size, dim), max_generations + 1, max_frames, save_every,
+                                enabled=dim == 2 if log_positions is None else log_positions)
+    positions_log.record(0, population)
+
+    n_elite = max(1, int(pop_size * elitism_rate))
+
+    for generation in range(max_generations):
+        if budget.exhausted:
+            finish_early(convergence_curve, positions_log, generation, best_fitness, population)
+            break
+        population = generation_step_multi(
+            population, fitness, n_elite, bounds,
+            crossover_rate, mutation_rate, mutation_scale,
+            tournament_size, crossover_type, mutation_type, rngs, backend
+        )
+        fitness = budget.evaluate(objective_func, population)
+
+        current_best_idx = np.argmin(fitness, axis=1)
+        current_best = fitness[replicas, current_best_idx]
+        improved = current_best < best_fitness
+        best_solution[improved] = population[replicas[improved], current_best_idx[improved]]
+        best_fitness = np.where(improved, current_best, best_fitness)
+
+        convergence_curve[:, generation + 1] = best_fitness
+
+        positions_log.record(generation + 1, population)
+
+        yield
+
+    return best_solution, best_fitness, convergence_curve, positions_log.frames(), positions_log.steps()
+
+
+def genetic_algorithm_multi_run(pop_size: int, dim: int, bounds: Tuple[float, float],
+                                max_generations: int, objective_func: Callable,
+                                crossover_rate: float = 0.8,
+                                mutation_rate: float = 0.1,
+                                mutation_scale: float = 0.1,
+                                elitism_rate: float = 0.1,
+                                tournament_size: int = 3,
+                                crossover_type: str = 'arithmetic',
+                                mutation_type: str = 'gaussian',
+                                save_every: int = 1,
+                                rngs: Optional[List[np.random.Generator]] = None,
+                                max_frames: Optional[int] = None,
+                                log_positions: Optional[bool] = None,
+                                budget: Optional[EvaluationBudget] = None,
+                                backend: str = "numpy"):
+    """R replik do końca (bez przerw) - patrz genetic_algorithm_steps."""
+    return run_steps(genetic_algorithm_steps(
+        pop_size, dim, bounds, max_generations, objective_func,
+        crossover_rate, mutation_rate, mutation_scale, elitism_rate, tournament_size,
+        crossover_type, mutation_type, save_every, rngs, max_frames, log_positions, budget, backend
+    ))
+
+
+def genetic_algorithm_vectorized(pop_size: int, dim: int, bounds: Tuple[float, float],
+                                 max_generations: int, objective_func: Callable,
+                                 crossover_rate: float = 0.8,
+                                 mutation_rate: float = 0.1,
+                                 mutation_scale: float = 0.1,
+                                 elitism_rate: float = 0.1,
+                                 tournament_size: int = 3,
+                                 crossover_type: str = 'arithmetic',
+                                 mutation_type: str = 'gaussian',
+                                 save_every: int = 1,
+                                 rng: Optional[np.random.Generator] = None,
+                                 max_frames: Optional[int] = None,
+                                 log_positions: Optional[bool] = None,
+                                 budget: Optional[EvaluationBudget] = None,
+                                 backend: str = "numpy"):
+    """Pojedyncze uruchomienie wersji populacyjnej (multi-run z R = 1)."""
+    rng = np.random.default_rng() if rng is None else rng
+    best_solution, best_fitness, convergence_curve, positions_log, position_steps = genetic_algorithm_multi_run(
+        pop_size, dim, bounds, max_generations, objective_func,
+        crossover_rate, mutation_rate, mutation_scale, elitism_rate, tournament_size,
+        crossover_type, mutation_type, save_every, [rng], max_frames, log_positions, budget, backend
+    )
+    return best_solution[0], best_fitness[0], list(convergence_curve[0]), [p[0] for p in positions_log], list(position_steps)
@@ -1,23 +1,32 @@
 import numpy as np
-import random
 import json
 import pickle
 import os
 import cma
 import asyncio
-
-from algorithms.BatAlgorithm import bat_algorithm
-from algorithms.ArtificialBeeColony import artificial_bee_colony
-from algorithms.GeneticAlgorithm import (
-    genetic_algorithm,
-    arithmetic_crossover,
-    single_point_crossover,
-    gaussian_mutation,
-    uniform_mutation
-)
-
+import math
+
+from algorithms.BatAlgorithm import bat_algorithm_vectorized
+from algorithms.ArtificialBeeColony import artificial_bee_colony_vectorized
+from algorithms.GeneticAlgorithm import genetic_algorithm_vectorized
+
+from algorithms.runners import RUNNERS, STEPPERS, repetition_rng, repetition_rngs, combine_traces, median_trace
+from algorithms.stepping import drive_steps
+from algorithms.parallelExecutor import ParallelExecutor
+from algorithms.distributedExecutor import DistributedExecutor
+from algorithms.resultCache import ResultCache
+from algorithms.memoizedObjective import MemoizedObjective
+from algorithms.countingObjective import CountingObjective
+from algorithms.evaluationBudget import EvaluationBudget
+from algorithms.instrumentation import Stats, profile_call
+from algorithms.jitKernels import resolve_backend
+from algorithms.figureData import convergence_data, animation_data
 from algorithms.plotConvergence import plot_convergence
 from algorithms.animateAlgorithms import animate_algorithm
+from algorithms.atomicWrite import atomic_dump_json, atomic_dump_pickle
+
+# Zmiana formatu checkpointu -> stare checkpointy są pomijane
+CHECKPOINT_VERSION = 3
 
 class MetaheuristicTuner:
 
@@ -43,114 +52,559 @@ class MetaheuristicTuner:
         return new_param_space
 
 
-    def __init__(self, progress_send_fn, pause_check_fn, stop_check_fn):
+    def __init__(self, progress_send_fn, pause_check_fn, stop_check_fn, telemetry_send_fn=None,
+                 execution_mode="inline", max_workers=None, parallel_population=False, seed=0,
+                 batch_repetitions=True, cache_path="cache/evaluations.sqlite", cache_max_entries=100_000,
+                 memoize_bytes=None, racing=False, race_min_runs=5, race_eta=2, step_time_slice=0.01,
+                 figures_mode="data", max_animation_frames=100, record_traces=True,
+                 folder="checkpoints", executor=None, worker_quota=None, instrument=False, backend="numpy"):
         self.progress_send_fn = progress_send_fn
         self.pause_check_fn = pause_check_fn
         self.stop_check_fn = stop_check_fn
-
-        # Folder na wszystkie pliki
-        self.folder = "checkpoints"
+        # telemetry_send_fn(kind, data) - opcjonalny kanał telemetrii (postęp CMA, wyniki uruchomień)
+        self.telemetry_send_fn = telemetry_send_fn
+
+        # "inline"      - uruchomienia na pętli zdarzeń (jak dotąd)
+        # "process"     - uruchomienia w ProcessPoolExecutor (max_workers=None -> wszystkie rdzenie)
+        # "distributed" - uruchomienia w procesach roboczych po TCP (worker.py)
+        if execution_mode not in ("inline", "process", "distributed"):
+            raise ValueError(f"Nieznany tryb wykonania: {execution_mode}")
+        self.execution_mode = execution_mode
+
+        # Opcjonalny cache wartości funkcji celu (LRU, budżet w bajtach);
+        # None - każdy punkt liczony od nowa
+        self.memoize_bytes = memoize_bytes
+        self._memoized = {}
+
+        # executor - wspólna pula procesów kilku tunerów (zarządza nią właściciel);
+        # worker_quota - najwyżej tyle zadań tego tunera naraz w puli
+        self._owns_executor = executor is None
+        if executor is None and execution_mode == "process":
+            executor = ParallelExecutor(max_workers, memoize_bytes=memoize_bytes)
+        elif executor is None and execution_mode == "distributed":
+            executor = DistributedExecutor()
+        self.executor = executor if execution_mode != "inline" else None
+        self.worker_quota = worker_quota
+
+        # Cała populacja es.ask() oceniana naraz (tylko w trybach "process" i "distributed")
+        self.parallel_population = parallel_population
+
+        # Ziarno bazowe; powtórzenie r dostaje generator z SeedSequence(seed, spawn_key=(r,))
+        self.seed = seed
+
+        # True  - powtórzenia liczone razem jako symulacja (R, pop, dim); w puli
+        #         procesów podzielone na tyle grup, ile zmieści się w puli
+        # False - każde powtórzenie osobno (w trybie "process" osobne zadanie)
+        # Wyniki są identyczne w obu przypadkach.
+        self.batch_repetitions = batch_repetitions
+
+        # Wyścig (successive halving): populacja es.ask() liczona rundami
+        # race_min_runs, race_min_runs*eta, ..., R powtórzeń; po każdej
+        # rundzie zostaje 1/eta najlepszych kandydatów
+        self.racing = racing
+        self.race_min_runs = race_min_runs
+        self.race_eta = race_eta
+        # Przerwany wyścig (per algorytm): ukończone rundy i zadania bieżącej
+        # rundy - trafia do checkpointu, po wznowieniu wyścig idzie dalej
+        self._races = {}
+
+        # Folder na wszystkie pliki (osobny dla każdego zlecenia)
+        self.folder = folder
         os.makedirs(self.folder, exist_ok=True)
 
         # Plik globalnego stanu tunera
         self.tuner_state_file = os.path.join(self.folder, "tuner_state.json")
 
+        # Trwały cache sigm (poza folderem checkpointów, który jest czyszczony);
+        # cache_path=None wyłącza cache
+        self.cache = ResultCache(cache_path, cache_max_entries) if cache_path else None
+
         # ============================
         # WRAPPERY ALGORYTMÓW
         # ============================
-        self.runners = {
-            "Bat": self.run_BAT,
-            "Genetic": self.run_GA,
-            "ABC": self.run_ABC
-        }
-        
-        self.generic_static_params = {
-            "crossover_type": "arithmetic",
-            "mutation_type": "uniform"
-        }
-
-    # ============================================================
-    # WRAPPERY ALGORYTMÓW
-    # ============================================================
-
-    def run_BAT(self, params, func, bounds, dim):
-        _, best_value, _, _ = bat_algorithm(
-            fn=func,
-            n_bats=params["n_bats"],
-            bounds=bounds,
-            max_iter=params["max_iter"],
-            dims=dim,
-            alpha=params["alpha"],
-            gamma=params["gamma"],
-            f_bounds=(params["f_bounds_min"], params["f_bounds_max"])
-        )
-        return best_value
-
-    def run_ABC(self, params, func, bounds, dim):
-        _, best_value, _, _ = artificial_bee_colony(
-            n_bees=params["n_bees"],
-            dim=dim,
-            bounds=bounds,
-            max_iter=params["max_iter"],
-            objective_func=func
-        )
-        return best_value
-
-    def run_GA(self, params, func, bounds, dim):
-        # Parametry kategoryczne są już zmapowane w vector_to_params()
-        crossover_type = self.generic_static_params["crossover_type"]
-        mutation_type  = self.generic_static_params["mutation_type"]
-
-        crossover = (
-            arithmetic_crossover if crossover_type == "arithmetic"
-            else single_point_crossover
-        )
-
-        mutation = (
-            uniform_mutation if mutation_type == "uniform"
-            else gaussian_mutation
-        )
-
-        _, best_value, _, _ = genetic_algorithm(
-            dim=dim,
-            pop_size=params["pop_size"],
-            objective_func=func,
-            bounds=bounds,
-            max_generations=params["max_generations"],
-            crossover_rate=params["crossover_rate"],
-            mutation_rate=params["mutation_rate"],
-            mutation_scale=params["mutation_scale"],
-            elitism_rate=params["elitism_rate"],
-            tournament_size=params["tournament_size"],
-            crossover_type=crossover,
-            mutation_type=mutation
-        )
-
-        return best_value
+        self.runners = RUNNERS
+
+        # W trybie "inline" silniki idą kawałkami po step_time_slice sekund;
+        # między kawałkami pętla zdarzeń dostaje sterowanie i sprawdzamy pauzę/stop
+        self.steppers = STEPPERS
+        self.step_time_slice = step_time_slice
+
+        # "data"  - surowe krzywe i klatki (float32) rysowane przez frontend
+        # "image" - PNG/GIF renderowane matplotlibem na serwerze
+        if figures_mode not in ("data", "image"):
+            raise ValueError(f"Nieznany tryb wykresów: {figures_mode}")
+        self.figures_mode = figures_mode
+        self.max_animation_frames = max_animation_frames
+
+        # Ślad (krzywa zbieżności, pozycje) uruchomienia-mediany każdego kandydata;
+        # zostaje tylko ślad najlepszego kandydata algorytmu - z niego powstają
+        # wykresy, bez dodatkowych uruchomień po strojeniu
+        self.record_traces = record_traces
+        self._traces = {}
+
+        # Stopery i liczniki gorących ścieżek (evaluate_params, silniki, CMA,
+        # checkpointy, wykresy); włączane w locie przez stats.enabled
+        self.stats = Stats(instrument)
+        # Ostatnio oceniany kandydat - do profilu na żądanie (profile_candidate)
+        self.last_candidate = None
+
+        # Budżet ewaluacji funkcji celu na uruchomienie (None - bez limitu);
+        # ustawia go tune_algorithms, trafia do parametrów każdego kandydata
+        self.max_evals = None
+        # Koszt najlepszych parametrów każdego algorytmu (patrz cost_summary)
+        self.costs = {}
+
+        # "numpy" albo "numba" (kernele z jitKernels; bez numby - "numpy");
+        # inny niż "numpy" trafia do parametrów kandydatów, więc i do procesów roboczych
+        self.backend = resolve_backend(backend)
 
     # ============================================================
     # FUNKCJA CELU
     # ============================================================
 
-    async def evaluate_params(self, params, runner, selected_funcs, dim, R=20):
+    async def evaluate_params(self, params, algorithm, selected_funcs, dim, R=20):
+        self.last_candidate = (algorithm, dict(params), selected_funcs, dim, R)
+        with self.stats.timer("evaluate_params"):
+            if self.executor is not None:
+                return await self._evaluate_params_process(params, algorithm, selected_funcs, dim, R)
+            return await self._evaluate_params_inline(params, algorithm, selected_funcs, dim, R)
+
+    async def _evaluate_params_inline(self, params, algorithm, selected_funcs, dim, R):
         sigmas = []
+        traces = []
 
         for fmeta in selected_funcs:
-            func = fmeta["code"]
-            bounds = fmeta["bounds"]
+            key = self._cache_key(algorithm, params, fmeta, dim, R)
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                self.stats.count("cache_hits")
+                sigmas.append(cached)
+                continue
+            self.stats.count("cache_misses")
+
+            outputs = []
+            for repetitions in self._repetition_groups(range(R)):
+                output = await self._run_inline(algorithm, params, fmeta, dim, repetitions)
+                if output is None:
+                    return None
+                outputs.append(output)
+            results, trace = self._collect(outputs)
+            traces.append(trace)
+            await self._publish_runs(algorithm, params, fmeta, results)
+
+            sigma = float(np.std(results))
+            if key:
+                self.cache.put(key, sigma)
+            sigmas.append(sigma)
+
+        fitness = np.mean(sigmas)
+        self._offer_trace(algorithm, params, fitness, traces, len(selected_funcs))
+        return fitness
+
+    def _collect(self, outputs):
+        """Wyniki grup powtórzeń -> (najlepsze wartości, ślad uruchomienia-mediany albo None)."""
+        if not self.record_traces:
+            return np.concatenate(outputs), None
+        trace = combine_traces(outputs)
+        return trace[0], median_trace(*trace)
+
+    def _offer_trace(self, algorithm, params, fitness, traces, n_funcs):
+        """Zapamiętuje ślady kandydata, jeśli jest najlepszym w pełni policzonym dotąd."""
+        if not self.record_traces or len(traces) != n_funcs:
+            return  # część funkcji z cache - brak śladów
+        current = self._traces.get(algorithm)
+        if current is None or fitness < current["fitness"]:
+            self._traces[algorithm] = {"params": dict(params), "fitness": float(fitness), "functions": traces}
+
+    async def _telemetry(self, kind, **data):
+        if self.telemetry_send_fn is not None:
+            await self.telemetry_send_fn(kind, data)
+
+    async def _publish_runs(self, algorithm, params, fmeta, best_values):
+        await self._telemetry("runs", algorithm=algorithm, function=fmeta.get("name"), params=params,
+                              best_values=[float(v) for v in best_values])
+
+    async def _should_abort(self):
+        return await self.pause_check_fn() or await self.stop_check_fn()
+
+    async def _run_inline(self, algorithm, params, fmeta, dim, repetitions):
+        """Grupa powtórzeń na pętli zdarzeń; None po pauzie/stopie (także w trakcie uruchomienia)."""
+        if await self._should_abort():
+            return None
+        func = self._objective(fmeta)
+        if self.stats.enabled:
+            func = CountingObjective(func)
+        steps = self.steppers[algorithm](params, func, fmeta["bounds"], dim,
+                                         repetition_rngs(self.seed, repetitions), self.record_traces,
+                                         self.max_animation_frames)
+        with self.stats.timer(f"runner.{algorithm}"):
+            output = await drive_steps(steps, self._should_abort, self.step_time_slice)
+        if isinstance(func, CountingObjective):
+            # ewaluacje zlecone przez silnik (trafienia memoizacji też się liczą)
+            self.stats.count(f"objective_evals.{algorithm}", func.calls)
+            self.stats.add_time(f"objective.{algorithm}", func.seconds)
+        return output
+
+    def _task_outputs(self, algorithm, results):
+        """
+        Wyniki zadań z puli/workerów. Przy włączonych statystykach zadania
+        zwracają słowniki z licznikami (evaluate_task, instrument=True) -
+        doliczamy je do self.stats pod tymi samymi nazwami co w _run_inline.
+        """
+        outputs = []
+        for result in results:
+            if isinstance(result, dict):
+                self.stats.count(f"objective_evals.{algorithm}", result["evaluations"])
+                self.stats.add_time(f"objective.{algorithm}", result["objective_s"])
+                self.stats.add_time(f"runner.{algorithm}", result["run_s"])
+                result = result["output"]
+            outputs.append(result)
+        return outputs
+
+    def _objective(self, fmeta):
+        """Funkcja celu dla silników - opakowana w MemoizedObjective, jeśli włączono memoizację."""
+        if not self.memoize_bytes:
+            return fmeta["code"]
+        # po kodzie źródłowym, żeby cache przetrwał ponowną kompilację funkcji
+        key = fmeta.get("source", fmeta["code"])
+        func = self._memoized.get(key)
+        if func is None:
+            func = MemoizedObjective(fmeta["code"], self.memoize_bytes)
+            self._memoized[key] = func
+        return func
+
+    def memoization_stats(self):
+        """Liczniki trafień dla funkcji liczonych w tym procesie (tryb "inline" i wykresy)."""
+        return {func.__name__: func.stats() for func in self._memoized.values()}
+
+    def profile_candidate(self, profiler="cprofile"):
+        """
+        Jedna pełna ocena ostatniego kandydata (bez cache, w bieżącym wątku)
+        pod profilerem. Zwraca raport profile_call z polami algorithm,
+        params i fitness albo None, jeśli nic jeszcze nie oceniano.
+        Bez memoizacji - profil pokazuje koszt samej funkcji celu.
+        """
+        if self.last_candidate is None:
+            return None
+        algorithm, params, selected_funcs, dim, R = self.last_candidate
+
+        def evaluate():
+            sigmas = []
+            for fmeta in selected_funcs:
+                best_values = self.runners[algorithm](params, fmeta["code"], fmeta["bounds"], dim,
+                                                      repetition_rngs(self.seed, range(R)))
+                sigmas.append(np.std(best_values))
+            return float(np.mean(sigmas))
+
+        fitness, report = profile_call(evaluate, profiler)
+        return dict(report, algorithm=algorithm, params=params, fitness=fitness)
+
+    def _cache_key(self, algorithm, params, fmeta, dim, R):
+        # Bez kodu źródłowego nie da się rozpoznać funkcji - wtedy bez cache
+        if self.cache is None or "source" not in fmeta:
+            return None
+        return ResultCache.make_key(algorithm, params, fmeta["source"], fmeta["bounds"], dim, R, self.seed)
+
+    def _repetition_groups(self, repetitions, n_jobs=1):
+        """
+        Podział powtórzeń na zadania. Przy batch_repetitions z pulą procesów
+        powtórzenia n_jobs zadań dzielimy na tyle grup, żeby zająć wszystkie
+        miejsca w puli (ciągłe kawałki - wyniki bez zmian, bo powtórzenie r
+        ma zawsze generator (seed, r)).
+        """
+        repetitions = list(repetitions)
+        if not self.batch_repetitions:
+            return [(r,) for r in repetitions]
+        if self.executor is None:
+            return [tuple(repetitions)]
+        slots = self.executor.capacity
+        if self.worker_quota:
+            slots = min(slots, self.worker_quota)
+        n_groups = min(len(repetitions), max(1, -(-slots // max(n_jobs, 1))))
+        return [tuple(int(r) for r in group) for group in np.array_split(repetitions, n_groups)]
+
+    async def _evaluate_params_process(self, params, algorithm, selected_funcs, dim, R):
+        return (await self.evaluate_population([params], algorithm, selected_funcs, dim, R))[0]
+
+    async def evaluate_population(self, params_list, algorithm, selected_funcs, dim, R=20):
+        """
+        Ocenia wszystkich kandydatów naraz w puli procesów.
+        Zwraca listę fitness w kolejności params_list; po pauzie/stopie
+        kandydaci nie w pełni policzeni mają None (policzone pary
+        kandydat-funkcja i tak trafiają do cache).
+        """
+        sigmas = np.full((len(params_list), len(selected_funcs)), np.nan)
+        missing = []
+        for c, params in enumerate(params_list):
+            for f, fmeta in enumerate(selected_funcs):
+                key = self._cache_key(algorithm, params, fmeta, dim, R)
+                cached = self.cache.get(key) if key else None
+                if cached is not None:
+                    self.stats.count("cache_hits")
+                    sigmas[c, f] = cached
+                else:
+                    self.stats.count("cache_misses")
+                    missing.append((c, f, key))
+
+        # Do procesów roboczych idzie kod źródłowy funkcji, nie obiekt funkcji;
+        # zadanie to grupa powtórzeń, każde z własnym generatorem
+        groups = self._repetition_groups(range(R), len(missing))
+        tasks = [
+            (algorithm, params_list[c], selected_funcs[f]["source"], selected_funcs[f]["bounds"],
+             dim, self.seed, repetitions, self.record_traces, self.max_animation_frames, self.stats.enabled)
+            for c, f, _ in missing
+            for repetitions in groups
+        ]
+        traces = [[] for _ in params_list]
+
+        last_progress = [-1]
+
+        async def send_progress(done, total):
+            progress = int(done / total * 100)
+            if progress != last_progress[0]:
+                last_progress[0] = progress
+                await self.progress_send_fn(progress, type="run_progress")
+
+        if tasks:
+            self.stats.count(f"executor_tasks.{algorithm}", len(tasks))
+            with self.stats.timer(f"executor.{algorithm}"):
+                results = await self.executor.run(tasks, self._should_abort, send_progress, partial=True,
+                                                  max_in_flight=self.worker_quota)
+            results = self._task_outputs(algorithm, results)
+
+            n_groups = len(groups)
+            for k, (c, f, key) in enumerate(missing):
+                outputs = results[k * n_groups:(k + 1) * n_groups]
+                if any(o is None for o in outputs):
+                    continue
+                runs, trace = self._collect(outputs)
+                traces[c].append(trace)
+                await self._publish_runs(algorithm, params_list[c], selected_funcs[f], runs)
+                sigmas[c, f] = np.std(runs)
+                if key:
+                    self.cache.put(key, sigmas[c, f])
+
+        fitness = [None if np.isnan(row).any() else float(np.mean(row)) for row in sigmas]
+        for params, fit, trace in zip(params_list, fitness, traces):
+            if fit is not None:
+                self._offer_trace(algorithm, params, fit, trace, len(selected_funcs))
+        return fitness
 
-            results = []
-            for r in range(R):
-                if await self.pause_check_fn() or await self.stop_check_fn():
+    # ============================================================
+    # WYŚCIG KANDYDATÓW (SUCCESSIVE HALVING)
+    # ============================================================
+
+    def race_schedule(self, R):
+        """Skumulowane liczby powtórzeń kolejnych rund, np. 5, 10, 20."""
+        schedule = []
+        runs = self.race_min_runs
+        while runs < R:
+            schedule.append(runs)
+            runs *= self.race_eta
+        schedule.append(R)
+        return schedule
+
+    async def race_population(self, params_list, algorithm, selected_funcs, dim, R=20):
+        """
+        Ocenia populację rundami rosnącej liczby powtórzeń. Po każdej rundzie
+        odpada gorsza część kandydatów (wg bieżącej średniej sigm); ocalali
+        dostają pełne R powtórzeń i dokładnie tę samą wartość co
+        evaluate_params (powtórzenie r ma zawsze generator (seed, r)).
+        Odrzuceni dostają ostrożną ocenę: nie lepszą niż najgorszy ocalały.
+        Zwraca listę fitness albo None po pauzie/stopie - stan wyścigu
+        (ukończone rundy i skończone zadania bieżącej) zostaje wtedy
+        w self._races i trafia do checkpointu.
+        """
+        n_funcs = len(selected_funcs)
+        race = self._races.get(algorithm)
+        if race is None or race["params"] != params_list:
+            race = self._races[algorithm] = self._new_race(params_list, algorithm, selected_funcs, dim, R)
+        fitness, runs, outputs, estimate = race["fitness"], race["runs"], race["outputs"], race["estimate"]
+
+        for target in self.race_schedule(R):
+            if target <= race["done"]:
+                continue
+            if not race["alive"]:
+                break
+
+            pairs = [(c, f) for c in race["alive"] for f in range(n_funcs)]
+            jobs = [(params_list[c], f) for c, f in pairs]
+            if race["round"] is None:
+                race["round"] = {}
+            results = await self._simulate(jobs, algorithm, selected_funcs, dim, range(race["done"], target),
+                                           race["round"])
+            if results is None:
+                return None
+
+            for (c, f), output in zip(pairs, results):
+                outputs[c][f].append(output)
+                v = output[0] if self.record_traces else output
+                await self._publish_runs(algorithm, params_list[c], selected_funcs[f], v)
+                runs[c][f].extend(v)
+            race["done"] = target
+            race["round"] = None
+
+            for c in race["alive"]:
+                estimate[c] = float(np.mean([np.std(r) for r in runs[c]]))
+
+            if target < R:
+                n_keep = max(1, math.ceil(len(race["alive"]) / self.race_eta))
+                race["alive"] = sorted(race["alive"], key=estimate.get)[:n_keep]
+
+        del self._races[algorithm]
+        alive = race["alive"]
+
+        # ocalali: pełna ocena (trafia też do cache)
+        for c in alive:
+            fitness[c] = estimate[c]
+            for fmeta, r in zip(selected_funcs, runs[c]):
+                key = self._cache_key(algorithm, params_list[c], fmeta, dim, R)
+                if key:
+                    self.cache.put(key, np.std(r))
+            traces = [self._collect(o)[1] for o in outputs[c]]
+            self._offer_trace(algorithm, params_list[c], fitness[c], traces, n_funcs)
+
+        # odrzuceni: nie mogą wypaść lepiej od ocalałych
+        worst_survivor = max((fitness[c] for c in alive), default=-np.inf)
+        for c in runs:
+            if c not in alive:
+                fitness[c] = max(estimate[c], worst_survivor)
+
+        return fitness
+
+    def _new_race(self, params_list, algorithm, selected_funcs, dim, R):
+        """Stan wyścigu od zera: kandydaci z cache mają fitness od razu, reszta startuje."""
+        race = {"params": params_list, "fitness": [None] * len(params_list), "runs": {}, "outputs": {},
+                "alive": [], "estimate": {}, "done": 0, "round": None}
+        for c, params in enumerate(params_list):
+            keys = [self._cache_key(algorithm, params, fmeta, dim, R) for fmeta in selected_funcs]
+            cached = [self.cache.get(k) if k else None for k in keys]
+            if all(v is not None for v in cached):
+                race["fitness"][c] = float(np.mean(cached))
+            else:
+                race["alive"].append(c)
+                race["runs"][c] = [[] for _ in selected_funcs]
+                race["outputs"][c] = [[] for _ in selected_funcs]
+        return race
+
+    async def _simulate(self, jobs, algorithm, selected_funcs, dim, repetitions, finished=None):
+        """
+        jobs: lista (params, indeks funkcji). Zwraca listę wyników zadań
+        (tablica najlepszych wartości, przy record_traces krotka
+        (best_values, convergence, positions)) albo None po pauzie/stopie.
+        finished: słownik na postęp wywołania ("groups", "results" - None
+        w miejscu niedokończonych zadań), uzupełniany w miejscu także po
+        pauzie; ponowne wywołanie z nim liczy tylko brakujące zadania.
+        """
+        finished = {} if finished is None else finished
+        # podział na grupy zapamiętany - po wznowieniu pula może mieć inny rozmiar
+        groups = finished.setdefault("groups", self._repetition_groups(repetitions, len(jobs)))
+        tasks = [(params, f, group) for params, f in jobs for group in groups]
+        results = finished.setdefault("results", [None] * len(tasks))
+        todo = [k for k, r in enumerate(results) if r is None]
+
+        if self.executor is not None:
+            executor_tasks = [
+                (algorithm, params, selected_funcs[f]["source"], selected_funcs[f]["bounds"],
+                 dim, self.seed, group, self.record_traces, self.max_animation_frames, self.stats.enabled)
+                for params, f, group in (tasks[k] for k in todo)
+            ]
+
+            self.stats.count(f"executor_tasks.{algorithm}", len(executor_tasks))
+            with self.stats.timer(f"executor.{algorithm}"):
+                outputs = await self.executor.run(executor_tasks, self._should_abort, partial=True,
+                                                  max_in_flight=self.worker_quota)
+            for k, output in zip(todo, self._task_outputs(algorithm, outputs)):
+                results[k] = output
+            if any(r is None for r in results):
+                return None
+        else:
+            for k in todo:
+                params, f, group = tasks[k]
+                output = await self._run_inline(algorithm, params, selected_funcs[f], dim, group)
+                if output is None:
                     return None
-                await asyncio.sleep(0)
-                np.random.seed(r)
-                random.seed(r)
-                results.append(runner(params, func, bounds, dim))
+                results[k] = output
+
+        n_groups = len(groups)
+        job_results = [results[k * n_groups:(k + 1) * n_groups] for k in range(len(jobs))]
+        if self.record_traces:
+            return [combine_traces(r) for r in job_results]
+        return [np.concatenate(r) for r in job_results]
+
+    def shutdown(self):
+        if self.executor is not None and self._owns_executor:
+            self.executor.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def _evaluate_generation(self, candidates, fitness, algorithm, selected_funcs, dim, R):
+        """
+        Uzupełnia w miejscu brakujące (None) wartości fitness pokolenia.
+        Zwraca False po pauzie/stopie - policzone do tej pory wartości
+        zostają w liście i trafiają do checkpointu.
+        """
+        todo = [c for c, fit in enumerate(fitness) if fit is None]
+        todo_params = [candidates[c] for c in todo]
+        if todo:
+            self.last_candidate = (algorithm, dict(todo_params[0]), selected_funcs, dim, R)
+
+        if self.racing:
+            # wyścig porównuje kandydatów między sobą - fitness dopiero po całym wyścigu,
+            # przerwany wyścig zostaje w self._races (i w checkpoincie)
+            values = await self.race_population(todo_params, algorithm, selected_funcs, dim, R)
+            if values is None:
+                return False
+        elif self.parallel_population and self.executor is not None:
+            values = await self.evaluate_population(todo_params, algorithm, selected_funcs, dim, R)
+        else:
+            for c in todo:
+                fitness[c] = await self.evaluate_params(candidates[c], algorithm, selected_funcs, dim, R)
+                if fitness[c] is None:
+                    return False
+            return True
 
-            sigmas.append(np.std(results))
+        for c, value in zip(todo, values):
+            fitness[c] = value
+        return all(fit is not None for fit in fitness)
 
-        return np.mean(sigmas)
+    # ============================================================
+    # CHECKPOINTY
+    # Jeden plik na algorytm: stan CMA-ES, numer iteracji, a jeśli
+    # pokolenie przerwano w połowie - rozwiązania z es.ask() i ich
+    # policzone dotąd fitness. Zapis atomowy (plik tymczasowy + rename).
+    # Przy wyścigu pokolenie nie ma fitness, dopóki wyścig się nie skończy,
+    # więc zapisywany jest też stan wyścigu: ukończone rundy (powtórzenia
+    # i oceny kandydatów, ocalali) i skończone zadania przerwanej rundy.
+    # Pauza kosztuje więc co najwyżej zadania, które były w toku.
+    # ============================================================
+
+    def _checkpoint_file(self, alg):
+        return os.path.join(self.folder, f"checkpoint_{alg}.pkl")
+
+    def _save_checkpoint(self, alg, iteration, es, solutions=None, fitness=None):
+        with self.stats.timer("checkpoint_write"):
+            atomic_dump_pickle({
+                "version": CHECKPOINT_VERSION,
+                "iteration": iteration,
+                "es": es,
+                "solutions": solutions,
+                "fitness": fitness,
+                "trace": self._traces.get(alg),
+                "race": self._races.get(alg),
+            }, self._checkpoint_file(alg))
+
+    def _load_checkpoint(self, alg):
+        path = self._checkpoint_file(alg)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            checkpoint = pickle.load(f)
+        # stary format (sam obiekt CMA-ES) albo inna wersja - start od początku
+        if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+            print(f"Pomijam nieaktualny checkpoint {path}")
+            return None
+        return checkpoint
 
     # ============================================================
     # KONWERSJA WEKTORA CMA → PARAMETRY
@@ -170,16 +624,22 @@ class MetaheuristicTuner:
             params[name] = val
             i += 1
 
-        # parametry kategoryczne GA
-        if algorithm == "GA":
+        # parametry kategoryczne GA (każdy kandydat niesie własne)
+        if algorithm == "Genetic":
             crossover_raw = int(round(x[i]))
             mutation_raw  = int(round(x[i+1]))
 
             crossover_raw = max(0, min(1, crossover_raw))
             mutation_raw  = max(0, min(1, mutation_raw))
 
-            self.generic_static_params["crossover_type"] = "arithmetic" if crossover_raw == 0 else "single_point"
-            self.generic_static_params["mutation_type"]  = "uniform"    if mutation_raw  == 0 else "gaussian"
+            params["crossover_type"] = "arithmetic" if crossover_raw == 0 else "single_point"
+            params["mutation_type"]  = "uniform"    if mutation_raw  == 0 else "gaussian"
+
+        # budżet ewaluacji - wspólny dla wszystkich kandydatów (jest też w kluczu cache)
+        if self.max_evals:
+            params["max_evals"] = self.max_evals
+        if self.backend != "numpy":
+            params["backend"] = self.backend
 
         return params
 
@@ -191,29 +651,33 @@ class MetaheuristicTuner:
                               iterations=30, R=20):
 
         param_space = self.param_spaces[algorithm]
-        runner = self.runners[algorithm]
-
-        checkpoint_json = os.path.join(self.folder, f"checkpoint_{algorithm}.json")
-        checkpoint_pkl  = os.path.join(self.folder, f"checkpoint_{algorithm}.pkl")
 
         es = None
         start_iter = 0
+        pending = None
 
         # ====== WZNOWIENIE ======
-        if os.path.exists(checkpoint_json) and os.path.exists(checkpoint_pkl):
+        checkpoint = self._load_checkpoint(algorithm)
+        if checkpoint is not None:
             print(f"Wznawiam tuner {algorithm} z checkpointu...")
 
-            with open(checkpoint_json, "r") as f:
-                start_iter = json.load(f)["current_iteration"]
-
-            with open(checkpoint_pkl, "rb") as f:
-                es = pickle.load(f)
+            es = checkpoint["es"]
+            start_iter = checkpoint["iteration"]
+            # pokolenie przerwane w połowie: te same rozwiązania, policzone fitness zostają
+            if checkpoint["solutions"] is not None:
+                pending = (checkpoint["solutions"], checkpoint["fitness"])
+            if checkpoint["trace"] is not None:
+                self._traces[algorithm] = checkpoint["trace"]
+            if checkpoint["race"] is not None:
+                self._races[algorithm] = checkpoint["race"]
 
         else:
             print(f"Startuję tuner {algorithm} od początku...")
+            self._traces.pop(algorithm, None)
+            self._races.pop(algorithm, None)
 
             base_dim = len(param_space)
-            extra_dims = 2 if algorithm == "GA" else 0
+            extra_dims = 2 if algorithm == "Genetic" else 0
 
             x0 = [(pmin + pmax) / 2 for (pmin, pmax, _) in param_space.values()]
             for _ in range(extra_dims):
@@ -234,33 +698,40 @@ class MetaheuristicTuner:
                 return "stop"
           
             await self.progress_send_fn(int((it + 1) / iterations * 100), type="param_progress")
-            solutions = es.ask()
-            fitness = []
-
-            for x in solutions:
-                params = self.vector_to_params(x, param_space, algorithm)
-                fit_val = await self.evaluate_params(params, runner, selected_funcs, dim, R)
-                if fit_val is None:
-                    if await self.pause_check_fn():
-                        print(f"Zatrzymano tuner {algorithm} na iteracji {it}.")
-                        return "pause"
-                    if await self.stop_check_fn():
-                        print(f"Zatrzymano tuner {algorithm} na iteracji {it}")
-                        return "stop"
-                else:
-                    fitness.append(fit_val)
+            if pending is not None:
+                solutions, fitness = pending
+                pending = None
+            else:
+                with self.stats.timer("cma_ask"):
+                    solutions = es.ask()
+                fitness = [None] * len(solutions)
+            candidates = [self.vector_to_params(x, param_space, algorithm) for x in solutions]
+
+            if not await self._evaluate_generation(candidates, fitness, algorithm, selected_funcs, dim, R):
+                # zapis częściowego pokolenia - po wznowieniu liczymy tylko brakujących kandydatów
+                self._save_checkpoint(algorithm, it, es, solutions, fitness)
+                if await self.pause_check_fn():
+                    print(f"Zatrzymano tuner {algorithm} na iteracji {it}.")
+                    return "pause"
+                print(f"Zatrzymano tuner {algorithm} na iteracji {it}")
+                return "stop"
 
-            es.tell(solutions, fitness)
+            with self.stats.timer("cma_tell"):
+                es.tell(solutions, fitness)
             es.disp()
 
-            # zapis checkpointu
-            with open(checkpoint_pkl, "wb") as f:
-                pickle.dump(es, f)
+            await self._telemetry(
+                "generation",
+                algorithm=algorithm,
+                iteration=it + 1,
+                iterations=iterations,
+                generation_best=float(np.min(fitness)),
+                best_sigma=float(es.result.fbest),
+                best_params=self.vector_to_params(es.result.xbest, param_space, algorithm),
+            )
 
-            with open(checkpoint_json, "w") as f:
-                json.dump({
-                    "current_iteration": it + 1
-                }, f)
+            # zapis checkpointu
+            self._save_checkpoint(algorithm, it + 1, es)
 
         best_vector = es.result.xbest
         return self.vector_to_params(best_vector, param_space, algorithm)
@@ -272,16 +743,24 @@ class MetaheuristicTuner:
     def generate_figures(self, best, alg, dim, selected_funcs):
         print(dim)
         figure = {}
-        for fn in selected_funcs:
+        trace = self._load_trace(alg, best)
+        for k, fn in enumerate(selected_funcs):
             fn_name = fn["name"]
             figure = {}
-            func = fn["code"]
+            func = self._objective(fn)
             bounds = fn["bounds"]
             print("Generating figures for", alg, "on", fn_name)
-            if alg == "ABC":
-                _, _, convergence_curve, positions_log = artificial_bee_colony(best['n_bees'], dim, bounds, best['max_iter'], func, limit=None)
-            if alg == "Bat":
-                _, _, convergence_curve, positions_log = bat_algorithm(
+            # Ślad uruchomienia-mediany zapisany podczas strojenia - bez ponownego uruchamiania
+            if trace is not None:
+                convergence_curve = trace["functions"][k]["convergence"]
+                positions_log = trace["functions"][k]["positions_log"]
+                # ślady sprzed zapisu numerów iteracji - numer klatki
+                position_steps = trace["functions"][k].get("position_steps")
+            # Brak śladu (np. wynik z cache) - jedno uruchomienie z generatorem powtórzenia 0
+            elif alg == "ABC":
+                _, _, convergence_curve, positions_log, position_steps = artificial_bee_colony_vectorized(best['n_bees'], dim, bounds, best['max_iter'], func, limit=None, rng=repetition_rng(self.seed, 0), budget=EvaluationBudget(1, best.get('max_evals')), backend=best.get('backend', 'numpy'))
+            elif alg == "Bat":
+                _, _, convergence_curve, positions_log, position_steps = bat_algorithm_vectorized(
                     fn=func,
                     n_bats=best['n_bats'],
                     bounds=bounds,
@@ -289,19 +768,67 @@ class MetaheuristicTuner:
                     gamma=best['gamma'],
                     f_bounds=(best['f_bounds_min'], best['f_bounds_max']),
                     max_iter=best['max_iter'],
-                    dims=dim)
-            if alg == "Genetic":
-                crossover = (arithmetic_crossover if self.generic_static_params['crossover_type'] == 0 else single_point_crossover)
-                mutation = (gaussian_mutation if self.generic_static_params['mutation_type'] == 0 else uniform_mutation)
-                _, _, convergence_curve, positions_log = genetic_algorithm(best['pop_size'], dim, bounds, best['max_generations'], func, best['crossover_rate'], best['mutation_rate'], best['mutation_scale'], best['elitism_rate'], best['tournament_size'], crossover, mutation)
- 
+                    dims=dim,
+                    rng=repetition_rng(self.seed, 0),
+                    budget=EvaluationBudget(1, best.get('max_evals')),
+                    backend=best.get('backend', 'numpy'))
+            elif alg == "Genetic":
+                _, _, convergence_curve, positions_log, position_steps = genetic_algorithm_vectorized(best['pop_size'], dim, bounds, best['max_generations'], func, best['crossover_rate'], best['mutation_rate'], best['mutation_scale'], best['elitism_rate'], best['tournament_size'], best['crossover_type'], best['mutation_type'], rng=repetition_rng(self.seed, 0), budget=EvaluationBudget(1, best.get('max_evals')), backend=best.get('backend', 'numpy'))
+
+            if self.figures_mode == "data":
+                figure['convergence'] = convergence_data(convergence_curve)
+                if dim == 2:
+                    figure['animation_data'] = animation_data(positions_log, [bounds, bounds], func,
+                                                              max_frames=self.max_animation_frames,
+                                                              func_key=fn.get("source"), steps=position_steps)
+                continue
+
             convergence_plot_base64 = plot_convergence(convergence_curve, alg, fn_name)
             figure['convergence_plot'] = convergence_plot_base64
             if dim == 2:
-                animation_base64 = animate_algorithm(positions_log, [bounds, bounds], func)
+                animation_base64 = animate_algorithm(positions_log, [bounds, bounds], func,
+                                                     max_frames=self.max_animation_frames,
+                                                     func_key=fn.get("source"), steps=position_steps)
                 figure['animation'] = animation_base64
         return figure
 
+    def cost_summary(self, best, alg):
+        """
+        Koszt najlepszych parametrów: budżet, średnia liczba ewaluacji funkcji
+        celu na uruchomienie (osobno dla każdej funkcji, ze śladu) i fitness
+        ważony kosztem: fitness * tysiące ewaluacji (mniej = lepiej na obu osiach).
+        """
+        trace = self._load_trace(alg, best)
+        if trace is None or any("mean_evaluations" not in fn for fn in trace["functions"]):
+            return {"max_evals": best.get("max_evals"), "fitness": None, "evaluations": None}
+        evaluations = [fn["mean_evaluations"] for fn in trace["functions"]]
+        mean_evaluations = float(np.mean(evaluations))
+        return {
+            "max_evals": best.get("max_evals"),
+            "fitness": trace["fitness"],
+            "evaluations": evaluations,
+            "cost_weighted_fitness": trace["fitness"] * mean_evaluations / 1000,
+        }
+
+    def _trace_file(self, alg):
+        return os.path.join(self.folder, f"trace_{alg}.pkl")
+
+    def _save_trace(self, alg):
+        # ślad przeżywa pauzę i restart serwera razem z results_{alg}.json
+        if alg in self._traces:
+            with self.stats.timer("checkpoint_write"):
+                atomic_dump_pickle(self._traces[alg], self._trace_file(alg))
+
+    def _load_trace(self, alg, best):
+        """Ślad najlepszego kandydata, o ile dotyczy dokładnie parametrów `best`."""
+        trace = self._traces.get(alg)
+        if trace is None and os.path.exists(self._trace_file(alg)):
+            with open(self._trace_file(alg), "rb") as f:
+                trace = pickle.load(f)
+        if trace is None or trace["params"] != best:
+            return None
+        return trace
+
     # ============================================================
     # TUNER WIELU ALGORYTMÓW
     # ============================================================
@@ -312,9 +839,14 @@ class MetaheuristicTuner:
             
             
     async def tune_algorithms(self, algorithmsData, selected, selected_funcs, dim,
-                        iterations=30, R=20):
+                        iterations=30, R=20, max_evals=None):
         self.param_spaces = self.param_spaces_fn(algorithmsData)
+        self.max_evals = max_evals or None
         results = {}
+        if self.max_evals:
+            # górna granica pracy zlecenia: każde uruchomienie kończy na budżecie
+            print(f"Budżet: {self.max_evals} ewaluacji na uruchomienie, "
+                  f"{self.max_evals * R * len(selected_funcs)} na kandydata")
 
         # ====== WZNOWIENIE GLOBALNE ======
         if os.path.exists(self.tuner_state_file):
@@ -352,11 +884,10 @@ class MetaheuristicTuner:
             if best == "pause":
                 print(f"Tuner przerwany podczas strojenia algorytmu {alg}.")
                 # Zapisujemy stan globalny, żeby wznowić od TEGO algorytmu
-                with open(self.tuner_state_file, "w") as f:
-                    json.dump({
-                        "current_algorithm_index": i,
-                        "selected_algorithms": selected
-                    }, f)
+                atomic_dump_json({
+                    "current_algorithm_index": i,
+                    "selected_algorithms": selected
+                }, self.tuner_state_file)
                 return None, None
             
             if best == "stop":
@@ -366,33 +897,34 @@ class MetaheuristicTuner:
             results[alg] = best
 
             # zapis wyniku
-            with open(os.path.join(self.folder, f"results_{alg}.json"), "w") as f:
-                json.dump(best, f)
+            atomic_dump_json(best, os.path.join(self.folder, f"results_{alg}.json"))
+            self._save_trace(alg)
 
             # zapis globalnego stanu
-            with open(self.tuner_state_file, "w") as f:
-                json.dump({"current_algorithm_index": i + 1}, f)
+            atomic_dump_json({"current_algorithm_index": i + 1}, self.tuner_state_file)
 
-            # usuwamy checkpointy algorytmu
-            for ext in ["json", "pkl"]:
-                path = os.path.join(self.folder, f"checkpoint_{alg}.{ext}")
+            # usuwamy checkpoint algorytmu (i ewentualny .json starego formatu)
+            for path in (self._checkpoint_file(alg), os.path.join(self.folder, f"checkpoint_{alg}.json")):
                 if os.path.exists(path):
                     os.remove(path)
 
         figures = {}
         for alg in selected:
             if alg in results:  # Tylko dla ukończonych algorytmów
-                figure = self.generate_figures(results[alg], alg, dim, selected_funcs)
+                with self.stats.timer("generate_figures"):
+                    figure = self.generate_figures(results[alg], alg, dim, selected_funcs)
                 figures[alg] = figure
+                self.costs[alg] = self.cost_summary(results[alg], alg)
 
         # ====== SPRZĄTANIE ======
         if os.path.exists(self.tuner_state_file):
             os.remove(self.tuner_state_file)
 
-        # usuwamy results_*.json
+        # usuwamy results_*.json i trace_*.pkl
         for alg in selected:
-            path = os.path.join(self.folder, f"results_{alg}.json")
-            if os.path.exists(path):
-                os.remove(path)
+            for path in (os.path.join(self.folder, f"results_{alg}.json"), self._trace_file(alg)):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._traces.pop(alg, None)
 
         return results, figures
\ No newline at end of file
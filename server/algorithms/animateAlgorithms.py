@@ -1,20 +1,26 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+import io
 import base64
-import os
 
-def animate_algorithm(positions_log, bounds, objective_func, interval=300):
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from algorithms.figureData import contour_grid, frame_indices
+
 
+def animate_algorithm(positions_log, bounds, objective_func, interval=300,
+                      resolution=200, max_frames=None, frame_step=1, func_key=None, steps=None):
+    """
+    Animacja ruchu agentów jako GIF (base64). Siatka poziomic liczona jednym
+    wywołaniem wsadowym (i trzymana w cache, jeśli podano func_key), klatki
+    można przerzedzić (frame_step, max_frames), a GIF powstaje w pamięci.
+    steps - numer iteracji każdej klatki do tytułu (None - numer klatki).
+    """
     # Przygotowanie siatki pod contour plot
-    x = np.linspace(bounds[0][0], bounds[0][1], 200)
-    y = np.linspace(bounds[1][0], bounds[1][1], 200)
+    x = np.linspace(bounds[0][0], bounds[0][1], resolution)
+    y = np.linspace(bounds[1][0], bounds[1][1], resolution)
     X, Y = np.meshgrid(x, y)
-    Z = np.zeros_like(X)
-
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            Z[i, j] = objective_func(np.array([X[i, j], Y[i, j]]))
+    Z = contour_grid(objective_func, bounds, resolution, func_key)
 
     fig, ax = plt.subplots(figsize=(7, 7))
 
@@ -22,28 +28,33 @@ def animate_algorithm(positions_log, bounds, objective_func, interval=300):
     ax.contourf(X, Y, Z, levels=50, cmap='viridis')
     ax.set_xlim(bounds[0])
     ax.set_ylim(bounds[1])
-    ax.set_title("Ruch agentów algorytmu")
 
     # Punkty agentów
-    scatter = ax.scatter([], [], c='red', s=40)
-
-    # Funkcja aktualizująca klatkę
-    def update(frame):
-        positions = positions_log[frame]
-        scatter.set_offsets(positions)
-        ax.set_title(f"Ruch agentów — iteracja {frame}")
-        return scatter,
-
-    anim = FuncAnimation(fig, update, frames=len(positions_log), interval=interval, blit=True)
-
-    # Zapis do bufora
-    anim.save("animation.gif", writer='pillow', fps=1000/interval)
-    with open("animation.gif", 'rb') as f:
-        gif_bytes = f.read()
-
-    gif_base64 = base64.b64encode(gif_bytes).decode('utf-8')
+    scatter = ax.scatter([], [], c='red', s=40, animated=True)
+    ax.title.set_animated(True)
+
+    # Tło rysujemy raz, a w każdej klatce tylko punkty i tytuł (blitting);
+    # klatki składamy w GIF w BytesIO (bez pliku na dysku)
+    fig.canvas.draw()
+    background = fig.canvas.copy_from_bbox(fig.bbox)
+
+    # Paleta liczona raz (tło + czerwone punkty), potem tylko mapowanie kolorów
+    palette = None
+    frames = []
+    for frame in frame_indices(len(positions_log), max_frames, frame_step):
+        fig.canvas.restore_region(background)
+        scatter.set_offsets(positions_log[frame])
+        ax.set_title(f"Ruch agentów — iteracja {frame if steps is None else steps[frame]}")
+        ax.draw_artist(scatter)
+        ax.draw_artist(ax.title)
+        image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB")
+        if palette is None:
+            palette = image.quantize(colors=128)
+        frames.append(image.quantize(palette=palette, dither=Image.Dither.NONE))
 
     plt.close(fig)
-    os.remove("animation.gif")
 
-    return gif_base64
\ No newline at end of file
+    buf = io.BytesIO()
+    frames[0].save(buf, format="GIF", save_all=True, append_images=frames[1:],
+                   duration=interval, loop=0)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
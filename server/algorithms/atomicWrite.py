@@ -0,0 +1,33 @@
+import json
+import os
+import pickle
+import tempfile
+
+# ============================================================
+# ZAPIS ATOMOWY
+# Plik powstaje obok docelowego pod tymczasową nazwą i podmieniany
+# jest przez os.replace - przerwany zapis (crash, kill) zostawia
+# poprzednią wersję pliku, nigdy pół pliku.
+# ============================================================
+
+def atomic_write_bytes(path, data):
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_dump_json(obj, path):
+    atomic_write_bytes(path, json.dumps(obj).encode("utf-8"))
+
+
+def atomic_dump_pickle(obj, path):
+    atomic_write_bytes(path, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
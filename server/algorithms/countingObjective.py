@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+
+from algorithms.vectorized import PROBE_ROWS, evaluate_population, needs_probe
+
+
+class CountingObjective:
+    """
+    Licznik wywołań funkcji celu: ile punktów policzono (calls) i ile
+    sekund w niej spędzono (seconds). Obiekt jest wektorowy - macierz
+    (n, dim) idzie do oryginału przez evaluate_population.
+    """
+
+    vectorized = True
+
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = getattr(func, "__name__", "objective")
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        start = time.perf_counter()
+        if x.ndim == 1:
+            value = self.func(x)
+            self.calls += 1
+        else:
+            if needs_probe(self.func, x.shape[0]):
+                # wykrywanie wersji wektorowej liczy PROBE_ROWS punktów podwójnie
+                self.calls += PROBE_ROWS
+            value = evaluate_population(self.func, x)
+            self.calls += x.shape[0]
+        self.seconds += time.perf_counter() - start
+        return value
+
+    def reset(self):
+        self.calls = 0
+        self.seconds = 0.0
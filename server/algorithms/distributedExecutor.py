@@ -0,0 +1,324 @@
+import asyncio
+import collections
+import hashlib
+import hmac
+import itertools
+import os
+import pickle
+import struct
+import time
+
+# ============================================================
+# PROTOKÓŁ
+# Ramka = 4 bajty długości (big-endian) + słownik w pickle.
+# Pickle wykonuje kod przy odczycie, więc ramki pickle są bezpieczne
+# tylko w zaufanej sieci i tylko między stronami znającymi wspólny klucz.
+# Przed pierwszą ramką pickle obie strony dowodzą znajomości klucza
+# (HMAC losowego wyzwania drugiej strony - sam klucz nie idzie przez
+# sieć): proces roboczy nie czyta pickle od obcego serwera, a serwer
+# - od obcego procesu. Pusty albo krótki klucz jest odrzucany.
+# ============================================================
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 1 << 30
+MIN_AUTHKEY_LENGTH = 16
+_NONCE_BYTES = 32
+_MAX_HANDSHAKE_BYTES = 4096
+
+
+def check_authkey(authkey):
+    """Zwraca klucz albo rzuca ValueError, jeśli nie jest prawdziwym sekretem."""
+    if not authkey or len(authkey) < MIN_AUTHKEY_LENGTH:
+        raise ValueError(
+            f"Tryb rozproszony wymaga wspólnego klucza TUNER_AUTHKEY (co najmniej {MIN_AUTHKEY_LENGTH} znaków) "
+            "- bez niego każdy, kto połączy się z portem, wykona dowolny kod. Klucz można wygenerować tak: "
+            "python -c \"import secrets; print(secrets.token_urlsafe(32))\"")
+    return authkey
+
+
+def _proof(authkey, role, nonce):
+    return hmac.new(authkey.encode("utf-8"), role + nonce, hashlib.sha256).digest()
+
+
+def _frame(message):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(data)) + data
+
+
+async def send_message(writer, message):
+    # jedna operacja write na ramkę - wiadomości z różnych korutyn się nie przeplatają
+    writer.write(_frame(message))
+    await writer.drain()
+
+
+async def recv_message(reader):
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Za duża ramka: {size} B")
+    return pickle.loads(await reader.readexactly(size))
+
+
+async def _send_raw(writer, data):
+    writer.write(_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def _recv_raw(reader):
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > _MAX_HANDSHAKE_BYTES:
+        raise ConnectionError("Niepoprawne powitanie")
+    return await reader.readexactly(size)
+
+
+async def client_handshake(reader, writer, authkey, name):
+    """
+    Powitanie po stronie procesu roboczego: odpowiada na wyzwanie serwera,
+    wysyła własne i sprawdza odpowiedź serwera. Rzuca ConnectionError,
+    jeśli serwer nie zna klucza - wtedy nie czytamy od niego żadnego pickle.
+    """
+    challenge = await _recv_raw(reader)
+    nonce = os.urandom(_NONCE_BYTES)
+    await _send_raw(writer, _proof(authkey, b"worker", challenge) + nonce + name.encode("utf-8"))
+    if not hmac.compare_digest(await _recv_raw(reader), _proof(authkey, b"server", nonce)):
+        raise ConnectionError("Serwer nie zna klucza")
+
+
+async def _server_handshake(reader, writer, authkey):
+    """Powitanie po stronie serwera; zwraca nazwę procesu roboczego albo None (zły klucz)."""
+    challenge = os.urandom(_NONCE_BYTES)
+    await _send_raw(writer, challenge)
+    hello = await _recv_raw(reader)
+    size = hashlib.sha256().digest_size
+    proof, nonce = hello[:size], hello[size:size + _NONCE_BYTES]
+    name = hello[size + _NONCE_BYTES:].decode("utf-8", errors="replace")
+    if len(nonce) != _NONCE_BYTES or not hmac.compare_digest(proof, _proof(authkey, b"worker", challenge)):
+        print(f"Odrzucono proces roboczy {name!r}: zły klucz")
+        return None
+    await _send_raw(writer, _proof(authkey, b"server", nonce))
+    return name
+
+
+# ============================================================
+# STRONA SERWERA
+# ============================================================
+
+class _Entry:
+    """Zadanie w kolejce albo wydzierżawione procesowi roboczemu."""
+
+    def __init__(self, task_id, task, future):
+        self.id = task_id
+        self.task = task
+        self.future = future
+        self.attempts = 0
+        self.worker = None
+
+
+class _Worker:
+    def __init__(self, worker_id, name, writer):
+        self.id = worker_id
+        self.name = name
+        self.writer = writer
+        self.lease = None
+        self.last_seen = time.monotonic()
+        self.completed = 0
+
+
+class DistributedExecutor:
+    """
+    Zamiennik ParallelExecutor: zadania (grupy powtórzeń) wykonują procesy
+    robocze (server/worker.py) połączone przez TCP, także z innych maszyn.
+
+    Proces roboczy pobiera jedno zadanie naraz i dzierżawi je, dopóki
+    wysyła heartbeat; brak wiadomości przez lease_timeout sekund albo
+    zerwane połączenie oznacza utratę procesu - jego zadanie wraca na
+    początek kolejki (najwyżej max_attempts razy). Wyniki są identyczne
+    jak w innych trybach (powtórzenie r ma zawsze generator (seed, r)).
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, authkey=None, lease_timeout=10.0,
+                 heartbeat_interval=1.0, poll_interval=0.05, max_attempts=3):
+        self.host = host
+        self.port = port
+        # authkey=None - klucz ze zmiennej środowiskowej TUNER_AUTHKEY
+        self.authkey = check_authkey(os.environ.get("TUNER_AUTHKEY", "") if authkey is None else authkey)
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+
+        self._server = None
+        self._queue = collections.deque()
+        self._has_tasks = None
+        self._workers = {}
+        self._ids = itertools.count()
+        self.stats = {"dispatched": 0, "completed": 0, "redispatched": 0, "workers_lost": 0}
+
+    async def start(self):
+        if self._server is None:
+            self._has_tasks = asyncio.Event()
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            print(f"Czekam na procesy robocze na {self.host}:{self.port}")
+        return self
+
+    @property
+    def workers(self):
+        return len(self._workers)
+
+    @property
+    def capacity(self):
+        """Ile zadań liczy się naraz - po jednym na podłączony proces roboczy."""
+        return max(1, len(self._workers))
+
+    # ---------- obsługa jednego procesu roboczego ----------
+
+    async def _serve(self, reader, writer):
+        try:
+            name = await asyncio.wait_for(_server_handshake(reader, writer, self.authkey), self.lease_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, OSError):
+            name = None
+        if name is None:
+            writer.close()
+            return
+
+        worker = _Worker(next(self._ids), name, writer)
+        self._workers[worker.id] = worker
+        print(f"Proces roboczy {name} podłączony (aktywnych: {len(self._workers)})")
+        try:
+            await send_message(writer, {"type": "welcome", "heartbeat_interval": self.heartbeat_interval})
+            while True:
+                entry = await self._wait_for_task(reader)
+                entry.worker = worker
+                worker.lease = entry
+                self.stats["dispatched"] += 1
+                await send_message(writer, {"type": "task", "id": entry.id, "task": entry.task})
+
+                while worker.lease is not None:
+                    # dzierżawa trwa, dopóki przychodzą heartbeaty
+                    message = await asyncio.wait_for(recv_message(reader), self.lease_timeout)
+                    worker.last_seen = time.monotonic()
+                    if message["type"] == "result" and message["id"] == entry.id:
+                        worker.lease = None
+                        entry.worker = None
+                        worker.completed += 1
+                        self.stats["completed"] += 1
+                        if not entry.future.done():
+                            if "error" in message:
+                                entry.future.set_exception(RuntimeError(message["error"]))
+                            else:
+                                entry.future.set_result(message["result"])
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            print(f"Utracono proces roboczy {name}: {type(e).__name__}")
+            self.stats["workers_lost"] += 1
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._workers.pop(worker.id, None)
+            if worker.lease is not None:
+                self._redispatch(worker.lease)
+            writer.close()
+
+    async def _wait_for_task(self, reader):
+        """
+        Następne zadanie dla bezczynnego procesu roboczego. Bezczynny proces
+        nic nie wysyła, więc cokolwiek do odczytu (w praktyce EOF) oznacza
+        zerwane połączenie - wykrywamy je bez czekania na zadanie.
+        """
+        next_task = asyncio.ensure_future(self._next_task())
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            await asyncio.wait({next_task, closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in (next_task, closed):
+                if not waiter.done():
+                    waiter.cancel()
+        if closed.done() and not closed.cancelled():
+            if next_task.done() and not next_task.cancelled():
+                self._queue.appendleft(next_task.result())
+                self._has_tasks.set()
+            raise ConnectionError("Proces roboczy rozłączył się")
+        return next_task.result()
+
+    async def _next_task(self):
+        while True:
+            while self._queue:
+                entry = self._queue.popleft()
+                if not entry.future.done():
+                    return entry
+            self._has_tasks.clear()
+            await self._has_tasks.wait()
+
+    def _redispatch(self, entry):
+        entry.worker = None
+        if entry.future.done():
+            return
+        entry.attempts += 1
+        if entry.attempts >= self.max_attempts:
+            entry.future.set_exception(RuntimeError(
+                f"Zadanie {entry.id} utracone {entry.attempts} razy razem z procesami roboczymi"))
+            return
+        self.stats["redispatched"] += 1
+        self._queue.appendleft(entry)
+        self._has_tasks.set()
+
+    def _submit(self, task):
+        entry = _Entry(next(self._ids), task, asyncio.get_running_loop().create_future())
+        self._queue.append(entry)
+        self._has_tasks.set()
+        return entry
+
+    def _cancel(self, entry):
+        entry.future.cancel()
+        worker = entry.worker
+        if worker is not None:
+            # proces roboczy przerywa uruchomienie (stop_event) i odsyła None
+            try:
+                worker.writer.write(_frame({"type": "cancel", "id": entry.id}))
+            except (ConnectionError, OSError):
+                pass
+
+    # ---------- interfejs jak w ParallelExecutor ----------
+
+    async def run(self, tasks, should_abort_fn, progress_fn=None, partial=False, max_in_flight=None):
+        """Jak ParallelExecutor.run - zadania trafiają do kolejki procesów roboczych."""
+        await self.start()
+        limit = max_in_flight or len(tasks)
+
+        entries = [None] * len(tasks)
+        pending = set()
+        submitted = 0
+        while True:
+            while submitted < len(tasks) and len(pending) < limit:
+                entries[submitted] = self._submit(tasks[submitted])
+                pending.add(entries[submitted].future)
+                submitted += 1
+            if not pending:
+                break
+
+            _, pending = await asyncio.wait(pending, timeout=self.poll_interval)
+
+            if progress_fn is not None:
+                await progress_fn(submitted - len(pending), len(tasks))
+
+            if await should_abort_fn():
+                for entry in entries:
+                    if entry is not None and not entry.future.done():
+                        self._cancel(entry)
+                if not partial:
+                    return None
+                return [e.future.result() if e is not None and e.future.done() and not e.future.cancelled()
+                        else None for e in entries]
+
+        results = [e.future.result() for e in entries]
+        if not partial and any(r is None for r in results):
+            return None
+        return results
+
+    def shutdown(self):
+        for worker in list(self._workers.values()):
+            worker.writer.close()
+        for entry in self._queue:
+            entry.future.cancel()
+        self._queue.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
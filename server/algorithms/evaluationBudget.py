@@ -0,0 +1,81 @@
+import numpy as np
+
+from algorithms.vectorized import PROBE_ROWS, evaluate_population, needs_probe
+
+
+class EvaluationBudget:
+    """
+    Licznik ewaluacji funkcji celu (NFE) dla R replik prowadzonych razem,
+    z twardym limitem max_evals na replikę (None albo 0 - bez limitu).
+
+    Partia, która nie mieści się w budżecie, jest liczona tylko w części:
+    pierwsze punkty repliki do wyczerpania budżetu, reszta dostaje +inf
+    i nie wygrywa żadnego porównania. Replika nigdy nie przekracza limitu,
+    a wynik nie zależy od tego, ile replik liczy się razem.
+    """
+
+    def __init__(self, R, max_evals=None):
+        self.max_evals = int(max_evals) if max_evals else None
+        self.used = np.zeros(R, dtype=np.int64)
+
+    def available(self):
+        """Maska (R,) replik, którym zostało jeszcze coś budżetu."""
+        if self.max_evals is None:
+            return np.ones(len(self.used), dtype=bool)
+        return self.used < self.max_evals
+
+    @property
+    def exhausted(self):
+        return self.max_evals is not None and not np.any(self.available())
+
+    def evaluate(self, func, X, rows=None, mask=None):
+        """
+        X: (k, m, dim) - po m punktów dla replik rows (domyślnie wszystkich).
+        mask (k, m) - liczone (i płatne) są tylko zaznaczone punkty, reszta
+        dostaje +inf. Zwraca wartości (k, m); punkty ponad budżet mają +inf.
+        """
+        k, m, dim = X.shape
+        rows = slice(None) if rows is None else rows
+        if mask is None and self.max_evals is None:
+            self._charge_probe(func, rows, k * m)
+            self.used[rows] += m
+            return evaluate_population(func, X.reshape(-1, dim)).reshape(k, m)
+
+        counted = np.ones((k, m), dtype=bool) if mask is None else mask
+        self._charge_probe(func, rows, int(np.count_nonzero(counted)))
+        if self.max_evals is not None:
+            # w kolejności kolumn, do wyczerpania budżetu repliki
+            remaining = self.max_evals - self.used[rows]
+            counted = counted & (np.cumsum(counted, axis=1) <= remaining[:, None])
+        self.used[rows] += np.count_nonzero(counted, axis=1)
+        values = np.full((k, m), np.inf)
+        if counted.any():
+            values[counted] = evaluate_population(func, X[counted])
+        return values
+
+    def _charge_probe(self, func, rows, n):
+        """
+        Funkcja bez znacznika `vectorized` jest przy pierwszej populacji
+        sprawdzana na PROBE_ROWS punktach liczonych podwójnie - płaci za to
+        pierwsza replika partii, która ma jeszcze budżet.
+        """
+        if not needs_probe(func, n):
+            return
+        replicas = np.arange(len(self.used))[rows]
+        if self.max_evals is not None:
+            replicas = replicas[self.used[replicas] < self.max_evals]
+        if len(replicas):
+            first = replicas[0]
+            cost = PROBE_ROWS if self.max_evals is None else min(PROBE_ROWS, self.max_evals - self.used[first])
+            self.used[first] += cost
+
+
+def finish_early(convergence_curve, positions_log, done, best, positions):
+    """
+    Silnik przerwany po `done` iteracjach (budżet wyczerpany): reszta krzywej
+    zbieżności to ostatnie najlepsze wartości, a kolejne klatki - ostatnie
+    pozycje, więc kształty wyników są takie same jak po pełnym przebiegu.
+    """
+    convergence_curve[:, done + 1:] = best[:, None]
+    for step in range(done + 1, convergence_curve.shape[1]):
+        positions_log.record(step, positions)
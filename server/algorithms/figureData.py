@@ -0,0 +1,93 @@
+import base64
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from algorithms.vectorized import evaluate_population
+
+# ============================================================
+# DANE WYKRESÓW DLA FRONTENDU
+# Zamiast PNG/GIF wysyłamy surowe liczby jako float32 (little-endian)
+# zakodowane base64 - frontend składa z nich Float32Array i sam rysuje.
+# ============================================================
+
+def encode_float32(array):
+    """{"shape": [...], "data": base64 bajtów float32} dla dowolnej tablicy."""
+    array = np.ascontiguousarray(array, dtype="<f4")
+    return {
+        "dtype": "float32",
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.tobytes()).decode("ascii"),
+    }
+
+
+def frame_indices(n_frames, max_frames=None, frame_step=1):
+    """
+    Indeksy klatek do pokazania: co frame_step-ta, a potem równomiernie
+    przerzedzone do max_frames (pierwsza i ostatnia zostają zawsze).
+    """
+    idx = np.arange(0, n_frames, max(1, frame_step))
+    if n_frames and idx[-1] != n_frames - 1:
+        idx = np.append(idx, n_frames - 1)
+    if max_frames is not None and len(idx) > max_frames:
+        idx = idx[np.unique(np.linspace(0, len(idx) - 1, max_frames).round().astype(int))]
+    return idx
+
+
+def decimate_frames(positions_log, max_frames=None, frame_step=1):
+    return [positions_log[i] for i in frame_indices(len(positions_log), max_frames, frame_step)]
+
+
+# Siatki poziomic: (hash kodu funkcji, granice, rozdzielczość) -> Z
+_GRID_CACHE_SIZE = 16
+_grid_cache = OrderedDict()
+
+
+def contour_grid(objective_func, bounds, resolution=100, func_key=None):
+    """
+    Wartości funkcji celu na siatce resolution x resolution (jedno wywołanie
+    wsadowe). Z func_key (np. kod źródłowy funkcji) wynik trafia do cache.
+    """
+    key = None
+    if func_key is not None:
+        key = (hashlib.sha256(func_key.encode("utf-8")).hexdigest(),
+               tuple(tuple(map(float, b)) for b in bounds), resolution)
+        Z = _grid_cache.get(key)
+        if Z is not None:
+            _grid_cache.move_to_end(key)
+            return Z
+
+    x = np.linspace(bounds[0][0], bounds[0][1], resolution)
+    y = np.linspace(bounds[1][0], bounds[1][1], resolution)
+    X, Y = np.meshgrid(x, y)
+    points = np.column_stack([X.ravel(), Y.ravel()])
+    Z = evaluate_population(objective_func, points).reshape(resolution, resolution)
+
+    if key is not None:
+        Z.flags.writeable = False
+        _grid_cache[key] = Z
+        if len(_grid_cache) > _GRID_CACHE_SIZE:
+            _grid_cache.popitem(last=False)
+    return Z
+
+
+def convergence_data(convergence_curve):
+    return encode_float32(convergence_curve)
+
+
+def animation_data(positions_log, bounds, objective_func, max_frames=100, resolution=100,
+                   frame_step=1, func_key=None, steps=None):
+    """
+    Klatki pozycji (frames, n, 2), numery iteracji klatek i tło z poziomicami
+    dla animacji rysowanej w przeglądarce. steps - numer iteracji każdej
+    klatki positions_log (None - kolejne numery klatek).
+    """
+    idx = frame_indices(len(positions_log), max_frames, frame_step)
+    steps = np.arange(len(positions_log)) if steps is None else np.asarray(steps)
+    return {
+        "bounds": [list(map(float, b)) for b in bounds],
+        "positions": encode_float32(np.stack([positions_log[i] for i in idx])),
+        "iterations": [int(step) for step in steps[idx]],
+        "contour": encode_float32(contour_grid(objective_func, bounds, resolution, func_key)),
+    }
@@ -0,0 +1,303 @@
+import ast
+import copy
+import math
+
+import numpy as np
+
+from algorithms.jitKernels import OBJECTIVE_KERNELS, resolve_backend
+from algorithms.vectorized import detect_vectorized
+
+
+def compile_function(code_string, bounds=None, vectorize=True, backend="numpy"):
+    """
+    Zamienia kod funkcji celu (string) na obiekt funkcji.
+    Rzuca SyntaxError / ValueError, gdy kodu nie da się użyć.
+
+    Przy vectorize=True próbuje przetłumaczyć kod na NumPy (patrz
+    vectorize_function_code); jeśli się nie da albo wynik nie zgadza się
+    z oryginałem, zwraca zwykłą funkcję skalarną. Z backend="numba"
+    (i zainstalowaną numbą) wbudowana funkcja celu dostaje kernel
+    z jitKernels - o ile zgadza się z kodem użytkownika.
+    """
+    globals_dict = {"math": math}
+    locals_dict = {}
+
+    exec(code_string, globals_dict, locals_dict)
+    func = next((v for v in locals_dict.values() if callable(v)), None)
+    if func is None:
+        raise ValueError("W podanym kodzie nie znaleziono definicji funkcji (brak 'def').")
+
+    kernel = OBJECTIVE_KERNELS.get(func.__name__)
+    if vectorize and kernel is not None and resolve_backend(backend) == "numba":
+        if _matches_original(func, kernel, bounds):
+            return _with_batched_path(func, kernel)
+
+    if vectorize:
+        vec_func = vectorize_function_code(code_string)
+        if vec_func is not None and _matches_original(func, vec_func, bounds):
+            return _with_batched_path(func, vec_func)
+
+    # znacznik od razu - evaluate_population nie musi wykrywać na populacji
+    # silnika (podwójne ewaluacje poza budżetem i licznikami)
+    func.vectorized = vectorize and _handles_populations(func, bounds)
+    return func
+
+
+# ============================================================
+# TŁUMACZENIE AST -> NUMPY
+# Kod pisany jako sumy po x (sum(i**2 for i in x), math.cos,
+# x[i+1] dla i in range(len(x) - 1)) przepisujemy na wyrażenia
+# na macierzy populacji x o kształcie (n, dim).
+# ============================================================
+
+_MATH_TO_NUMPY = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "asin": "arcsin", "acos": "arccos", "atan": "arctan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "exp": "exp", "log": "log", "log10": "log10", "log2": "log2",
+    "sqrt": "sqrt", "fabs": "abs", "floor": "floor", "ceil": "ceil", "trunc": "trunc",
+    "pi": "pi", "e": "e", "inf": "inf",
+}
+
+_BUILTINS_TO_NUMPY = {
+    "abs": "abs",
+    "int": "trunc",
+    "round": "round",
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _np(name):
+    return ast.Attribute(value=ast.Name(id="np", ctx=ast.Load()), attr=name, ctx=ast.Load())
+
+
+def _np_call(name, args, keywords=None):
+    return ast.Call(func=_np(name), args=args, keywords=keywords or [])
+
+
+def _int_constant(node):
+    """Zwraca wartość stałej całkowitej (także ujemnej, np. -1) albo None."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _int_constant(node.operand)
+        return None if value is None else -value
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    return None
+
+
+def _offset(node, c):
+    if c == 0:
+        return copy.deepcopy(node)
+    return ast.BinOp(left=copy.deepcopy(node), op=ast.Add(), right=ast.Constant(c))
+
+
+class _Vectorizer(ast.NodeTransformer):
+
+    def __init__(self, arg):
+        self.arg = arg
+        self.loop = None  # (zmienna, "elem") albo (zmienna, "range", start, stop)
+
+    def _is_arg(self, node):
+        return isinstance(node, ast.Name) and node.id == self.arg
+
+    def _index_offset(self, node):
+        """Zwraca c dla indeksu postaci v, v + c, c + v, v - c (albo None)."""
+        var = self.loop[0] if self.loop and self.loop[1] == "range" else None
+        if var is None:
+            return None
+        if isinstance(node, ast.Name) and node.id == var:
+            return 0
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+            left, right = node.left, node.right
+            if isinstance(left, ast.Name) and left.id == var and _int_constant(right) is not None:
+                c = _int_constant(right)
+                return c if isinstance(node.op, ast.Add) else -c
+            if isinstance(node.op, ast.Add) and isinstance(right, ast.Name) and right.id == var \
+                    and _int_constant(left) is not None:
+                return _int_constant(left)
+        return None
+
+    def visit_Name(self, node):
+        if self.loop is not None and node.id == self.loop[0]:
+            if self.loop[1] == "elem":
+                return ast.Name(id=self.arg, ctx=ast.Load())
+            _, _, start, stop = self.loop
+            return _np_call("arange", [copy.deepcopy(start), copy.deepcopy(stop)])
+        if node.id == self.arg:
+            # x użyte inaczej niż przez len(), indeks albo pętlę
+            raise _Unsupported(node.id)
+        return node
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "math" and node.attr in _MATH_TO_NUMPY:
+            return _np(_MATH_TO_NUMPY[node.attr])
+        raise _Unsupported(ast.dump(node))
+
+    def visit_Subscript(self, node):
+        if not self._is_arg(node.value):
+            raise _Unsupported(ast.dump(node))
+
+        index = node.slice
+        c = self._index_offset(index)
+        if c is not None:
+            # x[v + c] dla v in range(start, stop) -> x[..., start + c:stop + c]
+            _, _, start, stop = self.loop
+            sl = ast.Slice(lower=_offset(start, c), upper=_offset(stop, c))
+            return ast.Subscript(value=ast.Name(id=self.arg, ctx=ast.Load()),
+                                 slice=ast.Tuple(elts=[ast.Constant(Ellipsis), sl], ctx=ast.Load()),
+                                 ctx=ast.Load())
+
+        if _int_constant(index) is not None:
+            # stały indeks; wewnątrz sumy dokładamy oś, żeby się broadcastował
+            elts = [ast.Constant(Ellipsis), ast.Constant(_int_constant(index))]
+            if self.loop is not None:
+                elts.append(ast.Constant(None))
+            return ast.Subscript(value=ast.Name(id=self.arg, ctx=ast.Load()),
+                                 slice=ast.Tuple(elts=elts, ctx=ast.Load()), ctx=ast.Load())
+
+        raise _Unsupported(ast.dump(node))
+
+    def visit_Call(self, node):
+        if node.keywords:
+            raise _Unsupported(ast.dump(node))
+        func = node.func
+
+        if isinstance(func, ast.Name) and func.id == "len" and len(node.args) == 1 and self._is_arg(node.args[0]):
+            shape = ast.Attribute(value=ast.Name(id=self.arg, ctx=ast.Load()), attr="shape", ctx=ast.Load())
+            return ast.Subscript(value=shape, slice=ast.Constant(-1), ctx=ast.Load())
+
+        if isinstance(func, ast.Name) and func.id == "sum" and len(node.args) == 1 \
+                and isinstance(node.args[0], ast.GeneratorExp):
+            return self._visit_sum(node.args[0])
+
+        if isinstance(func, ast.Name) and func.id in _BUILTINS_TO_NUMPY and len(node.args) == 1:
+            return _np_call(_BUILTINS_TO_NUMPY[func.id], [self.visit(node.args[0])])
+
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "math" \
+                and func.attr in _MATH_TO_NUMPY:
+            return _np_call(_MATH_TO_NUMPY[func.attr], [self.visit(a) for a in node.args])
+
+        raise _Unsupported(ast.dump(node))
+
+    def _visit_sum(self, gen):
+        if self.loop is not None or len(gen.generators) != 1:
+            raise _Unsupported("zagnieżdżona suma")
+        comp = gen.generators[0]
+        if comp.ifs or comp.is_async or not isinstance(comp.target, ast.Name):
+            raise _Unsupported("warunek w sumie")
+
+        var = comp.target.id
+        it = comp.iter
+        if self._is_arg(it):
+            self.loop = (var, "elem")
+        elif isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range" \
+                and 1 <= len(it.args) <= 2 and not it.keywords:
+            args = [self.visit(a) for a in it.args]
+            start, stop = (ast.Constant(0), args[0]) if len(args) == 1 else args
+            self.loop = (var, "range", start, stop)
+        else:
+            raise _Unsupported("nieobsługiwana pętla")
+
+        try:
+            elt = self.visit(gen.elt)
+        finally:
+            self.loop = None
+
+        return _np_call("sum", [elt], [ast.keyword(arg="axis", value=ast.Constant(-1))])
+
+
+def vectorize_function_code(code_string):
+    """
+    Tłumaczy kod funkcji skalarnej na funkcję f(X) liczącą macierz (n, dim).
+    Zwraca None, gdy kod zawiera konstrukcje spoza obsługiwanych wzorców.
+    """
+    try:
+        tree = ast.parse(code_string)
+    except SyntaxError:
+        return None
+
+    if len(tree.body) != 1 or not isinstance(tree.body[0], ast.FunctionDef):
+        return None
+    fdef = tree.body[0]
+    if len(fdef.args.args) != 1 or fdef.args.vararg or fdef.args.kwarg or fdef.args.kwonlyargs \
+            or fdef.decorator_list:
+        return None
+
+    vectorizer = _Vectorizer(fdef.args.args[0].arg)
+    body = []
+    try:
+        for stmt in fdef.body:
+            if isinstance(stmt, ast.Assign) and all(isinstance(t, ast.Name) for t in stmt.targets):
+                if any(t.id == vectorizer.arg for t in stmt.targets):
+                    return None
+                stmt.value = vectorizer.visit(stmt.value)
+            elif isinstance(stmt, ast.Return) and stmt.value is not None:
+                stmt.value = vectorizer.visit(stmt.value)
+            elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue  # docstring
+            else:
+                return None
+            body.append(stmt)
+    except _Unsupported:
+        return None
+
+    fdef.body = body
+    ast.fix_missing_locations(tree)
+
+    namespace = {"np": np}
+    try:
+        exec(compile(tree, "<vectorized>", "exec"), namespace)
+    except Exception:
+        return None
+    return namespace[fdef.name]
+
+
+def _matches_original(func, vec_func, bounds=None, n_samples=8):
+    """Porównuje wersję NumPy z oryginałem na losowych punktach dla kilku wymiarów."""
+    low, high = bounds if bounds is not None else (-5, 5)
+    rng = np.random.default_rng(0)
+
+    for dim in (1, 2, 5, 10):
+        X = rng.uniform(low, high, (n_samples, dim))
+        try:
+            expected = np.array([func(x) for x in X], dtype=float)
+        except Exception:
+            return False
+        try:
+            with np.errstate(all="ignore"):
+                got = np.broadcast_to(np.asarray(vec_func(X), dtype=float), (n_samples,))
+        except Exception:
+            return False
+        if not np.allclose(got, expected, rtol=1e-9, atol=1e-9, equal_nan=True):
+            return False
+
+    return True
+
+
+def _handles_populations(func, bounds=None, n_samples=8):
+    """Czy sam kod użytkownika liczy macierz (n, dim) (np. np.sum(..., axis=-1))."""
+    low, high = bounds if bounds is not None else (-5, 5)
+    rng = np.random.default_rng(0)
+    try:
+        return all(detect_vectorized(func, rng.uniform(low, high, (n_samples, dim)))[0]
+                   for dim in (1, 2, 5, 10))
+    except Exception:
+        return False
+
+
+def _with_batched_path(func, vec_func):
+    """Pojedynczy punkt liczy oryginał, populację (n, dim) - wersja NumPy."""
+    def batched(x):
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            return func(x)
+        values = np.asarray(vec_func(x), dtype=float)
+        # wyrażenia niezależne od x (np. stała) dają skalar - rozszerzamy do (n,)
+        return values if values.shape == (x.shape[0],) else np.full(x.shape[0], values)
+
+    batched.__name__ = func.__name__
+    batched.vectorized = True
+    return batched
@@ -0,0 +1,116 @@
+import base64
+import contextlib
+import cProfile
+import io
+import marshal
+import pstats
+import time
+
+# ============================================================
+# LICZNIKI I STOPERY
+# Wyłączone kosztują jedno sprawdzenie flagi - timer() zwraca wtedy
+# wspólny, pusty kontekst.
+# ============================================================
+
+_NOOP = contextlib.nullcontext()
+
+
+class Stats:
+    """Nazwane stopery (liczba, suma, maksimum czasu) i liczniki; włączane w locie."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._timers = {}
+        self._counters = {}
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        if not self.enabled:
+            return
+        entry = self._timers.get(name)
+        if entry is None:
+            entry = self._timers[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self):
+        return {
+            "enabled": self.enabled,
+            "timers": {
+                name: {"count": n, "total_s": total, "mean_s": total / n, "max_s": longest}
+                for name, (n, total, longest) in sorted(self._timers.items())
+            },
+            "counters": dict(sorted(self._counters.items())),
+        }
+
+    def reset(self):
+        self._timers.clear()
+        self._counters.clear()
+
+
+# ============================================================
+# PROFIL JEDNEGO WYWOŁANIA
+# ============================================================
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+def profile_call(fn, profiler="cprofile", top=40):
+    """
+    Wykonuje fn() pod profilerem. Zwraca (wynik fn, raport), gdzie raport
+    to {"format", "filename", "data" (base64 pliku do pobrania), "summary"}.
+    pyinstrument jest opcjonalny - bez niego używany jest cProfile.
+    """
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("Brak pyinstrument - profil z cProfile")
+        else:
+            prof = Profiler()
+            prof.start()
+            try:
+                result = fn()
+            finally:
+                prof.stop()
+            return result, {
+                "format": "html",
+                "filename": "profile.html",
+                "data": base64.b64encode(prof.output_html().encode("utf-8")).decode("ascii"),
+                "summary": prof.output_text(),
+            }
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        result = fn()
+    finally:
+        prof.disable()
+
+    summary = io.StringIO()
+    pstats.Stats(prof, stream=summary).sort_stats("cumulative").print_stats(top)
+    # plik .prof (marshal) - do otwarcia w snakeviz / pstats
+    prof.create_stats()
+    return result, {
+        "format": "pstats",
+        "filename": "profile.prof",
+        "data": base64.b64encode(marshal.dumps(prof.stats)).decode("ascii"),
+        "summary": summary.getvalue(),
+    }
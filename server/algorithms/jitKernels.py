@@ -0,0 +1,250 @@
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# ============================================================
+# OPCJONALNY BACKEND NUMBA
+# "numpy" - silniki i funkcje celu na operacjach tablicowych NumPy
+# "numba" - kroki aktualizacji silników i wbudowane funkcje celu jako
+#           kernele nopython (pętle bez tymczasowych tablic)
+# Losowania zostają w NumPy (te same strumienie generatorów), więc
+# wyniki obu backendów są równoważne - różnice wynikają tylko z
+# rozstrzygania remisów w turnieju GA i kolejności sumowania.
+# Bez zainstalowanej numby "numba" oznacza "numpy".
+# ============================================================
+
+BACKENDS = ("numpy", "numba")
+NUMBA_AVAILABLE = numba is not None
+
+_warned = False
+
+
+def resolve_backend(backend):
+    """Backend, którego faktycznie użyjemy w tym procesie (None - "numpy")."""
+    global _warned
+    backend = backend or "numpy"
+    if backend not in BACKENDS:
+        raise ValueError(f"Nieznany backend: {backend}")
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        if not _warned:
+            print("Numba nie jest zainstalowana - używam backendu numpy")
+            _warned = True
+        return "numpy"
+    return backend
+
+
+def njit(func):
+    """Kernel nopython (z cache kompilacji na dysku); bez numby - zwykła funkcja Pythona."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+# ============================================================
+# KERNELE SILNIKÓW
+# Tablice replik (R, n, dim) modyfikowane w miejscu; kolejność działań
+# taka jak w wersji NumPy.
+# ============================================================
+
+@njit
+def bat_move(x, v, best, f, local, epsilon, a_avg, low, high):
+    """Prędkości, pozycje, lokalny spacer wokół najlepszego i przycięcie do granic."""
+    R, n, dim = x.shape
+    for r in range(R):
+        for i in range(n):
+            for k in range(dim):
+                v[r, i, k] += (best[r, k] - x[r, i, k]) * f[r, i]
+                if local[r, i]:
+                    value = best[r, k] + epsilon[r, i] * a_avg[r]
+                else:
+                    value = x[r, i, k] + v[r, i, k]
+                x[r, i, k] = min(max(value, low), high)
+
+
+@njit
+def bat_accept(x, fitness, f_new, A, draws, alpha, best, best_f):
+    """Akceptacja nowych rozwiązań (głośność) i aktualizacja najlepszego w replice."""
+    R, n, dim = x.shape
+    for r in range(R):
+        j = 0
+        for i in range(n):
+            if draws[r, i] < A[r, i] and f_new[r, i] < fitness[r, i]:
+                fitness[r, i] = f_new[r, i]
+                A[r, i] *= alpha
+            if f_new[r, i] < f_new[r, j]:
+                j = i
+        if f_new[r, j] < best_f[r]:
+            best_f[r] = f_new[r, j]
+            for k in range(dim):
+                best[r, k] = x[r, j, k]
+
+
+@njit
+def ga_tournament(keys, fitness, k):
+    """
+    Zwycięzcy turniejów: w wierszu keys[r, t] uczestnikami jest k osobników
+    o najmniejszych kluczach, wygrywa najlepszy (remis - mniejszy klucz).
+    """
+    R, T, n = keys.shape
+    winners = np.empty((R, T), dtype=np.int64)
+    chosen = np.empty(k, dtype=np.int64)
+    for r in range(R):
+        for t in range(T):
+            # k najmniejszych kluczy - wybór przez wstawianie (k jest małe)
+            m = 0
+            for i in range(n):
+                key = keys[r, t, i]
+                if m < k:
+                    pos = m
+                    m += 1
+                elif key < keys[r, t, chosen[k - 1]]:
+                    pos = k - 1
+                else:
+                    continue
+                while pos > 0 and keys[r, t, chosen[pos - 1]] > key:
+                    chosen[pos] = chosen[pos - 1]
+                    pos -= 1
+                chosen[pos] = i
+            winner = chosen[0]
+            for c in range(1, m):
+                if fitness[r, chosen[c]] < fitness[r, winner]:
+                    winner = chosen[c]
+            winners[r, t] = winner
+    return winners
+
+
+@njit
+def abc_candidates(food_sources, bee_idx, j, k, phi, low, high):
+    """Kandydaci pszczół (R, m, dim): kopia źródła z jedną współrzędną przesuniętą względem partnera."""
+    R, n_sources, dim = food_sources.shape
+    m = bee_idx.shape[1]
+    new_solutions = np.empty((R, m, dim))
+    for r in range(R):
+        for b in range(m):
+            source = bee_idx[r, b]
+            for d in range(dim):
+                new_solutions[r, b, d] = food_sources[r, source, d]
+            d = j[r, b]
+            value = food_sources[r, source, d] + phi[r, b] * (food_sources[r, source, d] - food_sources[r, k[r, b], d])
+            new_solutions[r, b, d] = min(max(value, low), high)
+    return new_solutions
+
+
+@njit
+def abc_greedy_replace(food_sources, fitness, trial_counter, best_solution, best_fitness, bee_idx, new_solutions,
+                       new_fitness, active):
+    """Zachłanna wymiana dla prób active (R, m) - jak _greedy_replace."""
+    R, n_sources, dim = food_sources.shape
+    m = bee_idx.shape[1]
+    for r in range(R):
+        for b in range(m):
+            if not active[r, b]:
+                continue
+            source = bee_idx[r, b]
+            if new_fitness[r, b] < fitness[r, source]:
+                for d in range(dim):
+                    food_sources[r, source, d] = new_solutions[r, b, d]
+                fitness[r, source] = new_fitness[r, b]
+                trial_counter[r, source] = 0
+                if new_fitness[r, b] < best_fitness[r]:
+                    for d in range(dim):
+                        best_solution[r, d] = new_solutions[r, b, d]
+                    best_fitness[r] = new_fitness[r, b]
+            else:
+                trial_counter[r, source] += 1
+
+
+# ============================================================
+# WBUDOWANE FUNKCJE CELU (data/functions.json)
+# Populacja (n, dim) -> wartości (n,). Kernel zastępuje wersję NumPy
+# tylko wtedy, gdy zgadza się z kodem użytkownika (patrz compile_function).
+# ============================================================
+
+@njit
+def sphere(X):
+    n, dim = X.shape
+    out = np.empty(n)
+    for p in range(n):
+        s = 0.0
+        for i in range(dim):
+            s += X[p, i] ** 2
+        out[p] = s
+    return out
+
+
+@njit
+def step(X):
+    n, dim = X.shape
+    out = np.empty(n)
+    for p in range(n):
+        s = 0.0
+        for i in range(dim):
+            s += math.trunc(X[p, i])
+        out[p] = s
+    return out
+
+
+@njit
+def zakharov(X):
+    n, dim = X.shape
+    out = np.empty(n)
+    for p in range(n):
+        s1 = 0.0
+        s2 = 0.0
+        for i in range(dim):
+            s1 += X[p, i] ** 2
+            s2 += 0.5 * (i + 1) * X[p, i]
+        out[p] = s1 + s2 ** 2 + s2 ** 4
+    return out
+
+
+@njit
+def rastrigin(X, A=10.0):
+    n, dim = X.shape
+    out = np.empty(n)
+    for p in range(n):
+        s = 0.0
+        for i in range(dim):
+            s += X[p, i] ** 2 - A * math.cos(2 * math.pi * X[p, i])
+        out[p] = A * dim + s
+    return out
+
+
+@njit
+def rosenbrock(X):
+    n, dim = X.shape
+    out = np.empty(n)
+    for p in range(n):
+        s = 0.0
+        for i in range(dim - 1):
+            s += 100 * (X[p, i + 1] - X[p, i] ** 2) ** 2 + (X[p, i] - 1) ** 2
+        out[p] = s
+    return out
+
+
+@njit
+def monte_carlo_sum(x, noise):
+    """Suma sum((x + noise[s])**2) po wierszach szumu (samples, dim) - pętla heavy_monte_carlo."""
+    samples, dim = noise.shape
+    total = 0.0
+    for s in range(samples):
+        acc = 0.0
+        for k in range(dim):
+            acc += (x[k] + noise[s, k]) ** 2
+        total += acc
+    return total
+
+
+# Po nazwie funkcji z "def" w kodzie użytkownika
+OBJECTIVE_KERNELS = {
+    "sphere": sphere,
+    "step": step,
+    "zakharov": zakharov,
+    "rastrigin": rastrigin,
+    "rosenbrock": rosenbrock,
+}
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from algorithms.vectorized import evaluate_population
+
+# Przybliżony narzut jednego wpisu (obiekt bytes, float, węzeł OrderedDict)
+_ENTRY_OVERHEAD = 120
+
+
+class MemoizedObjective:
+    """
+    Cache wartości funkcji celu z wyrzucaniem najdawniej używanych (LRU).
+    Kluczem są dokładne bajty wektora x (float64), więc trafiają tylko
+    identyczne punkty - np. rozwiązania przycięte do granic, elity GA
+    albo siatka animacji. max_bytes ogranicza przybliżone zużycie pamięci.
+
+    Obiekt jest wektorowy: macierz (n, dim) liczy tylko brakujące wiersze
+    (jednym wywołaniem, jeśli oryginał na to pozwala).
+    """
+
+    vectorized = True
+
+    def __init__(self, func, max_bytes=64 * 2**20):
+        self.func = func
+        self.max_bytes = max_bytes
+        self.__name__ = getattr(func, "__name__", "objective")
+
+        self._values = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, x):
+        x = np.ascontiguousarray(x, dtype=float)
+        if x.ndim == 1:
+            return self._single(x)
+        return self._batch(x)
+
+    def _single(self, x):
+        key = x.tobytes()
+        value = self._values.get(key)
+        if value is not None:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = float(self.func(x))
+        self._store(key, value)
+        return value
+
+    def _batch(self, X):
+        values = np.empty(X.shape[0])
+        # klucz -> wiersze, które na niego czekają (duplikaty w populacji liczymy raz)
+        missing = {}
+
+        for i, row in enumerate(X):
+            key = row.tobytes()
+            value = self._values.get(key)
+            if value is not None:
+                self.hits += 1
+                self._values.move_to_end(key)
+                values[i] = value
+            elif key in missing:
+                self.hits += 1
+                missing[key].append(i)
+            else:
+                self.misses += 1
+                missing[key] = [i]
+
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            new_values = evaluate_population(self.func, X[first_rows])
+            for (key, rows), value in zip(missing.items(), new_values):
+                values[rows] = value
+                self._store(key, float(value))
+
+        return values
+
+    def _store(self, key, value):
+        self._values[key] = value
+        self._bytes += len(key) + _ENTRY_OVERHEAD
+        while self._bytes > self.max_bytes and self._values:
+            old_key, _ = self._values.popitem(last=False)
+            self._bytes -= len(old_key) + _ENTRY_OVERHEAD
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "entries": len(self._values),
+            "bytes": self._bytes,
+        }
+
+    def clear(self):
+        self._values.clear()
+        self._bytes = 0
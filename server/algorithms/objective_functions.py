@@ -1,19 +1,37 @@
 import numpy as np
 
+from algorithms.jitKernels import NUMBA_AVAILABLE, monte_carlo_sum, rastrigin
+from algorithms.vectorized import vectorized
 
+# Funkcje oznaczone @vectorized przyjmują pojedynczy punkt (dim,)
+# albo całą populację (n, dim) - liczą po ostatniej osi.
+# Z zainstalowaną numbą rastrigin_function i heavy_monte_carlo liczą
+# kernele z jitKernels (te same wartości co wersje NumPy).
+
+# Ile próbek heavy_monte_carlo losuje naraz (pamięć: CHUNK x dim liczb)
+MONTE_CARLO_CHUNK = 10_000
+
+
+@vectorized
 def sphere_function(x: np.ndarray) -> float:
-    return np.sum(x**2)
+    return np.sum(x**2, axis=-1)
 
 
+@vectorized
 def rastrigin_function(x: np.ndarray, A: float = 10) -> float:
 
-    n = len(x)
-    return A * n + np.sum(x**2 - A * np.cos(2 * np.pi * x))
+    if NUMBA_AVAILABLE:
+        x = np.asarray(x, dtype=float)
+        values = rastrigin(x.reshape(-1, x.shape[-1]), float(A))
+        return values.reshape(x.shape[:-1])[()]
+    n = x.shape[-1]
+    return A * n + np.sum(x**2 - A * np.cos(2 * np.pi * x), axis=-1)
 
 
+@vectorized
 def rosenbrock_function(x: np.ndarray) -> float:
 
-    return np.sum(100.0 * (x[1:] - x[:-1]**2)**2 + (1 - x[:-1])**2)
+    return np.sum(100.0 * (x[..., 1:] - x[..., :-1]**2)**2 + (1 - x[..., :-1])**2, axis=-1)
 
 
 def heavy_monte_carlo(x: np.ndarray, samples: int = 200_000) -> float:
@@ -21,8 +39,18 @@ def heavy_monte_carlo(x: np.ndarray, samples: int = 200_000) -> float:
     Ciężka funkcja celu: Monte Carlo integration.
     Dla każdego punktu x wykonuje dużą liczbę losowych próbek.
     """
+    x = np.ravel(x).astype(float)
     total = 0.0
-    for _ in range(samples):
-        noise = np.random.normal(0, 1, size=x.shape)
-        total += np.sum((x + noise)**2)
+    # szum losowany blokami próbek - ten sam strumień co `samples` losowań
+    # po x.shape, ale bez pętli Pythona po każdej próbce
+    for start in range(0, samples, MONTE_CARLO_CHUNK):
+        noise = np.random.normal(0, 1, size=(min(MONTE_CARLO_CHUNK, samples - start), x.size))
+        if NUMBA_AVAILABLE:
+            total += monte_carlo_sum(x, noise)
+        else:
+            total += np.sum((x + noise)**2)
     return total / samples
+
+
+# Tylko pojedyncze punkty - bez próby wykrywania wersji wektorowej
+heavy_monte_carlo.vectorized = False
@@ -0,0 +1,163 @@
+import asyncio
+import functools
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.countingObjective import CountingObjective
+from algorithms.functionCompiler import compile_function
+from algorithms.jitKernels import resolve_backend
+from algorithms.memoizedObjective import MemoizedObjective
+from algorithms.runners import STEPPERS, repetition_rngs
+from algorithms.stepping import run_steps_until
+
+# ============================================================
+# STRONA PROCESU ROBOCZEGO
+# ============================================================
+
+# Co ile sekund proces roboczy sprawdza stop_event w trakcie uruchomienia
+STOP_CHECK_INTERVAL = 0.05
+
+# Skompilowane funkcje celu (osobny cache w każdym procesie)
+_functions_cache = {}
+
+
+def _get_function(code, bounds, memoize_bytes=None, backend="numpy"):
+    func = _functions_cache.get((code, backend))
+    if func is None:
+        func = compile_function(code, bounds, backend=backend)
+        if memoize_bytes:
+            func = MemoizedObjective(func, memoize_bytes)
+        _functions_cache[(code, backend)] = func
+    return func
+
+
+def evaluate_task(stop_event, algorithm, params, code, bounds, dim, seed, repetitions, trace=False,
+                  max_frames=None, instrument=False, memoize_bytes=None):
+    """
+    Wykonuje powtórzenia `repetitions` algorytmu dla jednej funkcji celu
+    jako jedną symulację wielu replik (każda z generatorem (seed, r)).
+    Zwraca listę najlepszych wartości (z trace=True: krotkę
+    (best_values, convergence, positions)) albo None, jeśli ustawiono
+    stop_event (sprawdzany między iteracjami, co STOP_CHECK_INTERVAL s).
+
+    Z instrument=True wynik idzie w słowniku razem z liczbą ewaluacji
+    funkcji celu i czasami zadania: {"output", "evaluations",
+    "objective_s", "run_s"} (patrz MetaheuristicTuner._task_outputs).
+    """
+    if stop_event.is_set():
+        return None
+
+    # backend "numba" bez numby na tej maszynie - liczymy w NumPy
+    backend = resolve_backend(params.get("backend"))
+    if backend != params.get("backend", "numpy"):
+        params = dict(params, backend=backend)
+
+    func = _get_function(code, bounds, memoize_bytes, backend)
+    if instrument:
+        func = CountingObjective(func)
+    start = time.perf_counter()
+    steps = STEPPERS[algorithm](params, func, bounds, dim, repetition_rngs(seed, repetitions),
+                                trace, max_frames)
+    result = run_steps_until(steps, stop_event.is_set, STOP_CHECK_INTERVAL)
+    if result is None:
+        return None
+    if not trace:
+        result = list(result)
+    if instrument:
+        return {"output": result, "evaluations": func.calls, "objective_s": func.seconds,
+                "run_s": time.perf_counter() - start}
+    return result
+
+
+# ============================================================
+# STRONA SERWERA
+# ============================================================
+
+class ParallelExecutor:
+    """
+    Wysyła uruchomienia algorytmów do ProcessPoolExecutor, żeby nie
+    blokować pętli zdarzeń. Zadanie to grupa powtórzeń; pauza/stop
+    idą do procesów przez Event z multiprocessing.Manager, a postęp to
+    liczba zakończonych zadań.
+
+    memoize_bytes: jeśli podane, każdy proces trzyma funkcje celu
+    w MemoizedObjective o takim budżecie pamięci.
+    """
+
+    def __init__(self, max_workers=None, poll_interval=0.05, memoize_bytes=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self.poll_interval = poll_interval
+        self.memoize_bytes = memoize_bytes
+        self._pool = None
+        self._sync = None
+
+    @property
+    def capacity(self):
+        """Ile zadań pula liczy naraz."""
+        return self.max_workers
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            ctx = mp.get_context("spawn")
+            self._sync = ctx.Manager()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+        return self._pool
+
+    async def run(self, tasks, should_abort_fn, progress_fn=None, partial=False, max_in_flight=None):
+        """
+        tasks: lista krotek (algorithm, params, code, bounds, dim, seed, repetitions[, trace, max_frames,
+               instrument]).
+        Zwraca listę wyników w kolejności zadań albo None,
+        jeśli should_abort_fn() zgłosi pauzę/stop. Z partial=True po
+        pauzie/stopie zwraca listę z None w miejscu niedokończonych zadań.
+
+        max_in_flight: najwyżej tyle zadań naraz w puli (limit procesów na
+        zlecenie, gdy kilka zleceń dzieli jedną pulę); None - bez limitu.
+        """
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+
+        stop_event = self._sync.Event()
+        limit = max_in_flight or len(tasks)
+
+        futures = [None] * len(tasks)
+        pending = set()
+        submitted = 0
+        while True:
+            while submitted < len(tasks) and len(pending) < limit:
+                futures[submitted] = loop.run_in_executor(
+                    pool, functools.partial(evaluate_task, stop_event, *tasks[submitted],
+                                            memoize_bytes=self.memoize_bytes))
+                pending.add(futures[submitted])
+                submitted += 1
+            if not pending:
+                break
+
+            _, pending = await asyncio.wait(pending, timeout=self.poll_interval)
+
+            if progress_fn is not None:
+                await progress_fn(submitted - len(pending), len(futures))
+
+            if await should_abort_fn():
+                stop_event.set()
+                for f in pending:
+                    f.cancel()
+                if not partial:
+                    return None
+                # zadania przerwane w trakcie też zwracają None (stop_event)
+                return [f.result() if f is not None and f.done() and not f.cancelled() else None
+                        for f in futures]
+
+        results = [f.result() for f in futures]
+        if not partial and any(r is None for r in results):
+            return None
+        return results
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._sync.shutdown()
+            self._pool = None
+            self._sync = None
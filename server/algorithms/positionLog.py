@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+
+
+class PositionLog:
+    """
+    Log pozycji agentów w prealokowanym buforze float32.
+
+    Krok 0 to populacja początkowa, krok t + 1 - stan po iteracji t.
+    Zapisywany jest co stride-ty krok i zawsze ostatni krok przebiegu.
+    Z max_frames stride rośnie (nie mniej niż podany) tak, żeby klatki
+    rozłożone na cały przebieg - od populacji początkowej do stanu
+    końcowego - zmieściły się w max_frames. enabled=False - nic nie jest
+    alokowane ani zapisywane (uruchomienia bez wykresów).
+    """
+
+    def __init__(self, shape, n_steps, max_frames=None, stride=None, enabled=True):
+        stride = 1 if stride is None else stride
+        if stride < 1:
+            raise ValueError("save_every musi być >= 1")
+
+        last_step = n_steps - 1
+        if max_frames == 1:
+            # tylko populacja początkowa
+            stride, last_step = max(stride, n_steps), 0
+        elif max_frames:
+            # krok 0 i ostatni krok plus co stride-ty pomiędzy
+            stride = max(stride, math.ceil(last_step / (max_frames - 1)))
+
+        capacity = 0
+        if enabled:
+            capacity = math.ceil(n_steps / stride) + (1 if last_step % stride else 0)
+
+        self.stride = stride
+        self.last_step = last_step
+        self.capacity = capacity
+        self.count = 0
+        self._frames = np.empty((capacity, *shape), dtype=np.float32)
+        self._steps = np.empty(capacity, dtype=np.int64)
+
+    def record(self, step, positions):
+        if self.capacity == 0 or (step % self.stride and step != self.last_step):
+            return
+        self._frames[self.count] = positions
+        self._steps[self.count] = step
+        self.count += 1
+
+    def frames(self):
+        """Zapisane klatki w kolejności kroków: tablica (klatki, *shape)."""
+        return self._frames[:self.count]
+
+    def steps(self):
+        """Numery kroków odpowiadające klatkom."""
+        return self._steps[:self.count]
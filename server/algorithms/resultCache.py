@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Zmieniamy przy każdej zmianie silników, która zmienia wyniki uruchomień -
+# stare wpisy przestają wtedy pasować do kluczy.
+ENGINE_VERSION = 5
+
+
+class ResultCache:
+    """
+    Trwały cache wyników evaluate_params (SQLite). Klucz opisuje całe
+    deterministyczne uruchomienie: algorytm, parametry, hash kodu funkcji,
+    granice, wymiar, R i ziarno. Wartość to sigma dla jednej funkcji.
+    Po przekroczeniu max_entries usuwane są najdawniej używane wpisy.
+
+    Odczyt nic nie zapisuje: czas użycia trafienia czeka w pamięci
+    i idzie do bazy razem z najbliższym put/close (albo po flush_every
+    trafieniach), jedną transakcją.
+    """
+
+    def __init__(self, path, max_entries=100_000, flush_every=1000):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.flush_every = flush_every
+        # klucz -> czas ostatniego trafienia, jeszcze niezapisany
+        self._touched = {}
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(algorithm, params, code, bounds, dim, R, seed):
+        payload = json.dumps({
+            "engine": ENGINE_VERSION,
+            "algorithm": algorithm,
+            "params": params,
+            "code": hashlib.sha256(code.encode("utf-8")).hexdigest(),
+            "bounds": [float(b) for b in bounds],
+            "dim": int(dim),
+            "R": int(R),
+            "seed": seed,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= self.flush_every:
+            self.flush()
+        return row[0]
+
+    def put(self, key, value):
+        self._touched.pop(key, None)
+        self._write_touched()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+            (key, float(value), time.time())
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _write_touched(self):
+        if self._touched:
+            self.conn.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                  [(used, key) for key, used in self._touched.items()])
+            self._touched.clear()
+
+    def flush(self):
+        """Zapisuje zaległe czasy użycia trafień."""
+        if self._touched:
+            self._write_touched()
+            self.conn.commit()
+
+    def _evict(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count <= self.max_entries:
+            return
+        # Usuwamy z zapasem (10%), żeby nie sprzątać przy każdym zapisie
+        n_remove = count - int(self.max_entries * 0.9)
+        self.conn.execute(
+            "DELETE FROM results WHERE key IN ("
+            " SELECT key FROM results ORDER BY last_used ASC LIMIT ?)",
+            (n_remove,)
+        )
+
+    def clear(self):
+        self._touched.clear()
+        self.conn.execute("DELETE FROM results")
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,165 @@
+import numpy as np
+
+from algorithms.BatAlgorithm import bat_algorithm_steps
+from algorithms.ArtificialBeeColony import artificial_bee_colony_steps
+from algorithms.GeneticAlgorithm import genetic_algorithm_steps
+from algorithms.stepping import run_steps
+from algorithms.evaluationBudget import EvaluationBudget
+
+# ============================================================
+# GENERATORY LOSOWE POWTÓRZEŃ
+# ============================================================
+
+def repetition_rng(seed, repetition):
+    """
+    Generator dla powtórzenia `repetition`. Równoważny
+    SeedSequence(seed).spawn(R)[repetition], ale liczony niezależnie,
+    więc wynik nie zależy od kolejności ani liczby procesów.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(repetition,)))
+
+
+def repetition_rngs(seed, repetitions):
+    return [repetition_rng(seed, r) for r in repetitions]
+
+
+# ============================================================
+# WRAPPERY ALGORYTMÓW
+# (funkcje modułowe, żeby dało się je wysłać do procesów roboczych)
+# Każdy wrapper prowadzi tyle replik, ile dostał generatorów,
+# i zwraca tablicę najlepszych wartości - po jednej na replikę.
+# Wersje steps_* są generatorami (yield po każdej iteracji), które
+# wywołujący może prowadzić kawałkami - patrz algorithms.stepping.
+# Z trace=True zwracają (best_values, convergence, positions, evaluations, position_steps)
+# - patrz _result; bez trace silniki nie logują pozycji wcale, z trace -
+# co najwyżej max_frames klatek na replikę.
+# params["max_evals"] (opcjonalny) to budżet ewaluacji funkcji celu na
+# replikę - silnik kończy dokładnie na nim (patrz EvaluationBudget);
+# params["backend"] (opcjonalny) wybiera kernele silnika - patrz jitKernels.
+# ============================================================
+
+def _result(best_values, convergence_curve, positions_log, position_steps, budget, trace):
+    if not trace:
+        return best_values
+    # positions: (R, klatki, n, dim) albo None, gdy silnik nie logował pozycji
+    positions = np.swapaxes(positions_log, 0, 1) if len(positions_log) else None
+    # evaluations: (R,) - ile razy replika wywołała funkcję celu;
+    # position_steps: (klatki,) - numer iteracji klatki (wspólny dla replik)
+    return best_values, convergence_curve, positions, budget.used.copy(), position_steps
+
+
+def steps_BAT(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    budget = EvaluationBudget(len(rngs), params.get("max_evals"))
+    _, best_values, convergence_curve, positions_log, position_steps = yield from bat_algorithm_steps(
+        fn=func,
+        n_bats=params["n_bats"],
+        bounds=bounds,
+        max_iter=params["max_iter"],
+        dims=dim,
+        alpha=params["alpha"],
+        gamma=params["gamma"],
+        f_bounds=(params["f_bounds_min"], params["f_bounds_max"]),
+        rngs=rngs,
+        max_frames=max_frames,
+        log_positions=None if trace else False,
+        budget=budget,
+        backend=params.get("backend", "numpy")
+    )
+    return _result(best_values, convergence_curve, positions_log, position_steps, budget, trace)
+
+
+def steps_ABC(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    budget = EvaluationBudget(len(rngs), params.get("max_evals"))
+    _, best_values, convergence_curve, positions_log, position_steps = yield from artificial_bee_colony_steps(
+        n_bees=params["n_bees"],
+        dim=dim,
+        bounds=bounds,
+        max_iter=params["max_iter"],
+        objective_func=func,
+        rngs=rngs,
+        max_frames=max_frames,
+        log_positions=None if trace else False,
+        budget=budget,
+        backend=params.get("backend", "numpy")
+    )
+    return _result(best_values, convergence_curve, positions_log, position_steps, budget, trace)
+
+
+def steps_GA(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    budget = EvaluationBudget(len(rngs), params.get("max_evals"))
+    # Kategorie GA przychodzą z vector_to_params() razem z resztą parametrów
+    _, best_values, convergence_curve, positions_log, position_steps = yield from genetic_algorithm_steps(
+        dim=dim,
+        pop_size=params["pop_size"],
+        objective_func=func,
+        bounds=bounds,
+        max_generations=params["max_generations"],
+        crossover_rate=params["crossover_rate"],
+        mutation_rate=params["mutation_rate"],
+        mutation_scale=params["mutation_scale"],
+        elitism_rate=params["elitism_rate"],
+        tournament_size=params["tournament_size"],
+        crossover_type=params.get("crossover_type", "arithmetic"),
+        mutation_type=params.get("mutation_type", "uniform"),
+        rngs=rngs,
+        max_frames=max_frames,
+        log_positions=None if trace else False,
+        budget=budget,
+        backend=params.get("backend", "numpy")
+    )
+    return _result(best_values, convergence_curve, positions_log, position_steps, budget, trace)
+
+
+def run_BAT(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    return run_steps(steps_BAT(params, func, bounds, dim, rngs, trace, max_frames))
+
+
+def run_ABC(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    return run_steps(steps_ABC(params, func, bounds, dim, rngs, trace, max_frames))
+
+
+def run_GA(params, func, bounds, dim, rngs, trace=False, max_frames=None):
+    return run_steps(steps_GA(params, func, bounds, dim, rngs, trace, max_frames))
+
+
+RUNNERS = {
+    "Bat": run_BAT,
+    "Genetic": run_GA,
+    "ABC": run_ABC
+}
+
+STEPPERS = {
+    "Bat": steps_BAT,
+    "Genetic": steps_GA,
+    "ABC": steps_ABC
+}
+
+
+# ============================================================
+# ŚLADY URUCHOMIEŃ (krzywa zbieżności i pozycje do wykresów)
+# ============================================================
+
+def combine_traces(outputs):
+    """
+    Skleja wyniki grup powtórzeń (best_values, convergence, positions,
+    evaluations, position_steps) wzdłuż osi R; numery iteracji klatek są
+    wspólne dla wszystkich grup.
+    """
+    best_values = np.concatenate([o[0] for o in outputs])
+    convergence = np.concatenate([o[1] for o in outputs])
+    positions = None if outputs[0][2] is None else np.concatenate([o[2] for o in outputs])
+    evaluations = np.concatenate([o[3] for o in outputs])
+    return best_values, convergence, positions, evaluations, outputs[0][4]
+
+
+def median_trace(best_values, convergence, positions, evaluations, position_steps):
+    """Ślad uruchomienia z medianą najlepszych wartości (dolna mediana - zawsze faktyczne uruchomienie)."""
+    i = np.argsort(best_values, kind="stable")[(len(best_values) - 1) // 2]
+    return {
+        "best_value": float(best_values[i]),
+        "convergence": convergence[i],
+        "positions_log": [] if positions is None else list(positions[i]),
+        "position_steps": [int(step) for step in position_steps],
+        "evaluations": int(evaluations[i]),
+        "mean_evaluations": float(np.mean(evaluations)),
+    }
@@ -0,0 +1,22 @@
+import numpy as np
+
+# ============================================================
+# TESTY STATYSTYCZNE (bez scipy)
+# Porównanie rozkładów wyników silników: backendy (benchmark.py
+# --check-backends) i wersje populacyjne kontra referencyjne (tests/).
+# ============================================================
+
+
+def ks_2samp(a, b):
+    """Dwupróbkowy test Kołmogorowa-Smirnowa: (statystyka D, asymptotyczne p)."""
+    a, b = np.sort(a), np.sort(b)
+    values = np.concatenate([a, b])
+    d = float(np.max(np.abs(np.searchsorted(a, values, side="right") / len(a)
+                            - np.searchsorted(b, values, side="right") / len(b))))
+    n = len(a) * len(b) / (len(a) + len(b))
+    lam = (np.sqrt(n) + 0.12 + 0.11 / np.sqrt(n)) * d
+    if lam < 0.2:
+        return d, 1.0
+    k = np.arange(1, 101)
+    p = 2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return d, float(np.clip(p, 0.0, 1.0))
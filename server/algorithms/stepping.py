@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+# ============================================================
+# SILNIKI KROKOWE
+# Silnik *_steps to generator: yield po każdej iteracji, a wynik
+# zwraca przez return (StopIteration.value). Dzięki temu wywołujący
+# może go prowadzić kawałkami i sprawdzać pauzę/stop między iteracjami.
+# ============================================================
+
+def run_steps(steps):
+    """Prowadzi silnik do końca bez przerw i zwraca jego wynik."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def run_steps_until(steps, should_stop, check_interval=0.05):
+    """
+    Prowadzi silnik do końca, co check_interval sekund pytając
+    should_stop(). Zwraca wynik albo None, jeśli przerwano.
+    """
+    deadline = time.perf_counter() + check_interval
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+        if time.perf_counter() >= deadline:
+            if should_stop():
+                steps.close()
+                return None
+            deadline = time.perf_counter() + check_interval
+
+
+async def drive_steps(steps, should_abort_fn, time_slice=0.01):
+    """
+    Prowadzi silnik na pętli zdarzeń: iteracje liczone są przez
+    time_slice sekund, potem pętla dostaje sterowanie i sprawdzamy
+    should_abort_fn(). Zwraca wynik albo None po pauzie/stopie.
+    """
+    while True:
+        deadline = time.perf_counter() + time_slice
+        try:
+            while True:
+                next(steps)
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration as done:
+            return done.value
+
+        await asyncio.sleep(0)
+        if await should_abort_fn():
+            steps.close()
+            return None
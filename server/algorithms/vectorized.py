@@ -0,0 +1,87 @@
+import numpy as np
+
+# ============================================================
+# KONTRAKT WEKTOROWY FUNKCJI CELU
+#   f(X) -> ndarray (n,)   dla X o kształcie (n, dim)
+# ============================================================
+
+def vectorized(func):
+    """Deklaruje, że func liczy całą macierz (n, dim) jednym wywołaniem."""
+    func.vectorized = True
+    return func
+
+
+def _mark(func, value):
+    try:
+        func.vectorized = value
+    except AttributeError:
+        # np. metody związane - wtedy wykrywamy przy każdej populacji
+        pass
+
+
+def _batched(func, X):
+    with np.errstate(all="ignore"):
+        values = np.array(func(X), dtype=float)
+    return values.reshape(X.shape[0])
+
+
+# Tyle wierszy populacji liczy się podwójnie (wsadowo i wiersz po wierszu)
+# przy wykrywaniu - raz na funkcję bez znacznika `vectorized`
+PROBE_ROWS = 2
+
+
+def needs_probe(func, n):
+    """Czy ocena n punktów przez evaluate_population uruchomi wykrywanie."""
+    return getattr(func, "vectorized", None) is None and n >= PROBE_ROWS
+
+
+def detect_vectorized(func, X):
+    """
+    Sprawdza na pierwszych PROBE_ROWS wierszach X, czy func(X) daje to samo
+    co wywołania wiersz po wierszu; resztę X liczy już wybraną ścieżką.
+    Zwraca (czy_wektorowa, wartości). Koszt ponad zwykłą ocenę X to
+    PROBE_ROWS punktów.
+    """
+    probe = X[:PROBE_ROWS]
+    rowwise = np.array([func(x) for x in probe], dtype=float)
+    try:
+        batched = _batched(func, probe)
+    except Exception:
+        batched = None
+    is_vectorized = batched is not None and np.allclose(batched, rowwise, equal_nan=True)
+    if X.shape[0] == probe.shape[0]:
+        return is_vectorized, batched if is_vectorized else rowwise
+    if is_vectorized:
+        # od teraz zawsze ścieżka wsadowa - także dla reszty tej populacji
+        return True, np.concatenate([batched, _batched(func, X[PROBE_ROWS:])])
+    return False, np.concatenate([rowwise, [func(x) for x in X[PROBE_ROWS:]]])
+
+
+def evaluate_population(func, X):
+    """
+    Ocenia populację X (n, dim). Funkcje wektorowe (zadeklarowane
+    dekoratorem, oznaczone przez compile_function albo wykryte przy
+    pierwszej populacji) liczą całość jednym wywołaniem, pozostałe -
+    wiersz po wierszu.
+    """
+    mode = getattr(func, "vectorized", None)
+    if mode:
+        return _batched(func, X)
+    if mode is None and X.shape[0] >= PROBE_ROWS:
+        is_vectorized, values = detect_vectorized(func, X)
+        _mark(func, is_vectorized)
+        return values
+    return np.array([func(x) for x in X], dtype=float)
+
+
+# ============================================================
+# LOSOWANIE DLA WIELU REPLIK
+# ============================================================
+
+def per_replica(rngs, draw):
+    """
+    Wykonuje to samo losowanie draw(g) na generatorze każdej repliki
+    i składa wyniki w tablicę (R, ...). Replika r zużywa swój strumień
+    dokładnie tak jak pojedyncze uruchomienie z generatorem rngs[r].
+    """
+    return np.stack([draw(g) for g in rngs])
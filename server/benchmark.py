@@ -0,0 +1,358 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.MetaheuristicTuner import MetaheuristicTuner
+from algorithms.countingObjective import CountingObjective
+from algorithms.functionCompiler import compile_function
+from algorithms.jitKernels import BACKENDS, NUMBA_AVAILABLE, OBJECTIVE_KERNELS, resolve_backend
+from algorithms.runners import RUNNERS, repetition_rngs
+from algorithms.statisticalTests import ks_2samp
+from algorithms.vectorized import evaluate_population
+
+# ============================================================
+# BENCHMARK SILNIKÓW, FUNKCJI CELU I TUNERA
+# Przegląd algorytm x funkcja x wymiar x populacja; dla każdego
+# punktu: ewaluacje/s, narzut silnika na iterację, szczyt pamięci.
+# Wynik w JSON można porównać z zapisanym baseline - spadek powyżej
+# progu kończy program kodem 1.
+#
+#   python benchmark.py --output bench.json
+#   python benchmark.py --baseline bench.json --threshold 0.2
+#   python benchmark.py --backend numba
+#   python benchmark.py --check-backends    (równoważność numpy/numba)
+# ============================================================
+
+KINDS = ("objective", "engine", "evaluate_params")
+SEED = 0
+
+# Tyle punktów liczymy w pomiarze samej funkcji celu (stabilniejszy czas)
+OBJECTIVE_POINTS = 20_000
+
+
+def engine_params(algorithm, pop, iters, backend="numpy"):
+    """Stałe parametry silnika; zmienia się tylko populacja, liczba iteracji i backend."""
+    if algorithm == "Bat":
+        params = {"n_bats": pop, "max_iter": iters, "alpha": 0.9, "gamma": 0.9,
+                  "f_bounds_min": 0.0, "f_bounds_max": 2.0}
+    elif algorithm == "Genetic":
+        params = {"pop_size": pop, "max_generations": iters, "crossover_rate": 0.8, "mutation_rate": 0.1,
+                  "mutation_scale": 0.1, "elitism_rate": 0.1, "tournament_size": 3,
+                  "crossover_type": "arithmetic", "mutation_type": "gaussian"}
+    elif algorithm == "ABC":
+        params = {"n_bees": pop, "max_iter": iters}
+    else:
+        raise ValueError(f"Nieznany algorytm: {algorithm}")
+    if backend != "numpy":
+        params["backend"] = backend
+    return params
+
+
+def load_functions(names=None, path="./data/functions.json", backend="numpy"):
+    with open(path) as f:
+        functions = json.load(f)
+    if names:
+        functions = [fn for fn in functions if fn["name"] in names]
+    return [{"name": fn["name"], "bounds": fn["bounds"], "source": fn["code"],
+             "code": compile_function(fn["code"], fn["bounds"], backend=backend)} for fn in functions]
+
+
+# Pomiary punktu trwają łącznie co najmniej tyle sekund (krótkie przebiegi są szumem)
+MIN_TIME = 0.2
+
+
+def measure(run, repeat, memory):
+    """
+    Uruchamia run() co najmniej repeat razy (i co najmniej MIN_TIME
+    sekund łącznie) i zwraca (czas najszybszego przebiegu, jego wynik,
+    szczyt pamięci). Pamięć mierzy osobny przebieg pod tracemalloc,
+    żeby nie zawyżał czasów.
+    """
+    best = None
+    runs = 0
+    total = 0.0
+    while runs < repeat or total < MIN_TIME:
+        start = time.perf_counter()
+        out = run()
+        wall = time.perf_counter() - start
+        runs += 1
+        total += wall
+        if best is None or wall < best[0]:
+            best = (wall, out)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best[0], best[1], peak
+
+
+def bench_objective(fmeta, dim, pop, repeat, memory):
+    rng = np.random.default_rng(SEED)
+    X = rng.uniform(fmeta["bounds"][0], fmeta["bounds"][1], (pop, dim))
+    loops = max(1, OBJECTIVE_POINTS // pop)
+
+    def run():
+        for _ in range(loops):
+            evaluate_population(fmeta["code"], X)
+
+    wall, _, peak = measure(run, repeat, memory)
+    evals = loops * pop
+    return {"evals": evals, "wall_s": wall, "evals_per_s": evals / wall, "peak_mem_bytes": peak}
+
+
+def _engine_result(wall, calls, objective_s, iters, peak):
+    return {
+        "evals": calls,
+        "wall_s": wall,
+        "evals_per_s": calls / wall,
+        "objective_s": objective_s,
+        # czas silnika poza funkcją celu, na jedną iterację (wszystkich replik)
+        "overhead_per_iter_s": max(0.0, wall - objective_s) / iters,
+        "peak_mem_bytes": peak,
+    }
+
+
+def bench_engine(algorithm, fmeta, dim, pop, iters, R, repeat, memory, backend="numpy"):
+    params = engine_params(algorithm, pop, iters, backend)
+    counter = CountingObjective(fmeta["code"])
+
+    def run():
+        counter.reset()
+        RUNNERS[algorithm](params, counter, fmeta["bounds"], dim, repetition_rngs(SEED, range(R)))
+        return counter.calls, counter.seconds
+
+    wall, (calls, objective_s), peak = measure(run, repeat, memory)
+    return _engine_result(wall, calls, objective_s, iters, peak)
+
+
+def bench_evaluate_params(algorithm, fmeta, dim, pop, iters, R, repeat, memory, folder, backend="numpy"):
+    async def progress(progress, type):
+        pass
+
+    async def never():
+        return False
+
+    # jak na serwerze w trybie "inline", ale bez trwałego cache sigm
+    tuner = MetaheuristicTuner(progress, never, never, cache_path=None, folder=folder, backend=backend)
+    params = engine_params(algorithm, pop, iters, backend)
+    counter = CountingObjective(fmeta["code"])
+    fmeta = dict(fmeta, code=counter)
+
+    def run():
+        counter.reset()
+        asyncio.run(tuner.evaluate_params(params, algorithm, [fmeta], dim, R))
+        return counter.calls, counter.seconds
+
+    wall, (calls, objective_s), peak = measure(run, repeat, memory)
+    tuner.shutdown()
+    return _engine_result(wall, calls, objective_s, iters, peak)
+
+
+def run_suite(args):
+    # bez numby "numba" liczy się jak "numpy" - jak na serwerze
+    backend = resolve_backend(args.backend)
+    functions = load_functions(args.functions, backend=backend)
+    results = []
+
+    def record(kind, key, **metrics):
+        entry = {"kind": kind, "key": key, **metrics}
+        results.append(entry)
+        print(format_row(entry), flush=True)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for fmeta in functions:
+            for dim in args.dims:
+                for pop in args.pops:
+                    if "objective" in args.kinds:
+                        record("objective", f"objective/{fmeta['name']}/d{dim}/p{pop}",
+                               **bench_objective(fmeta, dim, pop, args.repeat, args.memory))
+                    for algorithm in args.algorithms:
+                        point = f"{algorithm}/{fmeta['name']}/d{dim}/p{pop}"
+                        if "engine" in args.kinds:
+                            record("engine", f"engine/{point}",
+                                   **bench_engine(algorithm, fmeta, dim, pop, args.iters, args.repetitions,
+                                                  args.repeat, args.memory, backend))
+                        if "evaluate_params" in args.kinds:
+                            record("evaluate_params", f"evaluate_params/{point}",
+                                   **bench_evaluate_params(algorithm, fmeta, dim, pop, args.iters, args.repetitions,
+                                                           args.repeat, args.memory, folder, backend))
+    return results
+
+
+# ============================================================
+# RÓWNOWAŻNOŚĆ BACKENDÓW
+# Te same generatory w obu backendach; różnice mogą wynikać tylko
+# z kolejności działań zmiennoprzecinkowych i remisów w turniejach GA,
+# więc porównujemy rozkłady najlepszych wartości (test KS).
+# ============================================================
+
+def check_objectives(functions, dims):
+    """Kernele wbudowanych funkcji celu kontra wersja NumPy na losowych punktach."""
+    failures = []
+    rng = np.random.default_rng(SEED)
+    for fmeta in functions:
+        kernel = OBJECTIVE_KERNELS.get(compile_function(fmeta["source"], vectorize=False).__name__)
+        if kernel is None:
+            continue
+        for dim in dims:
+            X = rng.uniform(fmeta["bounds"][0], fmeta["bounds"][1], (256, dim))
+            expected = evaluate_population(fmeta["code"], X)
+            got = kernel(X)
+            ok = np.allclose(got, expected, rtol=1e-9, atol=1e-9)
+            key = f"objective/{fmeta['name']}/d{dim}"
+            print(f"{key:<44} max |różnica| {np.max(np.abs(got - expected)):.3g}{'' if ok else '   RÓŻNE'}")
+            if not ok:
+                failures.append(key)
+    return failures
+
+
+def check_backends(args):
+    """
+    Każdy silnik x funkcja x wymiar x populacja liczony w obu backendach
+    z tymi samymi generatorami. Bez numby kernele wykonuje interpreter
+    (wolno, ale sprawdza ich logikę). Zwraca listę niezgodności.
+    """
+    if not NUMBA_AVAILABLE:
+        print("Numba nie jest zainstalowana - kernele liczone jako zwykły Python (sprawdzamy tylko poprawność)")
+    functions = load_functions(args.functions)
+    failures = check_objectives(functions, args.dims)
+
+    R = args.check_runs
+    for fmeta in functions:
+        for dim in args.dims:
+            for pop in args.pops:
+                for algorithm in args.algorithms:
+                    results = [
+                        RUNNERS[algorithm](engine_params(algorithm, pop, args.iters, backend), fmeta["code"],
+                                           fmeta["bounds"], dim, repetition_rngs(SEED, range(R)))
+                        for backend in BACKENDS
+                    ]
+                    d, p = ks_2samp(*results)
+                    identical = float(np.mean(results[0] == results[1]))
+                    key = f"engine/{algorithm}/{fmeta['name']}/d{dim}/p{pop}"
+                    print(f"{key:<44} identyczne {identical:>6.1%}  KS D={d:.3f} p={p:.3f}"
+                          f"  średnie {np.mean(results[0]):.4g} / {np.mean(results[1]):.4g}")
+                    if p < args.alpha:
+                        failures.append(f"{key}: KS p={p:.4f}")
+    return failures
+
+
+# ============================================================
+# RAPORT I PORÓWNANIE Z BASELINE
+# ============================================================
+
+def format_row(entry, ratio=None):
+    row = f"{entry['key']:<44} {entry['evals_per_s']:>14,.0f} ev/s"
+    if "overhead_per_iter_s" in entry:
+        row += f" {entry['overhead_per_iter_s'] * 1e6:>10.1f} us/it"
+    if entry.get("peak_mem_bytes") is not None:
+        row += f" {entry['peak_mem_bytes'] / 2**20:>8.2f} MB"
+    if ratio is not None:
+        row += f"   x{ratio:.2f}"
+    return row
+
+
+def compare(results, baseline, threshold):
+    """
+    Porównuje z baseline po kluczach. Regresja: ewaluacje/s spadły
+    o więcej niż threshold albo szczyt pamięci wzrósł o więcej niż
+    threshold. Zwraca listę opisów regresji.
+    """
+    base = {entry["key"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = base.get(entry["key"])
+        if old is None:
+            continue
+        speed = entry["evals_per_s"] / old["evals_per_s"]
+        print(format_row(entry, speed))
+        if speed < 1 - threshold:
+            regressions.append(f"{entry['key']}: ewaluacje/s x{speed:.2f}")
+        if entry.get("peak_mem_bytes") and old.get("peak_mem_bytes"):
+            memory = entry["peak_mem_bytes"] / old["peak_mem_bytes"]
+            if memory > 1 + threshold:
+                regressions.append(f"{entry['key']}: pamięć x{memory:.2f}")
+
+    missing = set(base) - {entry["key"] for entry in results}
+    if missing:
+        print(f"({len(missing)} punktów baseline nie było w tym przebiegu)")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark silników, funkcji celu i evaluate_params")
+    parser.add_argument("--algorithms", nargs="+", default=list(RUNNERS), choices=list(RUNNERS))
+    parser.add_argument("--functions", nargs="+", default=None, help="nazwy z data/functions.json (domyślnie wszystkie)")
+    parser.add_argument("--dims", nargs="+", type=int, default=[2, 10])
+    parser.add_argument("--pops", nargs="+", type=int, default=[20, 50])
+    parser.add_argument("--iters", type=int, default=50, help="iteracje/generacje silnika")
+    parser.add_argument("--repetitions", type=int, default=5, help="repliki liczone razem (R)")
+    parser.add_argument("--repeat", type=int, default=3, help="pomiarów na punkt (liczy się najszybszy)")
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="bez pomiaru szczytu pamięci")
+    parser.add_argument("--output", help="zapis wyników (JSON)")
+    parser.add_argument("--baseline", help="wyniki do porównania (JSON z --output)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="dopuszczalny względny spadek (0.2 = 20%%)")
+    parser.add_argument("--backend", default="numpy", choices=BACKENDS, help="backend silników i funkcji celu")
+    parser.add_argument("--check-backends", action="store_true",
+                        help="zamiast pomiarów: równoważność wyników backendów numpy i numba")
+    parser.add_argument("--check-runs", type=int, default=30, help="uruchomień na punkt w --check-backends")
+    parser.add_argument("--alpha", type=float, default=0.01, help="próg p testu KS w --check-backends")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.check_backends:
+        failures = check_backends(args)
+        if failures:
+            print("\nNIEZGODNOŚCI:")
+            for line in failures:
+                print("  " + line)
+            return 1
+        print("Backendy równoważne.")
+        return 0
+
+    results = run_suite(args)
+
+    report = {
+        "meta": {
+            "created": time.time(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Zapisano {len(results)} wyników do {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nPorównanie z {args.baseline} (próg {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nREGRESJE:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("Brak regresji.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
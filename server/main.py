@@ -1,9 +1,47 @@
+import os
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 import uvicorn
 from manager import SimulationManager
 
+# "inline"  - algorytmy liczone na pętli zdarzeń
+# "process" - algorytmy liczone w puli procesów (serwer pozostaje responsywny)
+# "distributed" - algorytmy liczone przez procesy robocze (python worker.py) po TCP
+EXECUTION_MODE = "process"
+MAX_WORKERS = None  # None = wszystkie rdzenie
+PARALLEL_POPULATION = True  # cała populacja CMA-ES oceniana naraz
+RACING = False  # successive halving: słabi kandydaci CMA odpadają po kilku powtórzeniach
+TELEMETRY_RATE = 4.0  # maks. liczba wiadomości telemetrii na sekundę
+FIGURES_MODE = "data"  # "data" - frontend rysuje z surowych danych, "image" - PNG/GIF z matplotlib
+MEMOIZE_BYTES = None  # np. 256 * 2**20 - cache wartości drogich funkcji celu (LRU)
+MAX_RUNNING_JOBS = 2  # tyle zleceń strojenia działa naraz, reszta czeka w kolejce
+JOB_WORKER_QUOTA = None  # maks. liczba procesów puli zajętych przez jedno zlecenie (None = bez limitu)
+FINISHED_JOB_TTL = 300  # po tylu sekundach zakończone zlecenie znika z listy zleceń
+# tu łączą się procesy robocze; "0.0.0.0" - także z innych maszyn, ale tylko w zaufanej
+# sieci: zadania i wyniki idą jako pickle (wykonanie kodu po drugiej stronie)
+WORKER_ADDRESS = ("127.0.0.1", 8765)
+# wspólny klucz serwera i procesów roboczych (obowiązkowy w trybie "distributed",
+# min. 16 znaków), np. python -c "import secrets; print(secrets.token_urlsafe(32))"
+WORKER_AUTHKEY = os.environ.get("TUNER_AUTHKEY", "")
+INSTRUMENT = False  # stopery i liczniki tunera od startu (komenda "stats" może je włączyć w locie)
+BACKEND = "numpy"  # "numba" - kernele JIT silników i wbudowanych funkcji (wymaga pip install numba)
+
 app = FastAPI()
-manager = SimulationManager()
+manager = SimulationManager(execution_mode=EXECUTION_MODE, max_workers=MAX_WORKERS,
+                            parallel_population=PARALLEL_POPULATION, memoize_bytes=MEMOIZE_BYTES,
+                            racing=RACING, telemetry_rate=TELEMETRY_RATE,
+                            figures_mode=FIGURES_MODE, max_running_jobs=MAX_RUNNING_JOBS,
+                            job_worker_quota=JOB_WORKER_QUOTA, finished_job_ttl=FINISHED_JOB_TTL,
+                            worker_address=WORKER_ADDRESS,
+                            worker_authkey=WORKER_AUTHKEY, instrument=INSTRUMENT,
+                            backend=BACKEND)
+
+@app.on_event("startup")
+async def startup():
+    await manager.startup()
+
+@app.on_event("shutdown")
+def shutdown():
+    manager.shutdown()
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
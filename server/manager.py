@@ -1,44 +1,111 @@
 import asyncio
+import copy
 import json
-import math
+import os
+import shutil
 from algorithms.MetaheuristicTuner import MetaheuristicTuner
+from algorithms.functionCompiler import compile_function
+from algorithms.parallelExecutor import ParallelExecutor
+from algorithms.distributedExecutor import DistributedExecutor
+from algorithms.atomicWrite import atomic_dump_json
+from telemetry import TelemetryChannel
+from scheduler import Job, JobScheduler
+
+# Opis zlecenia w jego folderze checkpointów
+JOB_FILE = "job.json"
 
 class SimulationManager:
-    def __init__(self):
+    """
+    Połączenia WebSocket i zlecenia strojenia. Każdy "start" tworzy
+    zlecenie (Job) z własnym ID, folderem checkpointów i strumieniem
+    postępu; zlecenia czekają w kolejce priorytetowej, a naraz działa
+    ich najwyżej max_running_jobs (w trybie "process" na wspólnej puli
+    procesów, w "distributed" - na wspólnych procesach roboczych; każde
+    z limitem job_worker_quota zadań naraz).
+    """
+
+    def __init__(self, execution_mode="inline", max_workers=None, parallel_population=False,
+                 memoize_bytes=None, racing=False, telemetry_rate=4.0,
+                 figures_mode="data", max_running_jobs=1, job_worker_quota=None,
+                 folder="checkpoints", worker_address=("127.0.0.1", 8765), worker_authkey=None,
+                 instrument=False, backend="numpy", finished_job_ttl=300):
         
         self.clients: list = []  # Lista aktywnych połączeń WebSocket
-        self.isPaused = False
-        self.isRunning = False
-        self._current_task = None
-        self.metaheuristic_tuner = None
-        self.filename = "checkpoint.json"
-        self.progressInfo = {
-            "alg_progress": 0,
-            "param_progress": 0
-        }
+        self._client_jobs = {}  # połączenie -> ID bieżącego zlecenia klienta
+        self.folder = folder
+        self.telemetry_rate = telemetry_rate
+        # zakończone zlecenie zostaje na liście jeszcze tyle sekund (stan, "stats"),
+        # potem znika ze schedulera; 0 - od razu
+        self.finished_job_ttl = finished_job_ttl
+        self.tuner_options = dict(execution_mode=execution_mode,
+                                  max_workers=max_workers,
+                                  parallel_population=parallel_population,
+                                  memoize_bytes=memoize_bytes,
+                                  racing=racing,
+                                  figures_mode=figures_mode,
+                                  worker_quota=job_worker_quota,
+                                  instrument=instrument,
+                                  backend=backend)
+
+        # Jedna pula procesów (albo jeden serwer procesów roboczych) dla wszystkich zleceń
+        self.executor = None
+        if execution_mode == "process":
+            self.executor = ParallelExecutor(max_workers, memoize_bytes=memoize_bytes)
+        elif execution_mode == "distributed":
+            host, port = worker_address
+            self.executor = DistributedExecutor(host, port, authkey=worker_authkey)
+        self.scheduler = JobScheduler(self._run_job, max_running=max_running_jobs)
 
         self._load_params()
+        self._restore_jobs()
+
+    def _make_tuner(self, job):
+        """Tuner zlecenia: postęp, pauza i stop dotyczą tylko tego zlecenia."""
+
+        # Telemetria w paczkach, najwyżej telemetry_rate wiadomości na sekundę
+        async def _telemetry_channel_send(type, message):
+                await self.send_job(job, type=type, message=message)
+
+        job.telemetry = TelemetryChannel(_telemetry_channel_send, max_rate=self.telemetry_rate)
+
+        async def _telemetry_send_fn(kind, data):
+                await job.telemetry.publish(kind, data)
 
         async def _progress_send_fn(progress, type):
-                self.progressInfo[type] = progress
-                await self.broadcast(type="progress", message = ({"type": type, "progress": progress}))
+                job.progressInfo[type] = progress
+                await self.send_job(job, type="progress", message = ({"type": type, "progress": progress}))
             
 
         async def _stop_check_fn():
-                if not self.isRunning:
-                    print("Stop detected")
-                return not self.isRunning
+                if not job.isRunning:
+                    print(f"Stop detected ({job.id})")
+                return not job.isRunning
             
         async def _pause_check_fn():
-                if self.isPaused:
-                    print("Pause detected")
-                return self.isPaused
+                if job.isPaused:
+                    print(f"Pause detected ({job.id})")
+                return job.isPaused
             
-        self.metaheuristic_tuner = MetaheuristicTuner( 
-                                                          progress_send_fn=_progress_send_fn,
-                                                          stop_check_fn=_stop_check_fn,
-                                                          pause_check_fn=_pause_check_fn)
+        return MetaheuristicTuner( 
+                                  progress_send_fn=_progress_send_fn,
+                                  stop_check_fn=_stop_check_fn,
+                                  pause_check_fn=_pause_check_fn,
+                                  telemetry_send_fn=_telemetry_send_fn,
+                                  folder=job.folder,
+                                  executor=self.executor,
+                                  **self.tuner_options)
+
+    async def startup(self):
+        # procesy robocze mogą się łączyć, zanim przyjdzie pierwsze zlecenie
+        if isinstance(self.executor, DistributedExecutor):
+            await self.executor.start()
 
+    def shutdown(self):
+        for job in self.scheduler.jobs.values():
+            if job.tuner is not None:
+                job.tuner.shutdown()
+        if self.executor is not None:
+            self.executor.shutdown()
 
     async def connect(self, ws):
         """Dodaje nowego klienta do listy i akceptuje połączenie."""
@@ -50,6 +117,10 @@ class SimulationManager:
         """Usuwa klienta z listy."""
         if ws in self.clients:
             self.clients.remove(ws)
+        self._client_jobs.pop(ws, None)
+        for job in self.scheduler.jobs.values():
+            if ws in job.subscribers:
+                job.subscribers.remove(ws)
         print(f"Klient odłączony. Aktywnych klientów: {len(self.clients)}")
         # Zatrzymaj symulację tylko jeśli nie ma żadnych klientów
      
@@ -75,23 +146,30 @@ class SimulationManager:
         for client in disconnected:
             self.disconnect(client)
 
+    async def send_job(self, job, type, message):
+        """Wysyła wiadomość zlecenia do jego subskrybentów (z polem job_id)."""
+        disconnected = []
+        for client in list(job.subscribers):
+            try:
+                await client.send_json({"type": type, "message": message, "job_id": job.id})
+            except Exception as e:
+                print(f"Błąd wysyłania do klienta: {e}")
+                disconnected.append(client)
+
+        for client in disconnected:
+            self.disconnect(client)
+
 
 
-    def string_to_function(self, code_string):
+    def string_to_function(self, code_string, bounds=None):
         """
         Zamienia string na obiekt funkcji i sprawdza błędy składni.
+        Typowe wzorce (sumy po x, math.*) są tłumaczone na NumPy,
+        żeby silniki mogły liczyć całą populację jednym wywołaniem.
         """
 
-        globals_dict = {"math": math}
-        locals_dict = {}
-
         try:
-            exec(code_string, globals_dict, locals_dict)
-            func = next((v for v in locals_dict.values() if callable(v)), None)
-            if func is None:
-                raise ValueError("W podanym kodzie nie znaleziono definicji funkcji (brak 'def').")
-                
-            return func
+            return compile_function(code_string, bounds, backend=self.tuner_options["backend"])
 
         except SyntaxError as e:
             print(f"BŁĄD SKŁADNI (SyntaxError): {e}")
@@ -117,7 +195,8 @@ class SimulationManager:
             shared_params_data = data["shared_params"].copy()
             for i in range(len(shared_params_data)):
                 if shared_params_data[i]["range"] == "value":
-                    shared_params_data[i]["value"] = 5
+                    # "default" w algorithms.json, np. 0 (bez limitu) dla "Max evaluations"
+                    shared_params_data[i]["value"] = shared_params_data[i].get("default", 5)
                 if shared_params_data[i]["range"] == "min-max":
                     shared_params_data[i]["max"] = 1
                     shared_params_data[i]["min"] = 0
@@ -130,8 +209,8 @@ class SimulationManager:
         self.functionsData = functionsData
         self.selected_function = functionsData[0]
 
-    async def _send_params(self, ws):
-        """Wysyła parametry do konkretnego klienta."""
+    async def _send_params(self, ws, job=None):
+        """Wysyła parametry (i stan bieżącego zlecenia klienta) do konkretnego klienta."""
         await self.send(
             ws,
             type="get_params",
@@ -139,9 +218,15 @@ class SimulationManager:
                 "algorithms": self.algorithmsData,
                 "shared_params": self.shared_params_data,
                 "functions_data": self.functionsData,
-                "isStarted": self.isRunning,
-                "isPaused": self.isPaused,
-                "progressInfo": self.progressInfo
+                "job_id": job.id if job else None,
+                "isStarted": job is not None and job.is_active,
+                "isPaused": job is not None and job.status == "paused",
+                "progressInfo": job.progressInfo if job else {
+                    "alg_progress": 0,
+                    "param_progress": 0,
+                    "run_progress": 0
+                },
+                "jobs": self._job_summaries()
             },
         )
 
@@ -150,74 +235,241 @@ class SimulationManager:
         self.shared_params_data = data.get("shared_params", self.shared_params_data)
         self.selected_function = data.get("selected_function", self.selected_function)  
 
+    # ============================================================
+    # ZLECENIA
+    # ============================================================
+
+    def _job_summaries(self):
+        return [dict(job.summary(), queue_position=self.scheduler.position(job))
+                for job in self.scheduler.jobs.values()]
+
+    def _job_for(self, ws, data):
+        """Zlecenie z polem job_id komendy, a bez niego - bieżące zlecenie klienta."""
+        job_id = data.get("job_id") or self._client_jobs.get(ws)
+        return self.scheduler.jobs.get(job_id)
+
+    def _subscribe(self, ws, job):
+        if ws not in job.subscribers:
+            job.subscribers.append(ws)
+        self._client_jobs[ws] = job.id
+
+    async def _send_job_state(self, job):
+        await self.send_job(job, type="job",
+                            message=dict(job.summary(), queue_position=self.scheduler.position(job)))
+
+    def _create_job(self, ws, priority=0):
+        # migawka parametrów - kolejne "start" nie zmieniają czekających zleceń
+        job = Job(copy.deepcopy({
+            "algorithmsData": self.algorithmsData,
+            "shared_params": self.shared_params_data,
+            "selected_function": self.selected_function,
+        }), priority=priority)
+        job.folder = os.path.join(self.folder, job.id)
+        os.makedirs(job.folder, exist_ok=True)
+        # opis zlecenia - po restarcie serwera wraca jako zapauzowane
+        atomic_dump_json({"job_id": job.id, "priority": job.priority, "created": job.created,
+                          "params": job.params}, os.path.join(job.folder, JOB_FILE))
+        self._subscribe(ws, job)
+        return job
+
+    def _restore_jobs(self):
+        """Zlecenia przerwane restartem serwera (ich foldery z job.json) wracają jako zapauzowane."""
+        if not os.path.isdir(self.folder):
+            return
+        for name in sorted(os.listdir(self.folder)):
+            path = os.path.join(self.folder, name, JOB_FILE)
+            if not os.path.isfile(path):
+                continue
+            with open(path) as f:
+                data = json.load(f)
+            job = Job(data["params"], priority=data["priority"], job_id=data["job_id"], created=data["created"])
+            job.folder = os.path.dirname(path)
+            job.status = "paused"
+            job.isPaused = True
+            self.scheduler.jobs[job.id] = job
+            print(f"Przywrócono zlecenie {job.id} (zapauzowane)")
+
+    def _finish_job(self, job):
+        """
+        Zlecenie zakończone/zatrzymane: zamyka tuner, usuwa jego checkpointy
+        i po finished_job_ttl sekundach usuwa je ze schedulera.
+        """
+        if job.tuner is not None:
+            job.stats = job.tuner.stats.snapshot()
+            job.tuner.shutdown()
+            job.tuner = None
+        if job.folder is not None:
+            shutil.rmtree(job.folder, ignore_errors=True)
+        if self.finished_job_ttl:
+            asyncio.get_running_loop().call_later(self.finished_job_ttl, self._forget_job, job)
+        else:
+            self._forget_job(job)
+
+    def _forget_job(self, job):
+        self.scheduler.remove(job)
+        for ws, job_id in list(self._client_jobs.items()):
+            if job_id == job.id:
+                del self._client_jobs[ws]
 
     async def handle_command(self, ws, data):
         """Obsługuje polecenie od konkretnego klienta."""
         command = data.get("type").strip()
         print(f"Komenda od klienta: {command}")
+        job = self._job_for(ws, data)
+
         if command == "start":
-            self._update_params(data)
-            self.isRunning = True
-            self.isPaused = False
-            self._current_task = asyncio.create_task(self.start())
+            if job is not None and job.status == "paused":
+                print(f"Resuming job {job.id}")
+                self._subscribe(ws, job)
+                self.scheduler.enqueue(job)
+            else:
+                self._update_params(data)
+                job = self._create_job(ws, data.get("priority", 0))
+                self.scheduler.submit(job)
+            await self._send_job_state(job)
         elif command == "pause":
-            print("Pausing simulation")
-            self.isPaused = True
+            if job is None:
+                return
+            print(f"Pausing job {job.id}")
+            job.isPaused = True
+            if job.status == "queued":
+                # jeszcze nie wystartowało - zostaje poza kolejką do wznowienia
+                job.status = "paused"
+                await self.send_job(job, type="pause", message="Paused successfully")
         elif command == "stop":
-            print("Stopping simulation")
-            if self.isPaused:
-                self.metaheuristic_tuner.delete_checkpoints()
-                await self.broadcast(type="stop", message="Stoped successfully")
-            self.isRunning = False
-            self.isPaused = False
-            
+            if job is None:
+                return
+            print(f"Stopping job {job.id}")
+            was_running = job.status == "running"
+            job.isRunning = False
+            job.isPaused = False
+            if not was_running and job.is_active:
+                job.status = "stopped"
+                self._finish_job(job)
+                await self.send_job(job, type="stop", message="Stoped successfully")
+        elif command == "subscribe":
+            if job is not None:
+                self._subscribe(ws, job)
+                await self.send(ws, type="job", message=dict(job.summary(),
+                                                             queue_position=self.scheduler.position(job)))
+        elif command == "unsubscribe":
+            if job is not None and ws in job.subscribers:
+                job.subscribers.remove(ws)
+                if self._client_jobs.get(ws) == job.id:
+                    self._client_jobs.pop(ws)
+        elif command == "stats":
+            if job is not None:
+                await self._send_stats(ws, job, data)
+            else:
+                await self.send(ws, type="error", message="Brak zlecenia dla komendy stats.")
+        elif command == "list_jobs":
+            await self.send(ws, type="jobs", message=self._job_summaries())
         elif command == "get_params":
-            await self._send_params(ws)
+            if job is not None:
+                self._subscribe(ws, job)
+            await self._send_params(ws, job)
+
 
+    async def _send_stats(self, ws, job, data):
+        """
+        Stopery i liczniki tunera zlecenia. Pola komendy: enable (włącza/
+        wyłącza pomiar), reset, profile ("cprofile"/"pyinstrument" - profil
+        jednej oceny ostatniego kandydata, wysyłany osobno jako "profile").
+        """
+        tuner = job.tuner
+        if tuner is not None:
+            if "enable" in data:
+                tuner.stats.enabled = bool(data["enable"])
+            if data.get("reset"):
+                tuner.stats.reset()
 
-    async def start(self):
-        print("Starting simulation")
-        this_task = asyncio.current_task()
+        message = {
+            "job_id": job.id,
+            "status": job.status,
+            "stats": tuner.stats.snapshot() if tuner is not None else job.stats,
+            "memoization": tuner.memoization_stats() if tuner is not None else {},
+        }
+        if isinstance(self.executor, DistributedExecutor):
+            message["executor"] = dict(self.executor.stats, workers=self.executor.workers)
+        await self.send(ws, type="stats", message=message)
 
-        if self._current_task and self._current_task != this_task:
-            self._current_task.cancel()
-            try:
-                await self._current_task
-            except asyncio.CancelledError:
-                pass
-
-        await self.broadcast(type="start", message="started successfully")
-        if type(self.selected_function["code"]) == str:
-            func = self.string_to_function(self.selected_function["code"])
-            if func is None:
-                await self.broadcast(type="error", message="Function code has syntax errors.")
-                return
-            self.selected_function["code"] = func
-
-   
-        selected = list(filter(lambda alg: alg["isUsed"], self.algorithmsData))
-
-        dim = next((p["value"] for p in self.shared_params_data if p["name"] == "Dimentions"), None)
-        iterations = next((p["value"] for p in self.shared_params_data if p["name"] == "Iterations"), None)
-        print(self.selected_function)
-        results, figures = await self.metaheuristic_tuner.tune_algorithms(
-            algorithmsData = self.algorithmsData,
-            selected=[alg["name"] for alg in selected],
-            selected_funcs=[self.selected_function],
-            dim=dim,
-            iterations=iterations, 
-            R=20, 
-        )
+        if not data.get("profile"):
+            return
+        if tuner is None or tuner.last_candidate is None:
+            await self.send(ws, type="error", message="Brak ocenionego kandydata do profilowania.")
+            return
+        # w osobnym wątku - serwer i zlecenia działają dalej
+        try:
+            report = await asyncio.to_thread(tuner.profile_candidate, data["profile"])
+        except Exception as e:
+            await self.send(ws, type="error", message=f"Profilowanie nie powiodło się: {e}")
+            return
+        await self.send(ws, type="profile", message=dict(report, job_id=job.id))
+
+    async def _run_job(self, job):
+        print(f"Starting job {job.id}")
+        if job.tuner is None:
+            job.tuner = self._make_tuner(job)
+
+        job.telemetry.reset()
+        await self.send_job(job, type="start", message="started successfully")
+
+        selected_function = dict(job.params["selected_function"])
+        func = self.string_to_function(selected_function["code"], selected_function["bounds"])
+        if func is None:
+            job.status = "error"
+            job.isRunning = False
+            self._finish_job(job)
+            await self.send_job(job, type="error", message="Function code has syntax errors.")
+            return
+        # kod źródłowy zostaje dla procesów roboczych (funkcji z exec nie da się przesłać przez pickle)
+        selected_function["source"] = selected_function["code"]
+        selected_function["code"] = func
+
+        algorithmsData = job.params["algorithmsData"]
+        shared_params_data = job.params["shared_params"]
+        selected = list(filter(lambda alg: alg["isUsed"], algorithmsData))
+
+        dim = next((p["value"] for p in shared_params_data if p["name"] == "Dimentions"), None)
+        iterations = next((p["value"] for p in shared_params_data if p["name"] == "Iterations"), None)
+        # budżet ewaluacji funkcji celu na uruchomienie; 0 albo brak - bez limitu
+        max_evals = next((p["value"] for p in shared_params_data if p["name"] == "Max evaluations"), None)
+        print(selected_function)
+        try:
+            results, figures = await job.tuner.tune_algorithms(
+                algorithmsData = algorithmsData,
+                selected=[alg["name"] for alg in selected],
+                selected_funcs=[selected_function],
+                dim=dim,
+                iterations=iterations, 
+                R=20, 
+                max_evals=int(max_evals) if max_evals else None,
+            )
+        except Exception as e:
+            print(f"Błąd zlecenia {job.id}: {e}")
+            job.status = "error"
+            job.isRunning = False
+            self._finish_job(job)
+            await job.telemetry.flush()
+            await self.send_job(job, type="error", message=str(e))
+            return
+        await job.telemetry.flush()
         
-        if self.isPaused:
-            await self.broadcast(type="pause", message="Paused successfully")
+        if job.isPaused:
+            job.status = "paused"
+            await self.send_job(job, type="pause", message="Paused successfully")
             return
 
-        if not self.isRunning:
-            await self.broadcast(type="stop", message="Stoped successfully")
+        if not job.isRunning:
+            job.status = "stopped"
+            self._finish_job(job)
+            await self.send_job(job, type="stop", message="Stoped successfully")
             return
         
-        self.isRunning = False
-        self.isPaused = False
+        job.status = "finished"
+        job.isRunning = False
+        job.isPaused = False
+        costs = job.tuner.costs
+        self._finish_job(job)
 
-        await self.broadcast(type="finished", message={"result": results, "figures": figures})
+        await self.send_job(job, type="finished", message={"result": results, "figures": figures, "costs": costs})
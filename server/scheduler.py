@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+
+
+class Job:
+    """
+    Jedno zlecenie strojenia: własne ID, parametry, folder checkpointów,
+    postęp i lista subskrybentów (połączeń WebSocket, które dostają
+    jego wiadomości).
+
+    status: "queued" -> "running" -> "paused" / "stopped" / "finished" / "error"
+    (z "paused" wraca do "queued" po wznowieniu).
+    """
+
+    def __init__(self, params, priority=0, job_id=None, created=None):
+        self.id = job_id or uuid.uuid4().hex[:8]
+        self.priority = priority
+        self.created = created or time.time()
+        # algorithmsData, shared_params, selected_function - migawka z komendy "start"
+        self.params = params
+        self.status = "queued"
+        self.isRunning = True
+        self.isPaused = False
+        self.progressInfo = {
+            "alg_progress": 0,
+            "param_progress": 0,
+            "run_progress": 0
+        }
+        self.subscribers = []
+        # folder checkpointów zlecenia (nadaje go SimulationManager)
+        self.folder = None
+        self.tuner = None
+        self.telemetry = None
+        # ostatnie liczniki tunera - zostają po zakończeniu zlecenia
+        self.stats = None
+        self.task = None
+        self.queue_seq = None
+
+    @property
+    def is_active(self):
+        return self.status in ("queued", "running", "paused")
+
+    def summary(self):
+        return {
+            "job_id": self.id,
+            "priority": self.priority,
+            "status": self.status,
+            "created": self.created,
+            "function": self.params["selected_function"].get("name"),
+            "progressInfo": self.progressInfo,
+        }
+
+
+class JobScheduler:
+    """
+    Kolejka priorytetowa zleceń (większy priorytet pierwszy, przy równym -
+    kolejność zgłoszeń). Naraz działa najwyżej max_running zleceń; gdy któreś
+    się skończy (także pauzą), startuje następne z kolejki.
+
+    run_fn(job) - korutyna wykonująca zlecenie.
+    """
+
+    def __init__(self, run_fn, max_running=1):
+        self.run_fn = run_fn
+        self.max_running = max_running
+        self.jobs = {}
+        self._queue = []
+        self._seq = itertools.count()
+        self._running = set()
+
+    def submit(self, job):
+        self.jobs[job.id] = job
+        self.enqueue(job)
+
+    def enqueue(self, job):
+        job.status = "queued"
+        job.isRunning = True
+        job.isPaused = False
+        # numer wpisu: starsze wpisy tego samego zlecenia w kopcu są nieważne
+        job.queue_seq = next(self._seq)
+        heapq.heappush(self._queue, (-job.priority, job.queue_seq, job.id))
+        self._dispatch()
+
+    def position(self, job):
+        """Miejsce w kolejce (0 - następne do uruchomienia) albo None."""
+        waiting = [job_id for _, seq, job_id in sorted(self._queue) if self._is_current(seq, job_id)]
+        return waiting.index(job.id) if job.id in waiting else None
+
+    def running(self):
+        return [self.jobs[job_id] for job_id in self._running]
+
+    def _is_current(self, seq, job_id):
+        job = self.jobs.get(job_id)
+        return job is not None and job.status == "queued" and job.queue_seq == seq
+
+    def _dispatch(self):
+        while len(self._running) < self.max_running and self._queue:
+            _, seq, job_id = heapq.heappop(self._queue)
+            # wpisy zleceń zapauzowanych/zatrzymanych w kolejce są pomijane
+            if not self._is_current(seq, job_id):
+                continue
+            job = self.jobs[job_id]
+            job.status = "running"
+            self._running.add(job_id)
+            job.task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job):
+        try:
+            await self.run_fn(job)
+        except Exception as e:
+            print(f"Błąd zlecenia {job.id}: {e}")
+            job.status = "error"
+        finally:
+            # zlecenie mogło już zostać wznowione w nowym zadaniu
+            if job.task is asyncio.current_task():
+                self._running.discard(job.id)
+                job.task = None
+            self._dispatch()
+
+    def remove(self, job):
+        self.jobs.pop(job.id, None)
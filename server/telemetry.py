@@ -0,0 +1,61 @@
+import asyncio
+import time
+from collections import deque
+
+
+class TelemetryChannel:
+    """
+    Zbiera zdarzenia telemetrii (postęp CMA, najlepsze parametry, wyniki
+    uruchomień) i wysyła je paczkami, nie częściej niż max_rate razy
+    na sekundę. Bufor ma ograniczony rozmiar - przy zalewie zdarzeń
+    najstarsze są odrzucane (liczba odrzuconych idzie w paczce).
+    Zdarzenia, które przyszły przed upływem interwału, wysyła opóźniony
+    flush - nie czekają na kolejne zdarzenie.
+    """
+
+    def __init__(self, send_fn, max_rate=4.0, max_buffer=500):
+        self.send_fn = send_fn
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self._buffer = deque(maxlen=max_buffer)
+        self._dropped = 0
+        self._last_flush = 0.0
+        self._pending = None
+
+    async def publish(self, kind, data):
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped += 1
+        self._buffer.append({"kind": kind, "time": time.time(), **data})
+
+        elapsed = time.monotonic() - self._last_flush
+        if elapsed >= self.interval:
+            await self.flush()
+        elif self._pending is None:
+            self._pending = asyncio.ensure_future(self._flush_after(self.interval - elapsed))
+
+    async def _flush_after(self, delay):
+        await asyncio.sleep(delay)
+        self._pending = None
+        await self.flush()
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    async def flush(self):
+        """Wysyła zaległe zdarzenia od razu (np. przed 'finished' albo po pauzie)."""
+        self._cancel_pending()
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        events = list(self._buffer)
+        dropped = self._dropped
+        self._buffer.clear()
+        self._dropped = 0
+        await self.send_fn(type="telemetry", message={"events": events, "dropped": dropped})
+
+    def reset(self):
+        self._cancel_pending()
+        self._buffer.clear()
+        self._dropped = 0
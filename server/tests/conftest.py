@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy importują moduły serwera tak jak main.py (algorithms.*, manager, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+import numpy as np
+
+from algorithms.ArtificialBeeColony import artificial_bee_colony, artificial_bee_colony_multi_run
+from algorithms.statisticalTests import ks_2samp
+from algorithms.vectorized import vectorized
+
+# sfera, d = 5, 15 pszczół, 40 iteracji
+ARGS = dict(n_bees=15, dim=5, bounds=(-5, 5), max_iter=40)
+
+
+@vectorized
+def sphere(x):
+    return np.sum(x ** 2, axis=-1)
+
+
+@vectorized
+def rastrigin(x):
+    return 10 * x.shape[-1] + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+
+def test_employed_bees_share_one_objective_call():
+    calls = []
+
+    @vectorized
+    def counted(x):
+        calls.append(len(x))
+        return sphere(x)
+
+    R, n = 4, ARGS["n_bees"]
+    artificial_bee_colony_multi_run(objective_func=counted, rngs=[np.random.default_rng(s) for s in range(R)],
+                                    **dict(ARGS, max_iter=1))
+
+    # populacja początkowa, robotnice wszystkich kolonii, potem rundy obserwatorek
+    assert calls[:2] == [R * n, R * n]
+    assert sum(calls[2:]) == R * n
+    assert len(calls) - 2 < n
+
+
+def test_multi_run_matches_reference_distribution():
+    n = 300
+    reference = [artificial_bee_colony(objective_func=sphere, rng=np.random.default_rng(s), **ARGS)[1]
+                 for s in range(n)]
+    _, best_f, _, _, _ = artificial_bee_colony_multi_run(objective_func=sphere,
+                                                      rngs=[np.random.default_rng(s) for s in range(n, 2 * n)],
+                                                      **ARGS)
+
+    _, p = ks_2samp(reference, best_f)
+    assert p > 0.001
+
+
+def test_multi_run_with_scouts_matches_reference_distribution():
+    # mały limit - zwiadowcy pracują w każdej kolonii
+    args = dict(n_bees=10, dim=3, bounds=(-5.12, 5.12), max_iter=60, objective_func=rastrigin, limit=4)
+    n = 300
+    reference = [artificial_bee_colony(rng=np.random.default_rng(s), **args)[1] for s in range(n)]
+    _, best_f, _, _, _ = artificial_bee_colony_multi_run(rngs=[np.random.default_rng(s) for s in range(n, 2 * n)],
+                                                      **args)
+
+    _, p = ks_2samp(reference, best_f)
+    assert p > 0.001
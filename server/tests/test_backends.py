@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from algorithms import objective_functions
+from algorithms.objective_functions import heavy_monte_carlo, rastrigin_function
+from algorithms.runners import RUNNERS, repetition_rngs
+from algorithms.statisticalTests import ks_2samp
+from algorithms.vectorized import vectorized
+
+PARAMS = {
+    "Bat": {"n_bats": 15, "max_iter": 40, "alpha": 0.9, "gamma": 0.9, "f_bounds_min": 0, "f_bounds_max": 2},
+    "ABC": {"n_bees": 15, "max_iter": 40},
+    "Genetic": {"pop_size": 20, "max_generations": 40, "crossover_rate": 0.8, "mutation_rate": 0.1,
+                "mutation_scale": 0.1, "elitism_rate": 0.1, "tournament_size": 3},
+}
+
+
+@vectorized
+def rastrigin(x):
+    return 10 * x.shape[-1] + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+
+@pytest.mark.parametrize("algorithm", sorted(PARAMS))
+def test_backends_give_equivalent_results(algorithm):
+    n = 300
+    results = [RUNNERS[algorithm](dict(PARAMS[algorithm], backend=backend), rastrigin, (-5.12, 5.12), 5,
+                                  repetition_rngs(0, range(n)))
+               for backend in ("numpy", "numba")]
+
+    _, p = ks_2samp(*results)
+    assert p > 0.001
+
+
+def test_objective_kernels_match_numpy_fallback(monkeypatch):
+    X = np.random.default_rng(0).uniform(-5.12, 5.12, (64, 7))
+    x = X[0, :3]
+
+    def evaluate():
+        np.random.seed(1)
+        return rastrigin_function(X, 3.5), rastrigin_function(X[0]), heavy_monte_carlo(x, samples=25_000)
+
+    jit = evaluate()
+    monkeypatch.setattr(objective_functions, "NUMBA_AVAILABLE", False)
+    fallback = evaluate()
+
+    for got, expected in zip(jit, fallback):
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from algorithms.BatAlgorithm import bat_algorithm, bat_algorithm_multi_run
+from algorithms.statisticalTests import ks_2samp
+from algorithms.vectorized import vectorized
+
+# sfera, d = 5, 15 nietoperzy, 40 iteracji
+ARGS = dict(n_bats=15, bounds=(-5, 5), alpha=0.9, gamma=0.9, f_bounds=(0, 2), max_iter=40, dims=5)
+
+
+@vectorized
+def sphere(x):
+    return np.sum(x ** 2, axis=-1)
+
+
+def test_one_objective_call_per_iteration():
+    calls = []
+
+    @vectorized
+    def counted(x):
+        calls.append(x.shape)
+        return sphere(x)
+
+    R = 4
+    bat_algorithm_multi_run(counted, rngs=[np.random.default_rng(s) for s in range(R)], **ARGS)
+
+    # populacja początkowa + jedna ocena całej populacji wszystkich replik na iterację
+    assert calls == [(R * ARGS["n_bats"], ARGS["dims"])] * (ARGS["max_iter"] + 1)
+
+
+def test_multi_run_matches_reference_distribution():
+    n = 300
+    reference = [bat_algorithm(sphere, rng=np.random.default_rng(s), **ARGS)[1] for s in range(n)]
+    _, best_f, _, _, _ = bat_algorithm_multi_run(sphere, rngs=[np.random.default_rng(s) for s in range(n, 2 * n)],
+                                              **ARGS)
+
+    _, p = ks_2samp(reference, best_f)
+    assert p > 0.001
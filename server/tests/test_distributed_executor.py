@@ -0,0 +1,92 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import worker
+from algorithms.distributedExecutor import DistributedExecutor, client_handshake
+from algorithms.functionCompiler import compile_function
+from algorithms.runners import RUNNERS, repetition_rngs
+
+SERVER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEY = "test-key-0123456789abcdef"
+CODE = "def sphere(x):\n    return sum(i**2 for i in x)"
+PARAMS = {"n_bees": 6, "max_iter": 5}
+
+
+def _port(executor):
+    return executor._server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.parametrize("authkey", ["", "short"])
+def test_server_refuses_weak_key(authkey):
+    with pytest.raises(ValueError):
+        DistributedExecutor(port=0, authkey=authkey)
+
+
+def test_server_refuses_missing_environment_key(monkeypatch):
+    monkeypatch.delenv("TUNER_AUTHKEY", raising=False)
+    with pytest.raises(ValueError):
+        DistributedExecutor(port=0)
+
+
+def test_worker_refuses_to_start_without_key():
+    env = dict(os.environ)
+    env.pop("TUNER_AUTHKEY", None)
+    result = subprocess.run([sys.executable, "worker.py", "--once"], cwd=SERVER, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 2
+    assert "TUNER_AUTHKEY" in result.stderr
+
+
+def test_worker_with_key_computes_tasks():
+    async def scenario():
+        executor = await DistributedExecutor(port=0, authkey=KEY).start()
+        connection = asyncio.create_task(worker.work("127.0.0.1", _port(executor), KEY, "test"))
+        try:
+            task = ("ABC", PARAMS, CODE, [-5, 5], 2, 0, (0, 1))
+
+            async def never():
+                return False
+
+            results = await asyncio.wait_for(executor.run([task], never), 60)
+        finally:
+            executor.shutdown()
+            connection.cancel()
+        expected = RUNNERS["ABC"](PARAMS, compile_function(CODE), [-5, 5], 2, repetition_rngs(0, (0, 1)))
+        np.testing.assert_array_equal(results[0], expected)
+
+    asyncio.run(scenario())
+
+
+def test_server_rejects_worker_with_wrong_key():
+    async def scenario():
+        executor = await DistributedExecutor(port=0, authkey=KEY).start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", _port(executor))
+            with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+                await client_handshake(reader, writer, "wrong-key-0123456789", "intruder")
+            writer.close()
+            assert executor.workers == 0
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_worker_rejects_server_with_wrong_key():
+    async def scenario():
+        # obcy serwer: odpowiada na powitanie innym kluczem
+        rogue = await DistributedExecutor(port=0, authkey="another-key-0123456789").start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", _port(rogue))
+            with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+                await client_handshake(reader, writer, KEY, "test")
+            writer.close()
+        finally:
+            rogue.shutdown()
+
+    asyncio.run(scenario())
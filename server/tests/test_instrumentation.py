@@ -0,0 +1,39 @@
+import asyncio
+
+from algorithms.MetaheuristicTuner import MetaheuristicTuner
+from algorithms.functionCompiler import compile_function
+
+CODE = "def sphere(x):\n    return sum(i**2 for i in x)"
+PARAMS = {"n_bees": 10, "max_iter": 15}
+
+
+async def _no():
+    return False
+
+
+async def _progress(progress, type):
+    pass
+
+
+async def _counters(tmp_path, mode, **options):
+    tuner = MetaheuristicTuner(_progress, _no, _no, execution_mode=mode, folder=str(tmp_path / mode),
+                               cache_path=None, instrument=True, **options)
+    fmeta = {"name": "Sphere", "bounds": [-5, 5], "code": compile_function(CODE), "source": CODE}
+    try:
+        await tuner.evaluate_params(PARAMS, "ABC", [fmeta], 3, 8)
+        return tuner.stats.snapshot()
+    finally:
+        tuner.shutdown()
+
+
+def test_process_mode_reports_objective_evaluations(tmp_path):
+    inline = asyncio.run(_counters(tmp_path, "inline"))
+    process = asyncio.run(_counters(tmp_path, "process", max_workers=2))
+
+    # liczniki z procesów roboczych trafiają do stats tunera - tak samo jak inline
+    evals = process["counters"]["objective_evals.ABC"]
+    assert evals > 0
+    assert evals == inline["counters"]["objective_evals.ABC"]
+    assert process["counters"]["executor_tasks.ABC"] == 2
+    assert process["timers"]["runner.ABC"]["count"] == 2
+    assert process["timers"]["objective.ABC"]["total_s"] > 0
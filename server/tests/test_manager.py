@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from manager import SimulationManager
+
+SERVER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+    def of_type(self, type):
+        return [m for m in self.messages if m["type"] == type]
+
+
+def start_command(iterations=1):
+    """Najmniejsze zlecenie: tylko ABC, d = 2, jedna iteracja CMA-ES."""
+    with open(os.path.join(SERVER, "data", "algorithms.json")) as f:
+        algorithms = json.load(f)["algorithms"]
+    for alg in algorithms:
+        alg["isUsed"] = alg["name"] == "ABC"
+        for param in alg["params"]:
+            if param["range"] == "min-max":
+                param["min"], param["max"] = (5, 8) if param["type"] == "int" else (0.1, 0.9)
+            else:
+                param["value"] = 5
+    shared = [{"name": "Dimentions", "value": 2, "range": "value", "type": "int"},
+              {"name": "Iterations", "value": iterations, "range": "value", "type": "int"}]
+    function = {"name": "Sphere", "code": "def f(x):\n    return sum(i**2 for i in x)", "bounds": [-5, 5]}
+    return {"type": "start", "algorithmsData": algorithms, "shared_params": shared, "selected_function": function}
+
+
+@pytest.fixture
+def server_dir(monkeypatch):
+    # SimulationManager czyta ./data/*.json
+    monkeypatch.chdir(SERVER)
+
+
+async def _wait_until_done(manager):
+    while any(job.is_active for job in manager.scheduler.jobs.values()):
+        await asyncio.sleep(0.05)
+
+
+def make_manager(tmp_path, **options):
+    manager = SimulationManager(folder=str(tmp_path / "jobs"), **options)
+    manager.tuner_options["cache_path"] = None
+    return manager
+
+
+def test_finished_jobs_leave_the_scheduler(server_dir, tmp_path):
+    async def scenario():
+        manager = make_manager(tmp_path, finished_job_ttl=1.0, max_running_jobs=2)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+
+        await manager.handle_command(ws, start_command())
+        await manager.handle_command(ws, start_command())
+        assert len(manager.scheduler.jobs) == 2
+
+        await _wait_until_done(manager)
+        assert len(ws.of_type("finished")) == 2
+        # w oknie retencji zakończone zlecenia są jeszcze widoczne
+        await manager.handle_command(ws, {"type": "list_jobs"})
+        assert [job["status"] for job in ws.of_type("jobs")[-1]["message"]] == ["finished", "finished"]
+
+        await asyncio.sleep(1.1)
+        assert manager.scheduler.jobs == {}
+        await manager.handle_command(ws, {"type": "list_jobs"})
+        assert ws.of_type("jobs")[-1]["message"] == []
+        manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stopped_queued_job_is_removed(server_dir, tmp_path):
+    async def scenario():
+        manager = make_manager(tmp_path, finished_job_ttl=0)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+
+        await manager.handle_command(ws, start_command())
+        await manager.handle_command(ws, dict(start_command(), priority=-1))
+        queued = next(job for job in manager.scheduler.jobs.values() if job.status == "queued")
+        await manager.handle_command(ws, {"type": "stop", "job_id": queued.id})
+        assert queued.id not in manager.scheduler.jobs
+
+        await _wait_until_done(manager)
+        assert manager.scheduler.jobs == {}
+        manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stats_without_job_answers_with_error(server_dir, tmp_path):
+    async def scenario():
+        manager = make_manager(tmp_path)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+
+        await manager.handle_command(ws, {"type": "stats", "job_id": "missing"})
+        assert ws.of_type("stats") == []
+        assert ws.of_type("error")[-1]["message"] == "Brak zlecenia dla komendy stats."
+        manager.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from algorithms import jitKernels, objective_functions
+from algorithms.objective_functions import heavy_monte_carlo, rastrigin_function
+
+
+def _rastrigin_reference(x, A=10):
+    x = np.asarray(x, dtype=float)
+    return A * x.shape[-1] + np.sum(x**2 - A * np.cos(2 * np.pi * x), axis=-1)
+
+
+def _monte_carlo_reference(x, samples):
+    # pierwotna pętla: jedno losowanie na próbkę
+    total = 0.0
+    for _ in range(samples):
+        noise = np.random.normal(0, 1, size=x.shape)
+        total += np.sum((x + noise)**2)
+    return total / samples
+
+
+@pytest.mark.parametrize("use_kernel", [False, True])
+@pytest.mark.parametrize("A", [10, 3.5])
+@pytest.mark.parametrize("dim", [1, 2, 7, 30])
+def test_rastrigin_kernel_matches_numpy(monkeypatch, use_kernel, A, dim):
+    monkeypatch.setattr(objective_functions, "NUMBA_AVAILABLE", use_kernel)
+    X = np.random.default_rng(dim).uniform(-5.12, 5.12, (16, dim))
+    expected = _rastrigin_reference(X, A)
+    np.testing.assert_allclose(jitKernels.rastrigin(X, float(A)), expected, rtol=1e-12)
+    np.testing.assert_allclose(rastrigin_function(X, A), expected, rtol=1e-12)
+    assert rastrigin_function(X[0], A) == pytest.approx(expected[0], rel=1e-12)
+
+
+@pytest.mark.parametrize("use_kernel", [False, True])
+@pytest.mark.parametrize("dim", [1, 3, 10])
+def test_heavy_monte_carlo_matches_sample_loop(monkeypatch, use_kernel, dim):
+    # kernel działa także bez numby (jako zwykła funkcja Pythona)
+    monkeypatch.setattr(objective_functions, "NUMBA_AVAILABLE", use_kernel)
+    monkeypatch.setattr(objective_functions, "MONTE_CARLO_CHUNK", 700)
+    x = np.random.default_rng(dim).uniform(-2, 2, dim)
+
+    np.random.seed(dim)
+    expected = _monte_carlo_reference(x, 2_000)
+    np.random.seed(dim)
+    got = heavy_monte_carlo(x, samples=2_000)
+
+    assert got == pytest.approx(expected, rel=1e-12)
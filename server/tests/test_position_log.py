@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from algorithms.positionLog import PositionLog
+from algorithms.runners import RUNNERS, repetition_rngs
+from algorithms.vectorized import vectorized
+
+PARAMS = {
+    "Bat": {"n_bats": 5, "max_iter": 500, "alpha": 0.9, "gamma": 0.9, "f_bounds_min": 0, "f_bounds_max": 2},
+    "ABC": {"n_bees": 5, "max_iter": 500},
+    "Genetic": {"pop_size": 6, "max_generations": 500, "crossover_rate": 0.8, "mutation_rate": 0.1,
+                "mutation_scale": 0.1, "elitism_rate": 0.2, "tournament_size": 2},
+}
+
+
+@vectorized
+def sphere(x):
+    return np.sum(x ** 2, axis=-1)
+
+
+def _log(n_steps, max_frames=None, stride=None):
+    log = PositionLog((1,), n_steps, max_frames, stride)
+    for step in range(n_steps):
+        log.record(step, np.array([step]))
+    return log
+
+
+@pytest.mark.parametrize("n_steps, max_frames", [(501, 100), (101, 100), (100, 100), (7, 3), (1000, 2)])
+def test_frame_budget_spans_the_whole_run(n_steps, max_frames):
+    log = _log(n_steps, max_frames)
+    steps = log.steps()
+
+    assert steps[0] == 0
+    assert steps[-1] == n_steps - 1
+    assert len(steps) <= max_frames
+    assert np.all(np.diff(steps) <= log.stride)
+    np.testing.assert_array_equal(log.frames()[:, 0], steps)
+
+
+def test_explicit_stride_is_a_lower_bound():
+    assert _log(501, 100, stride=10).stride == 10
+    assert list(_log(11, stride=4).steps()) == [0, 4, 8, 10]
+    assert list(_log(5, max_frames=1).steps()) == [0]
+
+
+@pytest.mark.parametrize("algorithm", sorted(PARAMS))
+def test_engine_traces_keep_initial_and_final_frames(algorithm):
+    _, _, positions, _, steps = RUNNERS[algorithm](PARAMS[algorithm], sphere, (-5, 5), 2, repetition_rngs(0, (0, 1)),
+                                                   trace=True, max_frames=100)
+
+    assert steps[0] == 0
+    assert steps[-1] == 500
+    assert positions.shape[1] == len(steps) <= 100
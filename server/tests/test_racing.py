@@ -0,0 +1,60 @@
+import asyncio
+
+import cma
+
+from algorithms.MetaheuristicTuner import MetaheuristicTuner
+from algorithms.functionCompiler import compile_function
+
+CODE = "def sphere(x):\n    return sum(i**2 for i in x)"
+
+
+async def _progress(progress, type):
+    pass
+
+
+async def _tune(folder, pause_after=None):
+    """Jedno pokolenie wyścigu ABC; pause_after - pauza po tylu ukończonych grupach powtórzeń."""
+    finished = []
+
+    async def paused():
+        return pause_after is not None and len(finished) >= pause_after
+
+    async def stopped():
+        return False
+
+    tuner = MetaheuristicTuner(_progress, paused, stopped, folder=folder, cache_path=None,
+                               racing=True, race_min_runs=2, race_eta=2, record_traces=False)
+    run_inline = tuner._run_inline
+
+    async def counted(*args):
+        output = await run_inline(*args)
+        if output is not None:
+            finished.append(args)
+        return output
+
+    tuner._run_inline = counted
+    tuner.param_spaces = {"ABC": {"n_bees": (5, 15, "int"), "max_iter": (5, 10, "int")}}
+    fmeta = {"name": "Sphere", "bounds": [-5, 5], "code": compile_function(CODE), "source": CODE}
+    try:
+        result = await tuner.tune_single_algorithm("ABC", [fmeta], 2, iterations=1, R=8)
+        return result, len(finished)
+    finally:
+        tuner.shutdown()
+
+
+def test_pause_keeps_racing_progress(tmp_path, monkeypatch):
+    # stałe ziarno CMA-ES - przebieg bez pauzy losuje to samo pokolenie
+    strategy = cma.CMAEvolutionStrategy
+    monkeypatch.setattr(cma, "CMAEvolutionStrategy", lambda x0, sigma: strategy(x0, sigma, {"seed": 1}))
+
+    expected, total = asyncio.run(_tune(str(tmp_path / "full")))
+
+    # pauza w drugiej rundzie wyścigu (pierwsza runda - po jednej grupie na kandydata)
+    folder = str(tmp_path / "paused")
+    result, before = asyncio.run(_tune(folder, pause_after=8))
+    assert result == "pause"
+    resumed, after = asyncio.run(_tune(folder))
+
+    # po wznowieniu liczone są tylko zadania, których nie skończono przed pauzą
+    assert before + after == total
+    assert resumed == expected
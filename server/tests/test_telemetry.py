@@ -0,0 +1,39 @@
+import asyncio
+
+from telemetry import TelemetryChannel
+
+
+def _channel(batches):
+    async def send(type, message):
+        batches.append([event["kind"] for event in message["events"]])
+
+    return TelemetryChannel(send, max_rate=4.0)
+
+
+def test_buffered_tail_is_flushed_after_the_interval():
+    async def scenario():
+        batches = []
+        channel = _channel(batches)
+        for kind in ("runs", "runs", "runs", "generation"):
+            await channel.publish(kind, {})
+        assert batches == [["runs"]]
+
+        # bez kolejnych zdarzeń reszta idzie po upływie interwału (0.25 s)
+        await asyncio.sleep(0.4)
+        assert batches == [["runs"], ["runs", "runs", "generation"]]
+
+    asyncio.run(scenario())
+
+
+def test_reset_cancels_the_delayed_flush():
+    async def scenario():
+        batches = []
+        channel = _channel(batches)
+        await channel.publish("runs", {})
+        await channel.publish("generation", {})
+        channel.reset()
+
+        await asyncio.sleep(0.4)
+        assert batches == [["runs"]]
+
+    asyncio.run(scenario())
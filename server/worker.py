@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import os
+import socket
+import threading
+
+from algorithms.distributedExecutor import check_authkey, client_handshake, recv_message, send_message
+from algorithms.parallelExecutor import evaluate_task
+
+# ============================================================
+# PROCES ROBOCZY TRYBU "distributed"
+# Łączy się z serwerem (main.py z EXECUTION_MODE = "distributed"),
+# pobiera zadania (algorytm, parametry, kod funkcji, granice, wymiar,
+# ziarno, powtórzenia), liczy je i odsyła najlepsze wartości.
+# Na jednej maszynie można uruchomić kilka procesów - każdy liczy
+# jedno zadanie naraz.
+#
+#   TUNER_AUTHKEY=... python worker.py --host 127.0.0.1 --port 8765
+#
+# Klucz (TUNER_AUTHKEY albo --authkey) jest obowiązkowy i musi być ten sam
+# co na serwerze. Zadania przychodzą jako pickle, więc proces roboczy
+# łączy się tylko z serwerem w zaufanej sieci.
+# ============================================================
+
+
+async def _read_messages(reader, incoming, current):
+    """Czyta wiadomości serwera; "cancel" przerywa bieżące zadanie od razu."""
+    try:
+        while True:
+            message = await recv_message(reader)
+            if message["type"] == "cancel":
+                if current.get("id") == message["id"]:
+                    current["stop"].set()
+            else:
+                await incoming.put(message)
+    except (asyncio.IncompleteReadError, ConnectionError, OSError):
+        await incoming.put(None)
+
+
+async def work(host, port, authkey, name, memoize_bytes=None):
+    """Obsługuje jedno połączenie z serwerem, aż do jego zerwania."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await client_handshake(reader, writer, authkey, name)
+    except Exception:
+        writer.close()
+        raise
+    welcome = await recv_message(reader)
+    heartbeat_interval = welcome["heartbeat_interval"]
+    print(f"Połączono z {host}:{port} jako {name}")
+
+    incoming = asyncio.Queue()
+    current = {}
+    reader_task = asyncio.create_task(_read_messages(reader, incoming, current))
+    try:
+        while True:
+            message = await incoming.get()
+            if message is None:
+                print("Serwer zamknął połączenie")
+                return
+            if message["type"] != "task":
+                continue
+
+            # stop_event jak w puli procesów - sprawdzany między iteracjami silnika
+            current["id"] = message["id"]
+            current["stop"] = threading.Event()
+            run = asyncio.create_task(asyncio.to_thread(
+                evaluate_task, current["stop"], *message["task"], memoize_bytes=memoize_bytes))
+
+            # w trakcie liczenia heartbeat podtrzymuje dzierżawę zadania
+            while True:
+                done, _ = await asyncio.wait({run}, timeout=heartbeat_interval)
+                if done:
+                    break
+                await send_message(writer, {"type": "heartbeat", "id": message["id"]})
+
+            reply = {"type": "result", "id": message["id"]}
+            try:
+                reply["result"] = run.result()
+            except Exception as e:
+                reply["error"] = f"{type(e).__name__}: {e}"
+            current.clear()
+            await send_message(writer, reply)
+    finally:
+        if current:
+            current["stop"].set()
+        reader_task.cancel()
+        writer.close()
+
+
+async def main(args):
+    name = args.name or f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        try:
+            await work(args.host, args.port, args.authkey, name, args.memoize_bytes)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+            print(f"Brak połączenia z serwerem ({type(e).__name__}: {e})")
+        if args.once:
+            return
+        await asyncio.sleep(args.reconnect_delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Proces roboczy rozproszonego strojenia")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--authkey", default=os.environ.get("TUNER_AUTHKEY", ""))
+    parser.add_argument("--name", default=None)
+    parser.add_argument("--memoize-bytes", type=int, default=None)
+    parser.add_argument("--reconnect-delay", type=float, default=2.0)
+    parser.add_argument("--once", action="store_true", help="zakończ po zerwaniu połączenia zamiast łączyć ponownie")
+    args = parser.parse_args()
+    try:
+        check_authkey(args.authkey)
+    except ValueError as e:
+        parser.error(str(e))
+    asyncio.run(main(args))